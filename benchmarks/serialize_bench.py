@@ -0,0 +1,103 @@
+"""
+Benchmark JSON serialization of project snapshots.
+
+Builds the documents JSONOutputHandler writes (compact and split content)
+from the files of a project and streams them through every installed
+serializer backend in pretty and compact mode, reporting MB/s.
+
+Usage:
+    python benchmarks/serialize_bench.py [PROJECT_ROOT] [--repeat N]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from outputs.json_writer import write_document  # noqa: E402
+from outputs.serializers import BACKENDS, JSONSerializer, orjson  # noqa: E402
+from outputs.sidecar_index import CountingWriter  # noqa: E402
+from utils.file_walker import FileWalker  # noqa: E402
+from utils.ignore_handler import build_ignores  # noqa: E402
+from utils.language_mapping import EXTENSION_MAPPING  # noqa: E402
+
+
+def build_snapshots(project_root):
+    """
+    Build snapshot documents in the compact and split JSON layouts.
+
+    Args:
+        project_root (str): The project to read.
+
+    Returns:
+        dict: Layout name -> document.
+    """
+    compact = {"outline": [], "files": []}
+    split = {"outline": [], "files": []}
+    for seq, entry in enumerate(FileWalker(project_root, build_ignores(project_root)).get_files(), start=1):
+        content = entry.read_text()
+        if content is None:
+            continue
+        extension = os.path.splitext(entry.relative_path)[1].lower()
+        record = {
+            "filename": f"{seq:03d}_{entry.flattened_relative_path}.md",
+            "relative_path": entry.relative_path,
+            "extension": extension,
+            "language": EXTENSION_MAPPING.get(extension, ""),
+        }
+        outline = {"markdown_filename": record["filename"], "original_filename": os.path.basename(entry.relative_path),
+                   "path": entry.relative_path, "tokens": len(content) // 4}
+        compact["outline"].append(outline)
+        split["outline"].append(outline)
+        compact["files"].append(dict(record, content=content))
+        split["files"].append(dict(record, content_lines=[
+            {"line_number": i + 1, "content": line} for i, line in enumerate(content.splitlines())
+        ]))
+    return {"compact": compact, "split": split}
+
+
+def measure(document, serializer, repeat):
+    """
+    Stream a document through a serializer and time it.
+
+    Returns:
+        tuple: (output bytes, best seconds per run).
+    """
+    best = None
+    size = 0
+    for _ in range(repeat):
+        buffer = io.BytesIO()
+        start = time.perf_counter()
+        write_document(CountingWriter(buffer), document, "files", serializer=serializer)
+        elapsed = time.perf_counter() - start
+        size = buffer.tell()
+        best = elapsed if best is None else min(best, elapsed)
+    return size, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of project snapshots")
+    parser.add_argument("project_root", nargs="?", default=os.getcwd())
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best run is reported")
+    args = parser.parse_args()
+
+    snapshots = build_snapshots(os.path.abspath(args.project_root))
+    backends = [backend for backend in BACKENDS if backend != "orjson" or orjson is not None]
+
+    print(f"{'layout':<8} {'backend':<7} {'mode':<7} {'size (MB)':>10} {'MB/s':>9}")
+    for layout, document in snapshots.items():
+        for backend in backends:
+            for pretty in (True, False):
+                size, seconds = measure(document, JSONSerializer(pretty=pretty, backend=backend), args.repeat)
+                megabytes = size / (1024 * 1024)
+                print(f"{layout:<8} {backend:<7} {'pretty' if pretty else 'compact':<7} "
+                      f"{megabytes:>10.2f} {megabytes / seconds:>9.1f}")
+    if orjson is None:
+        print("orjson is not installed; pip install project-prompt-generator[fast] to compare it")
+
+
+if __name__ == "__main__":
+    main()
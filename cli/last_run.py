@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 import argparse
-import glob
 import os
 import platform
 import stat
@@ -8,11 +7,19 @@ import subprocess
 import sys
 import time
 
+from utils.script_finder import DEFAULT_DIRECTORIES, DEFAULT_EXTENSIONS, ScriptIndex, find_recent_scripts
+
+# Interpreters for script extensions; scripts with other extensions are listed but not run
+RUNNERS = {
+    ".sh": "bash",
+    ".py": "python",
+}
+
 
 def main():
     """
-    Finds the most recently modified .sh or .py scripts in ~/Downloads,
-    lists the top 3 (or fewer), and allows the user to execute one.
+    Finds the most recently modified scripts (.sh and .py by default) in ~/Downloads
+    or the configured directories, lists the top 3 (or fewer), and allows the user to execute one.
     Ignores files older than 10 minutes by default.
     """
     parser = argparse.ArgumentParser(
@@ -27,37 +34,67 @@ def main():
         action="store_true",
         help="Show all scripts, regardless of age.",
     )
+    parser.add_argument(
+        "-d",
+        "--dir",
+        action="append",
+        dest="directories",
+        metavar="DIR",
+        help="Directory to search (repeatable; default: PPG_LAST_RUN_DIRS or ~/Downloads).",
+    )
+    parser.add_argument(
+        "-e",
+        "--ext",
+        action="append",
+        dest="extensions",
+        metavar="EXT",
+        help="Script extension to include, e.g. .rb (repeatable; default: PPG_LAST_RUN_EXTENSIONS or .sh and .py).",
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="List every directory instead of using the index of recently seen scripts.",
+    )
     args = parser.parse_args()
 
-    downloads_dir = os.path.expanduser("~/Downloads")
-    scripts = glob.glob(os.path.join(downloads_dir, "*.sh")) + glob.glob(
-        os.path.join(downloads_dir, "*.py")
-    )
+    directories = args.directories
+    if not directories:
+        env_directories = os.environ.get("PPG_LAST_RUN_DIRS", "")
+        directories = [d for d in env_directories.split(os.pathsep) if d] or list(DEFAULT_DIRECTORIES)
+    extensions = args.extensions
+    if not extensions:
+        env_extensions = os.environ.get("PPG_LAST_RUN_EXTENSIONS", "")
+        extensions = [e.strip() for e in env_extensions.split(",") if e.strip()] or list(DEFAULT_EXTENSIONS)
+    extensions = [e if e.startswith(".") else f".{e}" for e in extensions]
+    location = ", ".join(directories)
+
+    index = None if args.no_index else ScriptIndex()
+    # Sorted by modification time (newest first), stat'ed once
+    scripts = find_recent_scripts(directories, extensions, index)
 
     if not scripts:
-        print("No scripts found in ~/Downloads. 😢")
+        print(f"No scripts found in {location}. 😢")
         return
 
-    # Sort scripts by modification time (newest first)
-    scripts.sort(key=os.path.getmtime, reverse=True)
-
     # Filter out scripts older than 10 minutes, unless --all is specified
+    now = time.time()
     if not args.all:
-        cutoff_time = time.time() - (10 * 60)  # 10 minutes in seconds
-        scripts = [s for s in scripts if os.path.getmtime(s) > cutoff_time]
+        cutoff_time = now - (10 * 60)  # 10 minutes in seconds
+        scripts = [s for s in scripts if s.mtime > cutoff_time]
 
     if not scripts:
-        print("No recent scripts found in ~/Downloads (last 10 minutes). 😢")
+        print(f"No recent scripts found in {location} (last 10 minutes). 😢")
         return
 
-    print("Recent scripts in ~/Downloads: 📜")
+    print(f"Recent scripts in {location}: 📜")
     for i, script in enumerate(scripts[:3]):
-        file_age = int(time.time() - os.path.getmtime(script))
+        file_age = max(int(now - script.mtime), 0)
         minutes = file_age // 60
         seconds = file_age % 60
         age_str = f"{minutes:2}m{seconds:2}s"
 
-        filename = os.path.basename(script)
+        # Name the directory only when several are searched
+        filename = script.name if len(directories) == 1 else script.path
         print(f"{i + 1}. {age_str} | {filename}")
 
     # Add option to create script from clipboard content on macOS
@@ -211,18 +248,17 @@ def main():
             return
 
     try:
-        os.chmod(script_to_run, os.stat(script_to_run).st_mode | stat.S_IEXEC)
-
-        print(f"Running: {os.path.basename(script_to_run)} 🏃‍♂️")
-
-        if script_to_run.endswith(".sh"):
-            subprocess.run(["bash", script_to_run], check=True)
-        elif script_to_run.endswith(".py"):
-            subprocess.run(["python", script_to_run], check=True)
-        else:
+        runner = RUNNERS.get(script_to_run.extension)
+        if not runner:
             print("Unsupported script type. 😕")
             return
 
+        os.chmod(script_to_run.path, os.stat(script_to_run.path).st_mode | stat.S_IEXEC)
+
+        print(f"Running: {script_to_run.name} 🏃‍♂️")
+
+        subprocess.run([runner, script_to_run.path], check=True)
+
     except subprocess.CalledProcessError as e:
         print(f"Error running script: {e} 💥")
     except FileNotFoundError:
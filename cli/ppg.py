@@ -1,13 +1,25 @@
 import argparse
 import os
 import sys
+import time
 
-from outputs import JSONOutputHandler, SingleFileOutputHandler, TreeJSONOutputHandler
-from prompts.generator import generate
-from prompts.options import JSONFormat, Options, OutputFormat
+from outputs.compression import SUFFIX_BY_COMPRESSION, with_compression_suffix
+from outputs.sqlite_handler import query_snapshot
+from prompts.batch import discover_roots, run_batch
+from prompts.compaction import COMPACTION_LEVELS
+from prompts.entropy_detector import DEFAULT_THRESHOLD
+from prompts.generator import create_output_handler, generate, output_path
+from prompts.options import GeneratedAction, JSONFormat, Options, OutputFormat
 from utils.envrc import update_envrc
 from utils.file_walker import FileWalker
+from utils.git_changes import changed_files
+from utils.git_source import GitRevisionError, GitRevisionWalker
+from utils.import_graph import ImportGraph
+from utils.memory_budget import parse_size
 from utils.ignore_handler import build_ignores
+from utils.reporting import LOG_FORMATS, configure_logging, get_logger
+
+log = get_logger(__name__)
 
 
 def is_git_repository(path):
@@ -22,7 +34,73 @@ def is_git_repository(path):
     return False
 
 
+def select_files(files_to_process, project_root, entry=None, changed=False):
+    """
+    Narrow the walked files down to what the run should process.
+    With an entry point, only the Python files reachable through its imports are kept.
+    With changed, only files modified, staged or untracked relative to HEAD are kept.
+    Returns the selected files and the relative paths of deleted files, which only changed reports.
+    """
+    deleted = []
+    if entry:
+        entry_path = os.path.relpath(os.path.abspath(entry), project_root)
+        files_to_process = ImportGraph(project_root, files_to_process).closure(entry_path)
+        log.info("Selected %s files reachable from %s", len(files_to_process), entry_path)
+    if changed:
+        files_to_process, deleted = changed_files(project_root, files_to_process)
+        log.info("Selected %s changed and %s deleted files", len(files_to_process), len(deleted))
+    return files_to_process, deleted
+
+
+def query(argv):
+    """
+    Run full text and path queries against a snapshot written with --sqlite.
+    """
+    parser = argparse.ArgumentParser(
+        prog="ppg query",
+        description="Query a SQLite snapshot written by ppg --sqlite.",
+        epilog="""
+Examples:
+  ppg query "def generate"          # Lines containing the phrase
+  ppg query TODO --path "prompts/*" # Lines in matching paths
+  ppg query --path "*.py"           # List matching files
+""",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("text", nargs="?", help="Text to search for in file lines")
+    parser.add_argument("--path", help="Glob pattern for relative paths, e.g. 'prompts/*.py'")
+    parser.add_argument("--language", help="Only files with this language hint, e.g. python")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum number of results (default: 50)")
+    parser.add_argument(
+        "--db",
+        default=os.environ.get("PPG_SQLITE_OUTPUT_FILE", "project_data.sqlite"),
+        help="Snapshot database (default: PPG_SQLITE_OUTPUT_FILE or project_data.sqlite)",
+    )
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    database_file = os.path.expanduser(args.db)
+    if not os.path.exists(database_file):
+        log.error("Snapshot database not found: %s. Run ppg --sqlite first.", database_file)
+        sys.exit(1)
+
+    started = time.perf_counter()
+    rows = query_snapshot(database_file, args.text, args.path, args.language, args.limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for relative_path, line_number, value in rows:
+        if line_number is None:
+            print(relative_path)
+        else:
+            print(f"{relative_path}:{line_number}: {value}")
+    print(f"{len(rows)} results in {elapsed_ms:.1f} ms", file=sys.stderr)
+
+
 def cli():
+    if len(sys.argv) > 1 and sys.argv[1] == "query":
+        query(sys.argv[2:])
+        return
+
     # Create the top-level parser with expanded help
     parser = argparse.ArgumentParser(
         description="""A CLI tool that converts project files into markdown for LLM prompts.
@@ -35,7 +113,27 @@ Examples:
   ppg              # Generate JSON output with content split into lines (default)
   ppg --markdown       # Generate markdown output (compact format)
   ppg --tree-json  # Generate tree-structured JSON output
+  ppg --path-table # Generate tree JSON as flat directory and file tables
+  ppg --sqlite     # Generate a SQLite database with a full text index
+  ppg --ndjson     # Generate JSON Lines output, one record per file
+  ppg query TODO   # Query the SQLite database
   ppg --force      # Force execution outside of a git repository
+  ppg --rev main   # Generate output from the files of a git revision
+  ppg --changed    # Only files modified, staged or untracked relative to HEAD
+  ppg --max-tokens 100000  # Split output into shards that fit a context window
+  ppg --entry cli/ppg.py   # Only include Python files imported from an entry point
+  ppg --compress gzip      # Write project_data.json.gz
+  ppg --compact-json       # Write JSON without indentation
+  ppg --resume             # Continue an interrupted run from its last checkpoint
+  ppg --max-memory 1G      # Spill buffered output to disk beyond 1 GB
+  ppg --generated stub     # Replace lockfiles, minified and generated code with their size and hash
+  ppg --entropy            # Also mask random-looking tokens such as API keys
+  ppg --notebook-outputs 500  # Keep truncated text outputs of notebook cells
+  ppg --compaction 2       # Strip comments, trailing whitespace and blank-line runs
+  ppg --roots a b c        # Snapshot several projects in parallel, each to its own output
+  ppg --submodules --roots . --combined  # One output for a repository and its submodules
+  ppg -v           # Also list every processed file
+  ppg --log-format json    # Log messages and progress events as JSON lines
   ppg --update-env # Update .envrc with output paths and exit
 
 Environment Variables:
@@ -43,6 +141,9 @@ Environment Variables:
   PPG_IGNORE_FILES         # Comma-separated list of .gitignore files
   PPG_JSON_OUTPUT_FILE     # Custom JSON output filename (default: project_data.json)
   PPG_TREE_JSON_OUTPUT_FILE # Custom tree JSON output filename (default: project_filesystem.json)
+  PPG_SQLITE_OUTPUT_FILE   # Custom SQLite output filename (default: project_data.sqlite)
+  PPG_NDJSON_OUTPUT_FILE   # Custom JSON Lines output filename (default: project_data.ndjson)
+  PPG_CLASSIFIER_ALLOW     # Comma-separated patterns never treated as generated content
 
 For more information, visit: https://github.com/qrtt1/project-prompt-generator
 """,
@@ -78,6 +179,181 @@ For more information, visit: https://github.com/qrtt1/project-prompt-generator
         help="Generate tree-structured JSON output mimicking a filesystem",
     )
 
+    parser.add_argument(
+        "--path-table",
+        action="store_true",
+        help="Write tree JSON as flat directory and file tables instead of nested nodes (implies --tree-json)",
+    )
+
+    # Add --sqlite argument
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        dest="sqlite",
+        help="Generate a SQLite database with a full text index (query it with 'ppg query')",
+    )
+
+    # Add --ndjson argument
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        dest="ndjson",
+        help="Generate JSON Lines output written as files are processed",
+    )
+
+    parser.add_argument(
+        "--compress",
+        choices=sorted(SUFFIX_BY_COMPRESSION),
+        help="Compress output while it is written (also chosen by a .gz, .xz or .bz2 output suffix)",
+    )
+
+    parser.add_argument(
+        "--compact-json",
+        action="store_true",
+        help="Write JSON and tree JSON output without indentation",
+    )
+
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        dest="sidecar_index",
+        help="Also write <output>.idx.json with the byte offset of each file for random access",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Checkpoint progress periodically and continue an interrupted run from its last checkpoint",
+    )
+
+    parser.add_argument(
+        "--max-memory",
+        metavar="SIZE",
+        help="Spill buffered output to temporary files once it exceeds SIZE (e.g. 512M, 2G)",
+    )
+
+    parser.add_argument(
+        "--generated",
+        choices=[action.value for action in GeneratedAction],
+        default=GeneratedAction.KEEP.value,
+        help="What to do with generated, minified and lockfile content: keep it (default), "
+             "stub it to its size and hash, or skip it",
+    )
+
+    parser.add_argument(
+        "--entropy",
+        type=float,
+        nargs="?",
+        const=DEFAULT_THRESHOLD,
+        metavar="BITS",
+        help=f"Also mask random-looking tokens with at least BITS of entropy per character "
+             f"(default: {DEFAULT_THRESHOLD})",
+    )
+
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Emit identical files once and reference the first copy from later occurrences",
+    )
+
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        metavar="N",
+        help="Split markdown or JSON output into numbered shards of at most N estimated tokens",
+    )
+
+    parser.add_argument(
+        "--skeleton-threshold",
+        type=int,
+        metavar="BYTES",
+        help="Reduce source files larger than BYTES to signatures and docstrings",
+    )
+
+    parser.add_argument(
+        "--notebook-outputs",
+        type=int,
+        default=0,
+        metavar="CHARS",
+        help="Keep up to CHARS characters of text output per notebook code cell (default: 0, drop outputs)",
+    )
+
+    parser.add_argument(
+        "--compaction",
+        type=int,
+        choices=COMPACTION_LEVELS,
+        default=0,
+        metavar="LEVEL",
+        help="Compact emitted content after masking: 1 trims trailing whitespace and blank-line runs, "
+             "2 also strips comments (default: 0, off)",
+    )
+
+    parser.add_argument(
+        "--entry",
+        metavar="PATH",
+        help="Only include the Python files reachable through imports from this entry point",
+    )
+
+    parser.add_argument(
+        "--changed",
+        action="store_true",
+        help="Only include files modified, staged or untracked relative to HEAD, and list deleted files in the outline",
+    )
+
+    parser.add_argument(
+        "--rev",
+        metavar="REVISION",
+        help="Read files from a git revision (branch, tag or commit) instead of the working tree",
+    )
+
+    parser.add_argument(
+        "--roots",
+        nargs="+",
+        metavar="PATH",
+        help="Snapshot several project roots in parallel, each to its own output (or one with --combined)",
+    )
+
+    parser.add_argument(
+        "--submodules",
+        action="store_true",
+        help="Also snapshot the git submodules and linked worktrees of the current repository in parallel",
+    )
+
+    parser.add_argument(
+        "--combined",
+        action="store_true",
+        help="Write the roots of a batch into one output with paths prefixed by each root",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Number of worker processes for --roots and --submodules (default: number of CPUs)",
+    )
+
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Log every processed and skipped file",
+    )
+
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="Only log warnings and errors, without progress",
+    )
+
+    parser.add_argument(
+        "--log-format",
+        choices=LOG_FORMATS,
+        default="auto",
+        help="Format of log messages on stderr: text, json, or auto for text on a terminal (default: auto)",
+    )
+
     parser.add_argument(
         "--update-env",
         action="store_true",
@@ -86,6 +362,41 @@ For more information, visit: https://github.com/qrtt1/project-prompt-generator
 
     # Parse arguments
     args = parser.parse_args()
+    configure_logging(-1 if args.quiet else args.verbose, args.log_format)
+    if args.path_table:
+        args.tree_json = True
+
+    if args.max_tokens is not None and args.max_tokens <= 0:
+        parser.error("--max-tokens must be a positive number")
+    if args.max_tokens and (args.tree_json or args.sqlite or args.ndjson):
+        parser.error("--max-tokens is only supported with markdown and JSON output")
+    if args.entropy is not None and args.no_mask:
+        parser.error("--entropy cannot be combined with --no-mask")
+    if args.notebook_outputs < 0:
+        parser.error("--notebook-outputs must not be negative")
+    if args.compress and args.sqlite:
+        parser.error("--compress is not supported with --sqlite")
+    max_memory = None
+    if args.max_memory is not None:
+        try:
+            max_memory = parse_size(args.max_memory)
+        except ValueError as e:
+            parser.error(f"--max-memory: {e}")
+        if args.resume:
+            parser.error("--max-memory cannot be combined with --resume")
+    if args.resume and (args.sqlite or args.ndjson):
+        parser.error("--resume is not supported with --sqlite or --ndjson, which write their output as they go")
+    batch = bool(args.roots or args.submodules)
+    if (args.combined or args.jobs is not None) and not batch:
+        parser.error("--combined and --jobs require --roots or --submodules")
+    if args.jobs is not None and args.jobs <= 0:
+        parser.error("--jobs must be a positive number")
+    if args.changed and (args.rev or batch):
+        parser.error("--changed cannot be combined with --rev, --roots or --submodules")
+    if batch and (args.rev or args.entry or args.resume or max_memory):
+        parser.error("--roots and --submodules cannot be combined with --rev, --entry, --resume or --max-memory")
+    if args.compact_json and (args.markdown or args.sqlite or args.ndjson):
+        parser.error("--compact-json is only supported with JSON and tree JSON output")
 
     # If --update-env is used, just update .envrc and exit
     if args.update_env:
@@ -94,35 +405,49 @@ For more information, visit: https://github.com/qrtt1/project-prompt-generator
 
     # Check if it's a git repo
     if not args.force and not is_git_repository(os.getcwd()):
-        print("Error: Not a git repository. Use --force to run anyway.")
+        log.error("Not a git repository. Use --force to run anyway.")
         sys.exit(1)
 
     # Determine output file and directory
     output_file = os.environ.get("PPG_OUTPUT_FILE", "project_docs.md")
     json_output_file = os.environ.get("PPG_JSON_OUTPUT_FILE", "project_data.json")
     tree_json_output_file = os.environ.get("PPG_TREE_JSON_OUTPUT_FILE", "project_filesystem.json")
+    sqlite_output_file = os.environ.get("PPG_SQLITE_OUTPUT_FILE", "project_data.sqlite")
+    ndjson_output_file = os.environ.get("PPG_NDJSON_OUTPUT_FILE", "project_data.ndjson")
 
     # Expand ~ to user's home directory
     output_file = os.path.expanduser(output_file)
     json_output_file = os.path.expanduser(json_output_file)
     tree_json_output_file = os.path.expanduser(tree_json_output_file)
+    sqlite_output_file = os.path.expanduser(sqlite_output_file)
+    ndjson_output_file = os.path.expanduser(ndjson_output_file)
+
+    # Compressed outputs are recognized by their suffix
+    output_file = with_compression_suffix(output_file, args.compress)
+    json_output_file = with_compression_suffix(json_output_file, args.compress)
+    tree_json_output_file = with_compression_suffix(tree_json_output_file, args.compress)
+    ndjson_output_file = with_compression_suffix(ndjson_output_file, args.compress)
 
     if args.markdown:
-        output_path = os.path.abspath(output_file)
         output_format = OutputFormat.MARKDOWN
     elif args.tree_json:
-        output_path = os.path.abspath(tree_json_output_file)
         output_format = OutputFormat.TREE_JSON
+    elif args.sqlite:
+        output_format = OutputFormat.SQLITE
+    elif args.ndjson:
+        output_format = OutputFormat.NDJSON
     else:
-        output_path = os.path.abspath(json_output_file)
         output_format = OutputFormat.JSON
 
-    print(f"Outputting to: {output_path}")
-
     project_root = os.getcwd()
     ignore_spec = build_ignores(project_root)
-    file_walker = FileWalker(project_root, ignore_spec)
-    files_to_process = file_walker.get_files()
+
+    if args.path_table:
+        json_format = JSONFormat.PATH_TABLE
+    elif args.tree_json:
+        json_format = JSONFormat.TREE
+    else:
+        json_format = JSONFormat.COMPACT if args.markdown else JSONFormat.SPLIT
 
     no_mask = args.no_mask
     options = Options(
@@ -131,17 +456,61 @@ For more information, visit: https://github.com/qrtt1/project-prompt-generator
         output_format=output_format,
         json_output_file=json_output_file,
         tree_json_output_file=tree_json_output_file,
-        json_format=JSONFormat.TREE if args.tree_json else (JSONFormat.COMPACT if args.markdown else JSONFormat.SPLIT),
+        sqlite_output_file=sqlite_output_file,
+        ndjson_output_file=ndjson_output_file,
+        json_format=json_format,
+        dedup=args.dedup,
+        max_tokens=args.max_tokens,
+        skeleton_threshold=args.skeleton_threshold,
+        notebook_outputs=args.notebook_outputs,
+        compaction=args.compaction,
+        sidecar_index=args.sidecar_index,
+        compact_json=args.compact_json,
+        resume=args.resume,
+        max_memory=max_memory,
+        generated=GeneratedAction(args.generated),
+        entropy_threshold=args.entropy,
+        generated_allow=tuple(os.environ.get("PPG_CLASSIFIER_ALLOW", "").split(",")),
     )
 
-    if args.markdown:
-        output_handler = SingleFileOutputHandler(output_file)
-    elif args.tree_json:
-        output_handler = TreeJSONOutputHandler(tree_json_output_file)
-    else:
-        output_handler = JSONOutputHandler(json_output_file, options.json_format)
+    if batch:
+        roots = list(args.roots or [])
+        if args.submodules:
+            discovered = discover_roots(project_root)
+            log.info("Discovered %s submodules and worktrees", len(discovered))
+            roots.extend(discovered)
+        missing = [root for root in roots if not os.path.isdir(root)]
+        if missing:
+            log.error("Not a directory: %s", ", ".join(missing))
+            sys.exit(1)
+        if not roots:
+            log.error("No roots to snapshot")
+            sys.exit(1)
+        results = run_batch(roots, options, args.jobs, args.combined)
+        if any(result.error for result in results):
+            sys.exit(1)
+        return
+
+    log.info("Outputting to: %s", os.path.abspath(output_path(options)))
+    output_handler = create_output_handler(options)
 
-    generate(files_to_process, options, output_handler)
+    if args.rev:
+        try:
+            with GitRevisionWalker(project_root, args.rev, ignore_spec) as git_walker:
+                files_to_process, _ = select_files(git_walker.get_files(), project_root, args.entry)
+                generate(files_to_process, options, output_handler)
+        except (GitRevisionError, ValueError) as e:
+            log.error("%s", e)
+            sys.exit(1)
+    else:
+        file_walker = FileWalker(project_root, ignore_spec)
+        try:
+            files_to_process, deleted = select_files(file_walker.get_files(), project_root, args.entry,
+                                                     args.changed)
+        except (GitRevisionError, ValueError) as e:
+            log.error("%s", e)
+            sys.exit(1)
+        generate(files_to_process, options, output_handler, deleted=deleted)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,11 @@
 from .output_handler import OutputHandler
 from .single_file_handler import SingleFileOutputHandler
 from .json_handler import JSONOutputHandler
-from .tree_json_handler import TreeJSONOutputHandler
+from .tree_json_handler import TreeJSONOutputHandler, path_table_to_tree
+from .sqlite_handler import SQLiteOutputHandler
+from .ndjson_handler import NDJSONOutputHandler
 from .osx_clipboard import osx_copy_to_clipboard
+from .sidecar_index import SidecarIndex
 
 __all__ = [
     "osx_copy_to_clipboard",
@@ -10,4 +13,8 @@ __all__ = [
     "SingleFileOutputHandler",
     "JSONOutputHandler",
     "TreeJSONOutputHandler",
+    "SQLiteOutputHandler",
+    "NDJSONOutputHandler",
+    "SidecarIndex",
+    "path_table_to_tree",
 ]
@@ -0,0 +1,117 @@
+"""
+Atomic writer module for replacing output files safely.
+
+Output is streamed to a temporary file in the same directory while a hash is
+computed on the fly. On close the temporary file either atomically replaces
+the output, or is discarded when the existing output has identical content,
+so readers never see half-written files and unchanged snapshots do not touch
+the output at all.
+"""
+
+import hashlib
+import os
+import tempfile
+
+# Chunk size used when hashing an existing output
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _current_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def file_digest(path):
+    """
+    Hash a file in chunks.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        str: The SHA-256 hex digest of the file.
+    """
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class AtomicFileWriter:
+    """
+    Binary file object that writes to a temporary file and replaces the target on close.
+    """
+
+    def __init__(self, path):
+        """
+        Create the temporary file next to the target.
+
+        Args:
+            path (str): The path of the file to replace.
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, self.temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+        self.file = os.fdopen(fd, "wb")
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        # None while open; True if the target was replaced, False if it was already identical
+        self.changed = None
+
+    def write(self, data):
+        self.file.write(data)
+        self.hasher.update(data)
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        self.file.flush()
+
+    def _is_unchanged(self):
+        try:
+            if os.path.getsize(self.path) != self.size:
+                return False
+            return file_digest(self.path) == self.hasher.hexdigest()
+        except OSError:
+            return False
+
+    def close(self):
+        """
+        Finish writing: keep an identical existing file, otherwise move the temporary file into place.
+        """
+        if self.changed is not None:
+            return
+        self.file.close()
+        if self._is_unchanged():
+            os.remove(self.temp_path)
+            self.changed = False
+            return
+
+        if os.path.exists(self.path):
+            os.chmod(self.temp_path, os.stat(self.path).st_mode & 0o7777)
+        else:
+            # mkstemp creates private files; give new outputs the usual permissions
+            os.chmod(self.temp_path, 0o666 & ~_current_umask())
+        os.replace(self.temp_path, self.path)
+        self.changed = True
+
+    def abort(self):
+        """
+        Discard the temporary file and leave the target untouched.
+        """
+        if self.changed is not None:
+            return
+        self.file.close()
+        os.remove(self.temp_path)
+        self.changed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
@@ -0,0 +1,207 @@
+"""
+Compression module for streaming output through gzip, xz or bz2.
+
+The compression is chosen by the output file suffix, so handlers open their
+output with open_output and bytes are compressed as they are written.
+Outputs are written atomically unless a handler streams them (atomic=False),
+in which case flushed records are visible to readers while the run goes on.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+
+from .atomic_writer import AtomicFileWriter
+
+# Output file suffix -> compression name
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".xz": "xz",
+    ".bz2": "bz2",
+}
+
+SUFFIX_BY_COMPRESSION = {name: suffix for suffix, name in COMPRESSION_SUFFIXES.items()}
+
+
+def detect_compression(path):
+    """
+    Detect the compression of a file from its suffix.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        str: "gzip", "xz" or "bz2", or None for uncompressed files.
+    """
+    return COMPRESSION_SUFFIXES.get(os.path.splitext(path)[1].lower())
+
+
+def split_compression_suffix(path):
+    """
+    Split the compression suffix off a path.
+
+    Args:
+        path (str): The file path, e.g. project_data.json.gz.
+
+    Returns:
+        tuple: (path without the suffix, suffix or an empty string).
+    """
+    base, ext = os.path.splitext(path)
+    if ext.lower() in COMPRESSION_SUFFIXES:
+        return base, ext
+    return path, ""
+
+
+def with_compression_suffix(path, compression):
+    """
+    Add the suffix of a compression to a path unless it already has one.
+
+    Args:
+        path (str): The file path.
+        compression (str): "gzip", "xz" or "bz2", or None.
+
+    Returns:
+        str: The path to write compressed output to.
+    """
+    if not compression or detect_compression(path):
+        return path
+    return path + SUFFIX_BY_COMPRESSION[compression]
+
+
+class CompressedWriter:
+    """
+    Binary writer that compresses into an underlying file object and closes both.
+    """
+
+    def __init__(self, raw, compression):
+        """
+        Initialize the writer.
+
+        Args:
+            raw: The binary file object receiving compressed bytes.
+            compression (str): "gzip", "xz" or "bz2".
+        """
+        self.raw = raw
+        if compression == "gzip":
+            # A fixed mtime and no embedded name keep identical content byte-identical
+            self.compressor = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)
+        elif compression == "xz":
+            self.compressor = lzma.LZMAFile(raw, "wb")
+        elif compression == "bz2":
+            self.compressor = bz2.BZ2File(raw, "wb")
+        else:
+            raise ValueError(f"Unsupported compression: {compression}")
+
+    @property
+    def changed(self):
+        return self.raw.changed
+
+    def write(self, data):
+        return self.compressor.write(data)
+
+    def flush(self):
+        """
+        Push the data written so far through the compressor, so it can be decompressed before close.
+        """
+        self.compressor.flush()
+        self.raw.flush()
+
+    def close(self):
+        try:
+            self.compressor.close()
+        except BaseException:
+            self.raw.abort()
+            raise
+        self.raw.close()
+
+    def abort(self):
+        try:
+            self.compressor.close()
+        finally:
+            self.raw.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+class StreamingFileWriter:
+    """
+    Binary file object that writes straight to its target, for outputs read while they are written.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        # The target is rewritten in place, so it always counts as changed
+        self.changed = None
+
+    def write(self, data):
+        return self.file.write(data)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        if self.changed is None:
+            self.file.close()
+            self.changed = True
+
+    def abort(self):
+        """
+        Close the file, keeping what was written before the error.
+        """
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def open_output(path, atomic=True):
+    """
+    Open an output file for binary writing, compressing by its suffix.
+
+    Args:
+        path (str): The output path, e.g. project_data.json or project_data.json.gz.
+        atomic (bool): Write to a temporary file that replaces the output on close, leaving the output
+                       untouched when its content is unchanged. Otherwise write to the output directly,
+                       so flushed data can be read during the run.
+
+    Returns:
+        A binary file object to write to; closing it finishes the compressed stream
+        and its `changed` attribute then tells whether the file was replaced.
+    """
+    raw = AtomicFileWriter(path) if atomic else StreamingFileWriter(path)
+    compression = detect_compression(path)
+    if compression is None:
+        return raw
+    return CompressedWriter(raw, compression)
+
+
+def open_input(path):
+    """
+    Open a possibly compressed output file for binary reading.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        A binary file object yielding the uncompressed bytes.
+    """
+    compression = detect_compression(path)
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "xz":
+        return lzma.open(path, "rb")
+    if compression == "bz2":
+        return bz2.open(path, "rb")
+    return open(path, "rb")
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List, Optional
 
 
 @dataclass
@@ -28,6 +29,62 @@ class FileProcessedEvent(Event):
     filename: str
     relative_path: str
     content: str
+    # Relative path of the first file with identical content when deduplication is enabled
+    duplicate_of: Optional[str] = None
+
+
+@dataclass
+class FileBatchProcessedEvent(Event):
+    """
+    Event for a batch of processed files, in processing order.
+    Handlers without a batch handler receive each FileProcessedEvent instead.
+    """
+
+    events: List[FileProcessedEvent] = field(default_factory=list)
+
+
+@dataclass
+class OutlineEntry:
+    """
+    One processed file in the outline.
+    """
+
+    seq: int
+    original: str
+    md_filename: str
+    rel_path: str
+    # Size in bytes and SHA-256 of the file content after masking. Stubbed and skipped generated
+    # files are never masked, so theirs cover the original content, matching the stub's size and hash.
+    size: int
+    hash: str
+    # Estimated tokens of the emitted content
+    tokens: int = 0
+    duplicate_of: Optional[str] = None
+    # Classification of generated, minified or lockfile content and whether it was stubbed or skipped
+    generated: Optional[str] = None
+    generated_action: Optional[str] = None
+    # Deleted in the working tree (--changed); listed without content, size or hash
+    deleted: bool = False
+
+    def to_record(self):
+        """
+        Returns:
+            dict: The entry as an outline record of the JSON based outputs.
+        """
+        record = {
+            "markdown_filename": self.md_filename,
+            "original_filename": self.original,
+            "path": self.rel_path,
+            "tokens": self.tokens,
+        }
+        if self.duplicate_of:
+            record["duplicate_of"] = self.duplicate_of
+        if self.generated:
+            record["generated"] = self.generated
+            record["generated_action"] = self.generated_action
+        if self.deleted:
+            record["deleted"] = True
+        return record
 
 
 @dataclass
@@ -36,7 +93,7 @@ class OutlineCreatedEvent(Event):
     Event for the outline being created.
     """
 
-    content: str
+    entries: List[OutlineEntry] = field(default_factory=list)
 
 
 @dataclass
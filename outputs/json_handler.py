@@ -2,11 +2,18 @@ import json
 import os
 from os.path import expanduser
 
-from outputs.events import Event
+from outputs.events import EndEvent, FileProcessedEvent, OutlineCreatedEvent
 from prompts.options import JSONFormat
 from utils.language_mapping import EXTENSION_MAPPING
+from utils.memory_budget import SpillableList
+from utils.token_estimator import estimate_tokens, language_for_path
 
 from .output_handler import OutputHandler
+from .compression import open_output
+from .json_writer import write_document
+from .serializers import JSONSerializer
+from .sharding import plan_shards, shard_path, split_content, write_shard_index
+from .sidecar_index import CountingWriter, SidecarIndexBuilder
 
 
 class JSONOutputHandler(OutputHandler):
@@ -15,46 +22,84 @@ class JSONOutputHandler(OutputHandler):
     Supports two formats:
     - compact: Original format with content as single string
     - split: New format with content split into lines
+    With a token budget, the files are written to numbered shards instead.
     """
 
-    def __init__(self, output_file, json_format=JSONFormat.COMPACT):
+    STATE_ATTRIBUTES = ("project_data", "file_tokens")
+
+    def __init__(self, output_file, json_format=JSONFormat.COMPACT, max_tokens=None, sidecar_index=False,
+                 compact=False):
         """
         Initialize the output handler.
 
         Args:
             output_file (str): The path to the output file.
             json_format (JSONFormat): The format to use for JSON output.
+            max_tokens (int, optional): Token budget per shard. Defaults to None (one file).
+            sidecar_index (bool): Also write a byte-offset index of each file's record.
+            compact (bool): Write JSON without indentation.
         """
         super().__init__()
         self.output_file = output_file
         self.json_format = json_format
+        self.max_tokens = max_tokens
+        self.sidecar_index = sidecar_index
+        self.serializer = JSONSerializer(pretty=not compact)
         self.project_data = {"outline": [], "files": []}
-        self.on("OutlineCreatedEvent", self._handle_outline_created)
-        self.on("FileProcessedEvent", self._handle_file_processed)
-        self.on("EndEvent", self._handle_end_event)
+        # Estimated tokens of each record in project_data["files"], only tracked when sharding
+        self.file_tokens = []
+        self.on(OutlineCreatedEvent, self._handle_outline_created)
+        self.on(FileProcessedEvent, self._handle_file_processed)
+        self.on(EndEvent, self._handle_end_event)
+
+    def use_memory_budget(self, budget):
+        super().use_memory_budget(budget)
+        self.project_data["files"] = SpillableList(budget)
 
     def _handle_outline_created(self, event):
-        # Parse the outline content to create structured data
-        outline_lines = event.content.split("\n")
-        for line in outline_lines[2:]:  # Skip the "# Outline" header
-            if line.strip().startswith("-"):
-                # Extract information from the outline line
-                parts = line.strip("- ").split(" (original: ")
-                if len(parts) == 2:
-                    md_filename = parts[0]
-                    rest = parts[1].split(", path: ")
-                    if len(rest) == 2:
-                        original = rest[0]
-                        path = rest[1].rstrip(")")
-                        self.project_data["outline"].append(
-                            {
-                                "markdown_filename": md_filename,
-                                "original_filename": original,
-                                "path": path,
-                            }
-                        )
+        self.project_data["outline"].extend(entry.to_record() for entry in event.entries)
 
     def _handle_file_processed(self, event):
+        if not self.max_tokens:
+            self.project_data["files"].append(self._create_file_data(event, event.content))
+            return
+
+        language = language_for_path(event.relative_path)
+        file_data = self._create_file_data(event, event.content)
+        tokens = self._estimate_record_tokens(file_data, language)
+        if tokens <= self.max_tokens:
+            self.project_data["files"].append(file_data)
+            self.file_tokens.append(tokens)
+            return
+
+        # Only a file that alone exceeds the budget is split, on line boundaries
+        header_tokens = self._estimate_record_tokens(self._create_file_data(event, ""), language)
+        pieces = split_content(event.content, max(1, self.max_tokens - header_tokens), language)
+        first_line = 1
+        for part, piece in enumerate(pieces, start=1):
+            file_data = self._create_file_data(event, piece, first_line)
+            file_data["part"] = part
+            file_data["parts"] = len(pieces)
+            self.project_data["files"].append(file_data)
+            self.file_tokens.append(self._estimate_record_tokens(file_data, language))
+            first_line += piece.count("\n")
+
+    def _estimate_record_tokens(self, file_data, language):
+        # Compact serialization keeps estimation cheap; indentation adds few tokens
+        return estimate_tokens(json.dumps(file_data, ensure_ascii=False), language)
+
+    def _create_file_data(self, event, content, first_line=1):
+        """
+        Create the JSON record of a processed file.
+
+        Args:
+            event: The FileProcessedEvent of the file.
+            content (str): The content, or a part of it, to put in the record.
+            first_line (int): Line number of the first line of content.
+
+        Returns:
+            dict: The file record.
+        """
         file_data = {
             "filename": event.filename,
             "relative_path": event.relative_path,
@@ -65,35 +110,87 @@ class JSONOutputHandler(OutputHandler):
         }
 
         # Handle content based on JSON format
-        if self.json_format == JSONFormat.SPLIT:
+        if event.duplicate_of:
+            # Identical content is emitted once; later occurrences only reference it
+            file_data["duplicate_of"] = event.duplicate_of
+        elif self.json_format == JSONFormat.SPLIT:
             # Create content_lines with line numbers
             content_lines = []
-            for i, line in enumerate(event.content.splitlines()):
-                content_lines.append({"line_number": i + 1, "content": line})
+            for i, line in enumerate(content.splitlines()):
+                content_lines.append({"line_number": i + first_line, "content": line})
             file_data["content_lines"] = content_lines
         else:  # COMPACT format
-            file_data["content"] = event.content
+            file_data["content"] = content
 
-        self.project_data["files"].append(file_data)
+        return file_data
 
-    def _handle_end_event(self, event):
+    def _write_json(self, path, document):
         """
-        Handle the EndEvent by writing the collected data to a JSON file.
+        Write a JSON document, indexing the byte range of each file record if enabled.
 
         Args:
-            event: The EndEvent containing the completion message
+            path (str): The path of the file to write.
+            document (dict): The document with its file records under "files".
         """
-        with open(expanduser(self.output_file), "w", encoding="utf-8") as f:
-            json.dump(self.project_data, f, indent=2, ensure_ascii=False)
-        print(f"JSON output written to {self.output_file}")
-        self.copy_to_clipboard(os.path.abspath(expanduser(self.output_file)))
+        index_builder = SidecarIndexBuilder() if self.sidecar_index else None
+        def index_record(i, file_data, offset, data):
+            key = file_data["relative_path"]
+            if file_data.get("part", 1) > 1:
+                # Parts of a split file are separate records, indexed under their own key
+                key = f"{key}#part-{file_data['part']}"
+            index_builder.add(key, offset, data)
 
-    def fire_event(self, event: Event):
+        with open_output(expanduser(path)) as f:
+            write_document(CountingWriter(f), document, "files", index_record if index_builder else None,
+                           self.serializer)
+        if index_builder:
+            index_builder.write(path, self.json_format.value)
+        return f.changed
+
+    def _write_shards(self):
+        """
+        Write the file records to shards under the token budget, plus the shard index.
+        The outline is kept in the first shard.
+
+        Returns:
+            str: The path of the shard index.
+        """
+        outline = self.project_data["outline"]
+        files = self.project_data["files"]
+        token_counts = [estimate_tokens(json.dumps(outline, ensure_ascii=False))] + self.file_tokens
+        plan = plan_shards(token_counts, self.max_tokens)
+
+        shards = []
+        for part, indexes in enumerate(plan, start=1):
+            shard_data = {"part": part, "parts": len(plan)}
+            if part == 1:
+                shard_data["outline"] = outline
+            shard_data["files"] = [files[i - 1] for i in indexes if i > 0]
+
+            path = shard_path(self.output_file, part)
+            changed = self._write_json(path, shard_data)
+
+            shard_files = []
+            for file_data in shard_data["files"]:
+                if file_data["relative_path"] not in shard_files:
+                    shard_files.append(file_data["relative_path"])
+            shards.append({"path": path, "tokens": sum(token_counts[i] for i in indexes), "files": shard_files})
+            self.report_output("JSON shard", path, changed)
+        return write_shard_index(self.output_file, self.max_tokens, shards)
+
+    def _handle_end_event(self, event):
         """
-        Fire an event to notify listeners.
+        Handle the EndEvent by writing the collected data to a JSON file.
+
+        Args:
+            event: The EndEvent containing the completion message
         """
-        event_name = type(event).__name__
-        if event_name in self._event_handlers:
-            for handler in self._event_handlers[event_name]:
-                handler(event)
+        if self.max_tokens:
+            index_file = self._write_shards()
+            self.report_output("JSON shard index", index_file)
+            self.copy_to_clipboard(os.path.abspath(expanduser(index_file)))
+            return
 
+        changed = self._write_json(self.output_file, self.project_data)
+        self.report_output("JSON output", self.output_file, changed)
+        self.copy_to_clipboard(os.path.abspath(expanduser(self.output_file)))
@@ -0,0 +1,61 @@
+"""
+JSON writer helpers for streaming documents.
+
+The output matches serializing the whole document at once, but list items
+under one key are serialized and written one at a time so callers can
+record where each item lands in the file.
+"""
+
+from .serializers import JSONSerializer
+
+# Default pretty serializer, matching json.dump(..., indent=2, ensure_ascii=False)
+PRETTY = JSONSerializer()
+
+
+def write_items(writer, items, level, on_item=None, serializer=PRETTY):
+    """
+    Write a JSON array item by item.
+
+    Args:
+        writer: A CountingWriter or any object with a write(text) method.
+        items (iterable): The array items.
+        level (int): Nesting depth of the array itself.
+        on_item (callable, optional): Called as on_item(index, item, offset, data) for every item,
+                                      with the byte offset and bytes of the item.
+        serializer (JSONSerializer): Serializer deciding the backend and compact or pretty layout.
+    """
+    item_break = serializer.line_break(level + 1)
+    empty = True
+    for index, item in enumerate(items):
+        writer.write(("[" if empty else ",") + item_break)
+        empty = False
+        offset = getattr(writer, "offset", None)
+        data = writer.write(serializer.dumps(item, level + 1))
+        if on_item:
+            on_item(index, item, offset, data)
+    writer.write("[]" if empty else serializer.line_break(level) + "]")
+
+
+def write_document(writer, document, items_key, on_item=None, serializer=PRETTY):
+    """
+    Write a JSON object whose items_key array is streamed item by item.
+
+    Args:
+        writer: A CountingWriter or any object with a write(text) method.
+        document (dict): The top-level object.
+        items_key (str): The key of the array to stream.
+        on_item (callable, optional): Passed to write_items for the streamed array.
+        serializer (JSONSerializer): Serializer deciding the backend and compact or pretty layout.
+    """
+    if not document:
+        writer.write("{}")
+        return
+    for position, (key, value) in enumerate(document.items()):
+        writer.write(("{" if position == 0 else ",") + serializer.line_break(1))
+        writer.write(serializer.dumps(key))
+        writer.write(serializer.key_separator)
+        if key == items_key:
+            write_items(writer, value, 1, on_item, serializer)
+        else:
+            writer.write(serializer.dumps(value, 1))
+    writer.write(serializer.line_break(0) + "}")
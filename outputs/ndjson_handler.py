@@ -0,0 +1,125 @@
+import os
+from os.path import expanduser
+
+from outputs.events import EndEvent, FileBatchProcessedEvent, FileProcessedEvent, OutlineCreatedEvent, StartEvent
+from prompts.options import JSONFormat
+from utils.language_mapping import EXTENSION_MAPPING
+
+from .compression import open_output
+from .output_handler import OutputHandler
+from .serializers import JSONSerializer
+from .sidecar_index import CountingWriter, SidecarIndexBuilder
+
+
+class NDJSONOutputHandler(OutputHandler):
+    """
+    Output handler for writing JSON Lines (NDJSON).
+    Each processed file is written as one JSON object per line as soon as it
+    arrives, followed by a trailing outline record, so consumers can stream
+    the output instead of loading one large document. The output is written
+    in place and flushed after every batch, so it can be read during the run.
+    """
+
+    def __init__(self, output_file, json_format=JSONFormat.SPLIT, sidecar_index=False):
+        """
+        Initialize the output handler.
+
+        Args:
+            output_file (str): The path to the output file.
+            json_format (JSONFormat): COMPACT for content strings, SPLIT for content_lines.
+            sidecar_index (bool): Also write a byte-offset index of each file's line.
+        """
+        super().__init__()
+        self.output_file = output_file
+        self.json_format = json_format
+        self.sidecar_index = sidecar_index
+        self.file = None
+        self.writer = None
+        self.index_builder = None
+        self.file_count = 0
+        self.serializer = JSONSerializer(pretty=False)
+        self.on(StartEvent, self._handle_start_event)
+        self.on(FileProcessedEvent, self._handle_file_processed)
+        self.on(FileBatchProcessedEvent, self._handle_file_batch)
+        self.on(OutlineCreatedEvent, self._handle_outline_created)
+        self.on(EndEvent, self._handle_end_event)
+
+    def _write_records(self, records):
+        """
+        Serialize records and write them to the output with a single write.
+
+        Args:
+            records (list): The records to write, one per line.
+        """
+        chunks = []
+        offset = self.writer.offset
+        for record in records:
+            data = self.serializer.dumps(record)
+            if self.index_builder and record["type"] == "file":
+                self.index_builder.add(record["relative_path"], offset, data)
+            chunks.append(data)
+            chunks.append(b"\n")
+            offset += len(data) + 1
+        self.writer.write(b"".join(chunks))
+        self.file.flush()
+
+    def _handle_start_event(self, event):
+        self.file = open_output(expanduser(self.output_file), atomic=False)
+        self.writer = CountingWriter(self.file)
+        if self.sidecar_index:
+            self.index_builder = SidecarIndexBuilder()
+
+    def _handle_file_processed(self, event):
+        self._write_records([self._create_file_record(event)])
+        self.file_count += 1
+
+    def _handle_file_batch(self, event):
+        self._write_records([self._create_file_record(file_event) for file_event in event.events])
+        self.file_count += len(event.events)
+
+    def _create_file_record(self, event):
+        # Same fields as the JSONOutputHandler file records, plus a record type
+        file_data = {
+            "type": "file",
+            "filename": event.filename,
+            "relative_path": event.relative_path,
+            "extension": os.path.splitext(event.filename)[1].lower(),
+            "language": EXTENSION_MAPPING.get(
+                os.path.splitext(event.filename)[1].lower(), ""
+            ),
+        }
+
+        if event.duplicate_of:
+            file_data["duplicate_of"] = event.duplicate_of
+        elif self.json_format == JSONFormat.SPLIT:
+            file_data["content_lines"] = [
+                {"line_number": i + 1, "content": line}
+                for i, line in enumerate(event.content.splitlines())
+            ]
+        else:  # COMPACT format
+            file_data["content"] = event.content
+        return file_data
+
+    def _handle_outline_created(self, event):
+        self._write_records([{
+            "type": "outline",
+            "file_count": self.file_count,
+            "outline": [entry.to_record() for entry in event.entries],
+        }])
+
+    def _handle_end_event(self, event):
+        """
+        Handle the EndEvent by closing the output file.
+
+        Args:
+            event: The EndEvent containing the completion message
+        """
+        if self.file is None:
+            return
+        self.file.close()
+        changed = self.file.changed
+        self.file = None
+        if self.index_builder:
+            self.index_builder.write(self.output_file, "ndjson")
+        self.report_output("NDJSON output", self.output_file, changed)
+        self.copy_to_clipboard(os.path.abspath(expanduser(self.output_file)))
@@ -1,30 +1,89 @@
 from abc import ABC, abstractmethod
-from typing import Callable
+from typing import Callable, Type, Union
 
-from outputs.events import Event
+from outputs import events
+from outputs.events import Event, FileBatchProcessedEvent, FileProcessedEvent
+from utils.reporting import get_logger
+
+log = get_logger(__name__)
 
 
 class OutputHandler(ABC):
     """
     Abstract base class for output handlers.
+    Handlers are registered per event class and dispatched by the exact class of the event.
     """
 
+    # Attributes holding the partial output, saved and restored for resumable runs.
+    # Handlers that stream their output as they go leave this empty and do not support resuming.
+    STATE_ATTRIBUTES = ()
+
     def __init__(self):
         self._event_handlers = {}
+        self.memory_budget = None
 
-    def on(self, event_name: str, handler: Callable):
-        if event_name not in self._event_handlers:
-            self._event_handlers[event_name] = []
-        self._event_handlers[event_name].append(handler)
+    def on(self, event_type: Union[Type[Event], str], handler: Callable):
+        """
+        Register a handler for an event class.
+
+        Args:
+            event_type: The event class, or its name in outputs.events.
+            handler (callable): Called with the event.
+        """
+        if isinstance(event_type, str):
+            event_type = getattr(events, event_type)
+        self._event_handlers.setdefault(event_type, []).append(handler)
 
     def fire_event(self, event: Event):
         """
         Fire an event to notify listeners.
+        A FileBatchProcessedEvent without a batch handler fans out to the FileProcessedEvent handlers.
         """
-        event_name = type(event).__name__
-        if event_name in self._event_handlers:
-            for handler in self._event_handlers[event_name]:
+        handlers = self._event_handlers.get(type(event))
+        if handlers:
+            for handler in handlers:
                 handler(event)
+        elif type(event) is FileBatchProcessedEvent:
+            file_handlers = self._event_handlers.get(FileProcessedEvent, ())
+            for file_event in event.events:
+                for handler in file_handlers:
+                    handler(file_event)
+
+    def use_memory_budget(self, budget):
+        """
+        Buffer the partial output in SpillableList objects sharing the budget.
+        Called before StartEvent; handlers that stream their output keep no buffers to spill.
+
+        Args:
+            budget (MemoryBudget): The shared memory budget.
+        """
+        self.memory_budget = budget
+
+    def get_state(self):
+        """
+        Returns:
+            dict: The partial output state, see STATE_ATTRIBUTES.
+        """
+        return {name: getattr(self, name) for name in self.STATE_ATTRIBUTES}
+
+    def set_state(self, state):
+        """
+        Restore the partial output state saved by get_state.
+
+        Args:
+            state (dict): The saved state.
+        """
+        for name in self.STATE_ATTRIBUTES:
+            setattr(self, name, state[name])
+
+    def report_output(self, label: str, path: str, changed: bool = True):
+        """
+        Report where an output went. Outputs whose content did not change are kept as they were.
+        """
+        if changed:
+            log.info("%s written to %s", label, path)
+        else:
+            log.info("%s unchanged, kept %s", label, path)
 
     def copy_to_clipboard(self, output_file_path: str):
         from outputs import osx_copy_to_clipboard
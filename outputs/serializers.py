@@ -0,0 +1,98 @@
+"""
+Serializer module for JSON output.
+
+A JSONSerializer turns values into UTF-8 encoded JSON in compact or pretty
+(two-space indent) form. The orjson backend is used when it is installed
+(pip install project-prompt-generator[fast]) and the stdlib json module is
+the fallback. For the data ppg writes both backends produce the same bytes,
+matching json.dumps(..., indent=2, ensure_ascii=False) in pretty mode and
+json.dumps(..., separators=(",", ":"), ensure_ascii=False) in compact mode.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+INDENT = "  "
+
+BACKENDS = ("orjson", "json")
+
+
+def default_backend():
+    """
+    Returns:
+        str: "orjson" when it is installed, otherwise "json".
+    """
+    return "orjson" if orjson is not None else "json"
+
+
+class JSONSerializer:
+    """
+    Serializes values to JSON bytes in compact or pretty mode.
+    """
+
+    def __init__(self, pretty=True, backend=None):
+        """
+        Initialize the serializer.
+
+        Args:
+            pretty (bool): Indent nested values by two spaces; otherwise write compact JSON.
+            backend (str, optional): "orjson" or "json". Defaults to the fastest installed backend.
+        """
+        self.pretty = pretty
+        self.backend = backend or default_backend()
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unsupported JSON backend: {self.backend}")
+        if self.backend == "orjson" and orjson is None:
+            raise ValueError("The orjson backend is not installed")
+        self.key_separator = ": " if pretty else ":"
+        self._level_breaks = {}
+
+    def line_break(self, level):
+        """
+        Whitespace that starts a new line at the given depth; empty in compact mode.
+
+        Args:
+            level (int): Nesting depth of the new line.
+
+        Returns:
+            str: The line break and indentation.
+        """
+        return "\n" + INDENT * level if self.pretty else ""
+
+    def _stdlib_dumps(self, value):
+        if self.pretty:
+            text = json.dumps(value, indent=2, ensure_ascii=False)
+        else:
+            text = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+        return text.encode("utf-8")
+
+    def dumps(self, value, level=0):
+        """
+        Serialize a value nested at the given depth.
+
+        Args:
+            value: The value to serialize.
+            level (int): Nesting depth; in pretty mode every line after the first is indented to it.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON.
+        """
+        if self.backend == "orjson":
+            try:
+                data = orjson.dumps(value, option=orjson.OPT_INDENT_2 if self.pretty else 0)
+            except TypeError:
+                # e.g. integers beyond 64 bits, which the stdlib handles
+                data = self._stdlib_dumps(value)
+        else:
+            data = self._stdlib_dumps(value)
+        if self.pretty and level:
+            # JSON strings never contain raw newlines, so every newline starts a new line of structure
+            level_break = self._level_breaks.get(level)
+            if level_break is None:
+                level_break = self._level_breaks[level] = self.line_break(level).encode("utf-8")
+            data = data.replace(b"\n", level_break)
+        return data
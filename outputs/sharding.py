@@ -0,0 +1,135 @@
+"""
+Sharding helpers for splitting output into parts that fit a token budget.
+"""
+
+import json
+import os
+from os.path import expanduser
+
+from utils.token_estimator import estimate_tokens
+
+from .atomic_writer import AtomicFileWriter
+from .compression import split_compression_suffix
+
+
+def shard_path(output_file, part):
+    """
+    Build the path of a shard, e.g. project_docs.md -> project_docs.part-001.md.
+    A compression suffix is kept at the end: project_docs.md.gz -> project_docs.part-001.md.gz.
+
+    Args:
+        output_file (str): The path of the unsharded output file.
+        part (int): The 1-based shard number.
+
+    Returns:
+        str: The shard path.
+    """
+    path, compression_suffix = split_compression_suffix(output_file)
+    base, ext = os.path.splitext(path)
+    return f"{base}.part-{part:03d}{ext}{compression_suffix}"
+
+
+def shard_index_path(output_file):
+    """
+    Build the path of the shard index, e.g. project_docs.md -> project_docs.index.json.
+
+    Args:
+        output_file (str): The path of the unsharded output file.
+
+    Returns:
+        str: The shard index path.
+    """
+    base, _ = os.path.splitext(split_compression_suffix(output_file)[0])
+    return f"{base}.index.json"
+
+
+def split_content(content, budget, language=""):
+    """
+    Split content on line boundaries into pieces that each fit in the budget.
+    A single line larger than the budget is cut into fixed-size character runs.
+
+    Args:
+        content (str): The content to split.
+        budget (int): Maximum tokens per piece.
+        language (str, optional): Language hint used for estimation.
+
+    Returns:
+        list: Content pieces in order; joining them restores the content.
+    """
+    pieces = []
+    current = []
+    current_tokens = 0
+    for line in content.splitlines(keepends=True):
+        line_tokens = estimate_tokens(line, language)
+        if line_tokens > budget:
+            if current:
+                pieces.append("".join(current))
+                current, current_tokens = [], 0
+            step = max(1, len(line) * budget // line_tokens)
+            pieces.extend(line[i:i + step] for i in range(0, len(line), step))
+            continue
+        if current and current_tokens + line_tokens > budget:
+            pieces.append("".join(current))
+            current, current_tokens = [], 0
+        current.append(line)
+        current_tokens += line_tokens
+    if current or not pieces:
+        pieces.append("".join(current))
+    return pieces
+
+
+def plan_shards(token_counts, budget):
+    """
+    Greedily group consecutive items into shards that stay within the budget.
+    An item larger than the budget gets a shard of its own.
+
+    Args:
+        token_counts (list): Estimated tokens of each item, in output order.
+        budget (int): Maximum tokens per shard.
+
+    Returns:
+        list: A list of shards, each a list of item indexes.
+    """
+    shards = []
+    current = []
+    current_tokens = 0
+    for index, tokens in enumerate(token_counts):
+        if current and current_tokens + tokens > budget:
+            shards.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        shards.append(current)
+    return shards
+
+
+def write_shard_index(output_file, budget, shards):
+    """
+    Write the shard index describing every shard and the files it holds.
+
+    Args:
+        output_file (str): The path of the unsharded output file.
+        budget (int): The token budget the shards were planned with.
+        shards (list): Dictionaries with "path", "tokens" and "files" for each shard.
+
+    Returns:
+        str: The path of the written index.
+    """
+    index_file = shard_index_path(output_file)
+    index = {
+        "budget": budget,
+        "total_tokens": sum(shard["tokens"] for shard in shards),
+        "shards": [
+            {
+                "part": part,
+                "path": os.path.basename(shard["path"]),
+                "tokens": shard["tokens"],
+                "files": shard["files"],
+            }
+            for part, shard in enumerate(shards, start=1)
+        ],
+    }
+    with AtomicFileWriter(expanduser(index_file)) as f:
+        f.write(json.dumps(index, indent=2, ensure_ascii=False).encode("utf-8"))
+    return index_file
@@ -0,0 +1,225 @@
+"""
+Sidecar index module for random access into output files.
+
+Handlers that enable the sidecar index write `<output>.idx.json` next to the
+output, mapping each file's relative path to the byte offset and length of
+its section or record plus a SHA-256 of those bytes. SidecarIndex reads one
+file back by slicing a memory map of the output instead of parsing it.
+For compressed outputs the ranges refer to the uncompressed stream, which is
+read through the decompressor instead of a memory map.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from os.path import expanduser
+
+from .atomic_writer import AtomicFileWriter
+from .compression import detect_compression, open_input
+
+SIDECAR_INDEX_SUFFIX = ".idx.json"
+
+# Bump when the index layout changes
+SIDECAR_INDEX_VERSION = 1
+
+
+def sidecar_index_path(output_file):
+    """
+    Build the path of the sidecar index for an output file.
+
+    Args:
+        output_file (str): The path of the output file.
+
+    Returns:
+        str: The sidecar index path, e.g. project_data.json.idx.json.
+    """
+    return output_file + SIDECAR_INDEX_SUFFIX
+
+
+class CountingWriter:
+    """
+    Encodes text as UTF-8 into a binary stream and tracks the byte offset.
+    """
+
+    def __init__(self, stream):
+        """
+        Initialize the writer.
+
+        Args:
+            stream: A binary file object.
+        """
+        self.stream = stream
+        self.offset = 0
+
+    def write(self, text):
+        """
+        Write text to the stream.
+
+        Args:
+            text (str or bytes): The text to write; bytes are written as they are.
+
+        Returns:
+            bytes: The encoded bytes that were written.
+        """
+        data = text if isinstance(text, bytes) else text.encode("utf-8")
+        self.stream.write(data)
+        self.offset += len(data)
+        return data
+
+
+class SidecarIndexBuilder:
+    """
+    Collects byte ranges while an output file is written.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._hashes = {}
+        self._last_path = None
+
+    def add(self, path, offset, data):
+        """
+        Record the bytes written for a file. A range that directly follows the
+        previous range of the same file (e.g. the next part of a split file)
+        extends it.
+
+        Args:
+            path (str): The relative path of the file.
+            offset (int): Byte offset where data starts.
+            data (bytes): The bytes of the section or record.
+        """
+        entry = self._entries.get(path)
+        if entry is not None and path == self._last_path and entry["offset"] + entry["length"] == offset:
+            entry["length"] += len(data)
+            self._hashes[path].update(data)
+        else:
+            self._entries[path] = {"offset": offset, "length": len(data)}
+            self._hashes[path] = hashlib.sha256(data)
+        self._last_path = path
+
+    def write(self, output_file, output_format):
+        """
+        Write the sidecar index for an output file.
+
+        Args:
+            output_file (str): The path of the output file the ranges refer to.
+            output_format (str): The output format, e.g. "markdown" or "json".
+
+        Returns:
+            str: The path of the written index.
+        """
+        for path, entry in self._entries.items():
+            entry["sha256"] = self._hashes[path].hexdigest()
+        index_file = sidecar_index_path(output_file)
+        index = {
+            "version": SIDECAR_INDEX_VERSION,
+            "output": os.path.basename(output_file),
+            "format": output_format,
+            "files": self._entries,
+        }
+        with AtomicFileWriter(expanduser(index_file)) as f:
+            f.write(json.dumps(index, ensure_ascii=False).encode("utf-8"))
+        return index_file
+
+
+class SidecarIndex:
+    """
+    Reads single files out of an output file through its sidecar index.
+    Use it as a context manager so the memory map is released when done.
+    """
+
+    def __init__(self, output_file):
+        """
+        Load the sidecar index and map the output file.
+
+        Args:
+            output_file (str): The path of the output file.
+        """
+        self.output_file = expanduser(output_file)
+        with open(sidecar_index_path(self.output_file), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != SIDECAR_INDEX_VERSION:
+            raise ValueError(f"Unsupported sidecar index version: {index.get('version')}")
+        self.format = index["format"]
+        self.entries = index["files"]
+        self._map = None
+        if detect_compression(self.output_file):
+            self._file = open_input(self.output_file)
+        else:
+            self._file = open(self.output_file, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        """
+        Release the memory map and the output file.
+        """
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def paths(self):
+        """
+        Returns:
+            list: The relative paths of all indexed files.
+        """
+        return list(self.entries)
+
+    def read(self, path, verify=False):
+        """
+        Read the raw bytes of a file's section or record.
+
+        Args:
+            path (str): The relative path of the file.
+            verify (bool): Check the bytes against the stored SHA-256.
+
+        Returns:
+            bytes: The section or record bytes.
+
+        Raises:
+            KeyError: If the path is not in the index.
+            ValueError: If verify is set and the hash does not match.
+        """
+        entry = self.entries[path]
+        if self._map is not None:
+            data = self._map[entry["offset"]:entry["offset"] + entry["length"]]
+        else:
+            self._file.seek(entry["offset"])
+            data = self._file.read(entry["length"])
+        if verify and hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            raise ValueError(f"Sidecar index hash mismatch for {path}")
+        return data
+
+    def read_text(self, path, verify=False):
+        """
+        Read a file's section or record as text.
+
+        Args:
+            path (str): The relative path of the file.
+            verify (bool): Check the bytes against the stored SHA-256.
+
+        Returns:
+            str: The decoded section or record.
+        """
+        return self.read(path, verify).decode("utf-8")
+
+    def read_record(self, path, verify=False):
+        """
+        Read and parse a file's record from a JSON based output.
+
+        Args:
+            path (str): The relative path of the file.
+            verify (bool): Check the bytes against the stored SHA-256.
+
+        Returns:
+            dict: The parsed file record.
+        """
+        if self.format == "markdown":
+            raise ValueError("Markdown sections are not JSON records; use read_text instead")
+        return json.loads(self.read(path, verify))
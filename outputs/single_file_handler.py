@@ -1,30 +1,50 @@
 import os
+import sys
+from itertools import chain, islice
 from os.path import expanduser
 
+from prompts.file_processor import create_outline
 from utils.language_mapping import EXTENSION_MAPPING
+from utils.memory_budget import SpillableList
+from utils.token_estimator import estimate_tokens, language_for_path
 
-from .events import Event
+from .events import EndEvent, FileProcessedEvent, OutlineCreatedEvent
+from .compression import open_output
 from .output_handler import OutputHandler
+from .sharding import plan_shards, shard_path, split_content, write_shard_index
+from .sidecar_index import CountingWriter, SidecarIndexBuilder
 
 
 class SingleFileOutputHandler(OutputHandler):
     """
     Output handler for writing content to a single file.
+    With a token budget, the content is written to numbered shards instead.
     """
 
-    def __init__(self, output_file):
+    STATE_ATTRIBUTES = ("sections",)
+
+    def __init__(self, output_file, max_tokens=None, sidecar_index=False):
         """
         Initialize the output handler.
 
         Args:
             output_file (str): The path to the output file.
+            max_tokens (int, optional): Token budget per shard. Defaults to None (one file).
+            sidecar_index (bool): Also write a byte-offset index of each file's section.
         """
         super().__init__()
         self.output_file = output_file
-        self.content = ""
-        self.on("OutlineCreatedEvent", self._handle_outline_created)
-        self.on("FileProcessedEvent", self._handle_file_processed)
-        self.on("EndEvent", self._handle_end_event)
+        self.max_tokens = max_tokens
+        self.sidecar_index = sidecar_index
+        # Sections in arrival order as (relative path or None for the outline, markdown, tokens)
+        self.sections = []
+        self.on(OutlineCreatedEvent, self._handle_outline_created)
+        self.on(FileProcessedEvent, self._handle_file_processed)
+        self.on(EndEvent, self._handle_end_event)
+
+    def use_memory_budget(self, budget):
+        super().use_memory_budget(budget)
+        self.sections = SpillableList(budget, measure=lambda section: sys.getsizeof(section[1]) + 64)
 
     def _create_markdown_content(self, file_data):
         """
@@ -41,6 +61,18 @@ class SingleFileOutputHandler(OutputHandler):
         file_content = file_data["content"]
         ext = file_data["ext"]
 
+        if file_data.get("part"):
+            rel_path = f"{rel_path} (part {file_data['part']} of {file_data['parts']})"
+
+        if file_data.get("duplicate_of"):
+            return (
+                "## file description\n\n"
+                f"filename: {filename}\n"
+                f"path: {rel_path}\n\n"
+                "## contenxt\n\n"
+                f"Identical to {file_data['duplicate_of']}"
+            )
+
         lang = EXTENSION_MAPPING.get(ext, "")
         code_block_start = f"```{lang}\n" if lang else "```\n"
 
@@ -55,10 +87,15 @@ class SingleFileOutputHandler(OutputHandler):
         )
         return markdown_content
 
+    def _add_section(self, rel_path, markdown, language=""):
+        tokens = estimate_tokens(markdown, language) if self.max_tokens else 0
+        self.sections.append((rel_path, markdown, tokens))
+
     def _handle_outline_created(self, event):
-        self.content += "# All Markdown Content\n\n"
-        self.content += "## Outline\n\n"
-        self.content += event.content + "\n\n"
+        outline = "# All Markdown Content\n\n"
+        outline += "## Outline\n\n"
+        outline += create_outline(event.entries) + "\n\n"
+        self._add_section(None, outline)
 
     def _handle_file_processed(self, event):
         file_data = {
@@ -66,9 +103,69 @@ class SingleFileOutputHandler(OutputHandler):
             "rel_path": event.relative_path,
             "content": event.content,
             "ext": os.path.splitext(event.filename)[1].lower(),  # Extract extension
+            "duplicate_of": event.duplicate_of,
         }
+        language = language_for_path(event.relative_path)
         markdown_content = self._create_markdown_content(file_data)
-        self.content += f"---\n" + markdown_content + "\n\n"
+
+        if self.max_tokens and estimate_tokens(markdown_content, language) > self.max_tokens:
+            # Only a file that alone exceeds the budget is split, on line boundaries
+            header_tokens = estimate_tokens(self._create_markdown_content(dict(file_data, content="")), language)
+            pieces = split_content(event.content, max(1, self.max_tokens - header_tokens), language)
+            for part, piece in enumerate(pieces, start=1):
+                piece_data = dict(file_data, content=piece.rstrip("\n"), part=part, parts=len(pieces))
+                self._add_section(event.relative_path, f"---\n" + self._create_markdown_content(piece_data) + "\n\n",
+                                  language)
+            return
+
+        self._add_section(event.relative_path, f"---\n" + markdown_content + "\n\n", language)
+
+    def _write_sections(self, path, sections):
+        """
+        Write sections to a file, indexing the byte range of each file's section if enabled.
+
+        Args:
+            path (str): The path of the file to write.
+            sections (list): Sections as (relative path or None, markdown, tokens).
+
+        Returns:
+            bool: True if the file was replaced, False if its content was unchanged.
+        """
+        index_builder = SidecarIndexBuilder() if self.sidecar_index else None
+        with open_output(expanduser(path)) as f:
+            writer = CountingWriter(f)
+            for rel_path, markdown, _ in sections:
+                offset = writer.offset
+                data = writer.write(markdown)
+                if index_builder and rel_path is not None:
+                    index_builder.add(rel_path, offset, data)
+        if index_builder:
+            index_builder.write(path, "markdown")
+        return f.changed
+
+    def _write_shards(self):
+        """
+        Write sections to shards under the token budget, outline first, plus the shard index.
+
+        Returns:
+            str: The path of the shard index.
+        """
+        # Sections are read in order, one shard at a time, so spilled sections are not all loaded at once
+        outline_sections = [s for s in self.sections if s[0] is None]
+        token_counts = [s[2] for s in outline_sections] + [s[2] for s in self.sections if s[0] is not None]
+        sections = chain(outline_sections, (s for s in self.sections if s[0] is not None))
+        shards = []
+        for part, indexes in enumerate(plan_shards(token_counts, self.max_tokens), start=1):
+            path = shard_path(self.output_file, part)
+            shard_sections = list(islice(sections, len(indexes)))
+            changed = self._write_sections(path, shard_sections)
+            files = []
+            for rel_path, _, _ in shard_sections:
+                if rel_path is not None and rel_path not in files:
+                    files.append(rel_path)
+            shards.append({"path": path, "tokens": sum(s[2] for s in shard_sections), "files": files})
+            self.report_output("Markdown shard", path, changed)
+        return write_shard_index(self.output_file, self.max_tokens, shards)
 
     def _handle_end_event(self, event):
         """
@@ -77,16 +174,12 @@ class SingleFileOutputHandler(OutputHandler):
         Args:
             event: The EndEvent containing the completion message
         """
-        with open(expanduser(self.output_file), "w", encoding="utf-8") as f:
-            f.write(self.content)
-        print(f"Markdown output written to {self.output_file}")
+        if self.max_tokens:
+            index_file = self._write_shards()
+            self.report_output("Markdown shard index", index_file)
+            self.copy_to_clipboard(os.path.abspath(expanduser(index_file)))
+            return
+
+        changed = self._write_sections(self.output_file, self.sections)
+        self.report_output("Markdown output", self.output_file, changed)
         self.copy_to_clipboard(os.path.abspath(expanduser(self.output_file)))
-
-    def fire_event(self, event: Event):
-        """
-        Fire an event to notify listeners.
-        """
-        event_name = type(event).__name__
-        if event_name in self._event_handlers:
-            for handler in self._event_handlers[event_name]:
-                handler(event)
@@ -0,0 +1,239 @@
+import os
+import sqlite3
+import tempfile
+from os.path import expanduser
+
+from outputs.events import EndEvent, FileProcessedEvent, OutlineCreatedEvent, StartEvent
+from utils.language_mapping import EXTENSION_MAPPING
+
+from .atomic_writer import _current_umask
+from .output_handler import OutputHandler
+
+SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL,
+    relative_path TEXT NOT NULL,
+    extension TEXT NOT NULL,
+    language TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    line_count INTEGER NOT NULL,
+    duplicate_of TEXT,
+    content TEXT NOT NULL
+);
+CREATE INDEX files_relative_path ON files (relative_path);
+CREATE INDEX files_language ON files (language);
+CREATE TABLE outline (
+    seq INTEGER PRIMARY KEY,
+    markdown_filename TEXT NOT NULL,
+    original_filename TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    duplicate_of TEXT,
+    generated TEXT,
+    generated_action TEXT,
+    deleted INTEGER NOT NULL
+);
+"""
+
+# Line-level full text index, with a plain table fallback when SQLite lacks FTS5
+FTS_LINES_SCHEMA = """
+CREATE VIRTUAL TABLE lines USING fts5(
+    content,
+    file_id UNINDEXED,
+    line_number UNINDEXED,
+    tokenize = 'unicode61'
+);
+"""
+
+PLAIN_LINES_SCHEMA = """
+CREATE TABLE lines (
+    file_id INTEGER NOT NULL,
+    line_number INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (file_id, line_number)
+) WITHOUT ROWID;
+"""
+
+
+def has_fts5(connection):
+    """
+    Check whether the SQLite library supports FTS5.
+
+    Args:
+        connection (sqlite3.Connection): An open connection.
+
+    Returns:
+        bool: True if FTS5 virtual tables can be created.
+    """
+    try:
+        connection.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(content)")
+        connection.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+class SQLiteOutputHandler(OutputHandler):
+    """
+    Output handler for writing the snapshot into a SQLite database.
+    Files, outline and a per-line full text index are written with batched
+    inserts inside a single transaction.
+    """
+
+    def __init__(self, output_file, batch_size=1000):
+        """
+        Initialize the output handler.
+
+        Args:
+            output_file (str): The path to the database file. An existing file is replaced.
+            batch_size (int): Number of files buffered before they are inserted.
+        """
+        super().__init__()
+        self.output_file = output_file
+        self.batch_size = batch_size
+        self.connection = None
+        self.temp_path = None
+        self.fts5 = False
+        self.file_count = 0
+        self._pending_files = []
+        self._pending_lines = []
+        self.on(StartEvent, self._handle_start_event)
+        self.on(OutlineCreatedEvent, self._handle_outline_created)
+        self.on(FileProcessedEvent, self._handle_file_processed)
+        self.on(EndEvent, self._handle_end_event)
+
+    def _handle_start_event(self, event):
+        # The snapshot is built next to the output and moved into place once committed.
+        # A unique temporary name keeps concurrent runs writing the same output apart.
+        path = expanduser(self.output_file)
+        fd, self.temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp",
+                                              dir=os.path.dirname(os.path.abspath(path)))
+        os.close(fd)
+        # isolation_level=None leaves transaction control to the explicit BEGIN/COMMIT
+        self.connection = sqlite3.connect(self.temp_path, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode = OFF")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.fts5 = has_fts5(self.connection)
+        # executescript commits on its own, so the schema is created before the transaction starts
+        self.connection.executescript(SCHEMA + (FTS_LINES_SCHEMA if self.fts5 else PLAIN_LINES_SCHEMA))
+        self.connection.execute("BEGIN")
+
+    def _handle_outline_created(self, event):
+        self.connection.executemany(
+            "INSERT INTO outline VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (entry.seq, entry.md_filename, entry.original, entry.rel_path, entry.size, entry.hash,
+                 entry.tokens, entry.duplicate_of, entry.generated, entry.generated_action, entry.deleted)
+                for entry in event.entries
+            ],
+        )
+
+    def _handle_file_processed(self, event):
+        self.file_count += 1
+        file_id = self.file_count
+        extension = os.path.splitext(event.relative_path)[1].lower()
+        lines = event.content.splitlines()
+        self._pending_files.append((
+            file_id,
+            event.filename,
+            event.relative_path,
+            extension,
+            EXTENSION_MAPPING.get(extension, ""),
+            len(event.content.encode("utf-8")),
+            len(lines),
+            event.duplicate_of,
+            event.content,
+        ))
+        self._pending_lines.extend((line, file_id, number) for number, line in enumerate(lines, start=1))
+        if len(self._pending_files) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        """
+        Insert the buffered files and lines.
+        """
+        self.connection.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self._pending_files)
+        self.connection.executemany("INSERT INTO lines (content, file_id, line_number) VALUES (?, ?, ?)",
+                                    self._pending_lines)
+        self._pending_files = []
+        self._pending_lines = []
+
+    def _handle_end_event(self, event):
+        """
+        Handle the EndEvent by committing the snapshot transaction and replacing the output.
+
+        Args:
+            event: The EndEvent containing the completion message
+        """
+        if self.connection is None:
+            return
+        self._flush()
+        if self.fts5:
+            self.connection.execute("INSERT INTO lines (lines) VALUES ('optimize')")
+        self.connection.execute("COMMIT")
+        self.connection.close()
+        self.connection = None
+        # mkstemp creates private files; give the database the usual permissions
+        os.chmod(self.temp_path, 0o666 & ~_current_umask())
+        os.replace(self.temp_path, expanduser(self.output_file))
+        self.report_output("SQLite output", self.output_file)
+        self.copy_to_clipboard(os.path.abspath(expanduser(self.output_file)))
+
+
+def query_snapshot(database_file, text=None, path=None, language=None, limit=50):
+    """
+    Query a snapshot database written by SQLiteOutputHandler.
+
+    Args:
+        database_file (str): The path to the database file.
+        text (str, optional): Full text query matched against file lines.
+        path (str, optional): Glob pattern matched against relative paths.
+        language (str, optional): Language hint to filter by.
+        limit (int): Maximum number of results.
+
+    Returns:
+        list: (relative_path, line_number, line) tuples when text is given,
+              otherwise (relative_path, None, language) tuples for matching files.
+    """
+    connection = sqlite3.connect(f"file:{expanduser(database_file)}?mode=ro", uri=True)
+    try:
+        conditions = []
+        params = []
+        if path:
+            conditions.append("files.relative_path GLOB ?")
+            params.append(path)
+        if language:
+            conditions.append("files.language = ?")
+            params.append(language)
+
+        if not text:
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            rows = connection.execute(
+                f"SELECT relative_path, NULL, language FROM files {where} ORDER BY id LIMIT ?",
+                params + [limit],
+            )
+            return rows.fetchall()
+
+        fts5 = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'lines' AND sql LIKE 'CREATE VIRTUAL TABLE%'"
+        ).fetchone()
+        if fts5:
+            conditions.insert(0, "lines MATCH ?")
+            # Quote the text so it is matched as a phrase instead of FTS5 query syntax
+            params.insert(0, '"' + text.replace('"', '""') + '"')
+        else:
+            conditions.insert(0, "lines.content LIKE ?")
+            params.insert(0, f"%{text}%")
+        rows = connection.execute(
+            "SELECT files.relative_path, lines.line_number, lines.content "
+            "FROM lines JOIN files ON files.id = lines.file_id "
+            f"WHERE {' AND '.join(conditions)} "
+            "ORDER BY lines.file_id, lines.line_number LIMIT ?",
+            params + [limit],
+        )
+        return rows.fetchall()
+    finally:
+        connection.close()
@@ -1,31 +1,100 @@
-import json
 import os
 from os.path import expanduser
 
-from outputs.events import Event
+from outputs.events import EndEvent, FileProcessedEvent
+from prompts.options import JSONFormat
 from utils.language_mapping import EXTENSION_MAPPING
+from utils.memory_budget import SpillableList
 
+from .compression import open_output
+from .json_writer import write_document
+from .serializers import JSONSerializer
 from .output_handler import OutputHandler
+from .sidecar_index import CountingWriter, SidecarIndexBuilder
+
+DIRECTORY_COLUMNS = ["id", "name", "parent_id"]
+FILE_COLUMNS = ["id", "name", "directory_id", "extension", "language", "duplicate_of"]
+
+
+def path_table_to_tree(document):
+    """
+    Rebuild the nested tree view from a path table document.
+
+    Args:
+        document (dict): A document written with JSONFormat.PATH_TABLE.
+
+    Returns:
+        dict: The root directory node, laid out like the JSONFormat.TREE output.
+    """
+    directories = {}
+    for row in document["directories"]["rows"]:
+        directory = dict(zip(document["directories"]["columns"], row))
+        node = {"name": directory["name"], "type": "directory", "children": []}
+        directories[directory["id"]] = node
+        # Parents always precede their subdirectories in the table
+        if directory["parent_id"] is not None:
+            directories[directory["parent_id"]]["children"].append(node)
+
+    contents = document["contents"]
+    for row in document["files"]["rows"]:
+        file = dict(zip(document["files"]["columns"], row))
+        node = {
+            "name": file["name"],
+            "type": "file",
+            "extension": file["extension"],
+            "language": file["language"],
+            "content": contents[file["id"]],
+        }
+        if file["duplicate_of"] is not None:
+            node["duplicate_of"] = file["duplicate_of"]
+        directories[file["directory_id"]]["children"].append(node)
+
+    # Directories first, then files, each sorted by name
+    for node in directories.values():
+        node["children"].sort(key=lambda child: (child["type"] != "directory", child["name"]))
+    return directories[0]
 
 
 class TreeJSONOutputHandler(OutputHandler):
     """
     Output handler for writing content in a tree-structured JSON format.
-    The output mimics a filesystem tree with nested directories and files.
+    Supports two formats:
+    - tree: Nested directory and file nodes mimicking a filesystem tree
+    - path_table: A directory table (id, name, parent_id), a file table referencing
+      directory ids and a separate contents array, built in one pass
     """
 
-    def __init__(self, output_file):
+    STATE_ATTRIBUTES = ("file_tree", "directory_ids", "directory_rows", "file_rows", "file_paths", "contents")
+
+    def __init__(self, output_file, sidecar_index=False, compact=False, json_format=JSONFormat.TREE):
         """
         Initialize the output handler.
 
         Args:
             output_file (str): The path to the output file.
+            sidecar_index (bool): Also write a byte-offset index of each file node.
+            compact (bool): Write JSON without indentation.
+            json_format (JSONFormat): TREE for nested nodes, PATH_TABLE for flat tables.
         """
         super().__init__()
         self.output_file = output_file
+        self.sidecar_index = sidecar_index
+        self.serializer = JSONSerializer(pretty=not compact)
+        self.json_format = json_format
         self.file_tree = {"name": "root", "type": "directory", "children": {}}
-        self.on("FileProcessedEvent", self._handle_file_processed)
-        self.on("EndEvent", self._handle_end_event)
+        # Path table state: directory path -> id, plus the table rows
+        self.directory_ids = {"": 0}
+        self.directory_rows = [[0, "root", None]]
+        self.file_rows = []
+        self.file_paths = []
+        self.contents = []
+        self.on(FileProcessedEvent, self._handle_file_processed)
+        self.on(EndEvent, self._handle_end_event)
+
+    def use_memory_budget(self, budget):
+        super().use_memory_budget(budget)
+        # File contents are kept apart from the tree and referenced by index
+        self.contents = SpillableList(budget)
 
     def _handle_file_processed(self, event):
         """
@@ -39,6 +108,10 @@ class TreeJSONOutputHandler(OutputHandler):
         filename = parts[-1]
         dirs = parts[:-1]
 
+        if self.json_format == JSONFormat.PATH_TABLE:
+            self._add_to_path_table(event, dirs, filename)
+            return
+
         # Navigate the tree structure and create directories as needed
         current = self.file_tree
         for dir_name in dirs:
@@ -56,14 +129,93 @@ class TreeJSONOutputHandler(OutputHandler):
 
         # Split content into lines
         content_lines = event.content.splitlines()
+        if self.memory_budget is not None:
+            self.contents.append(content_lines)
+            content_lines = len(self.contents) - 1
 
-        current["children"][filename] = {
+        file_node = {
             "name": filename,
             "type": "file",
             "extension": extension,
             "language": language,
             "content": content_lines
         }
+        if event.duplicate_of:
+            file_node["duplicate_of"] = event.duplicate_of
+        current["children"][filename] = file_node
+
+    def _directory_id(self, dirs):
+        """
+        Look up or intern the directory holding a file, creating missing parents.
+
+        Args:
+            dirs (list): The directory names from the root down.
+
+        Returns:
+            int: The id of the innermost directory.
+        """
+        directory_id = self.directory_ids.get("/".join(dirs))
+        if directory_id is not None:
+            return directory_id
+
+        parent_id = 0
+        path = ""
+        for dir_name in dirs:
+            path = f"{path}/{dir_name}" if path else dir_name
+            directory_id = self.directory_ids.get(path)
+            if directory_id is None:
+                directory_id = len(self.directory_rows)
+                self.directory_rows.append([directory_id, dir_name, parent_id])
+                self.directory_ids[path] = directory_id
+            parent_id = directory_id
+        return parent_id
+
+    def _add_to_path_table(self, event, dirs, filename):
+        """
+        Add a processed file to the path tables.
+
+        Args:
+            event: The FileProcessedEvent containing the processed file information
+            dirs (list): The directory names from the root down.
+            filename (str): The file name.
+        """
+        extension = os.path.splitext(filename)[1].lower()
+        file_id = len(self.file_rows)
+        self.file_rows.append([
+            file_id,
+            filename,
+            self._directory_id(dirs),
+            extension,
+            EXTENSION_MAPPING.get(extension, ""),
+            event.duplicate_of,
+        ])
+        self.file_paths.append(event.relative_path)
+        self.contents.append(event.content.splitlines())
+
+    def _write_path_table(self):
+        """
+        Write the path table document, recording the byte range of each file's contents.
+
+        Returns:
+            bool: True if the file was replaced, False if its content was unchanged.
+        """
+        document = {
+            "format": JSONFormat.PATH_TABLE.value,
+            "directories": {"columns": DIRECTORY_COLUMNS, "rows": self.directory_rows},
+            "files": {"columns": FILE_COLUMNS, "rows": self.file_rows},
+            "contents": self.contents,
+        }
+        index_builder = SidecarIndexBuilder() if self.sidecar_index else None
+
+        def index_contents(i, content, offset, data):
+            index_builder.add(self.file_paths[i], offset, data)
+
+        with open_output(expanduser(self.output_file)) as f:
+            write_document(CountingWriter(f), document, "contents", index_contents if index_builder else None,
+                           self.serializer)
+        if index_builder:
+            index_builder.write(self.output_file, JSONFormat.PATH_TABLE.value)
+        return f.changed
 
     def _convert_children_to_list(self, node):
         """
@@ -91,6 +243,48 @@ class TreeJSONOutputHandler(OutputHandler):
             # Replace dictionary with sorted list
             node["children"] = dirs + files
 
+    def _write_node(self, writer, node, level, path, index_builder):
+        """
+        Write a tree node like serializing the whole tree at once, recording the byte range of file nodes.
+
+        Args:
+            writer (CountingWriter): The output writer.
+            node (dict): The node to write, with children already converted to lists.
+            level (int): Nesting depth of the node.
+            path (str): Relative path of the node.
+            index_builder (SidecarIndexBuilder): Index builder, or None.
+        """
+        if node["type"] == "file":
+            if self.memory_budget is not None:
+                node = dict(node, content=self.contents[node["content"]])
+            offset = writer.offset
+            data = writer.write(self.serializer.dumps(node, level))
+            if index_builder:
+                index_builder.add(path, offset, data)
+            return
+
+        serializer = self.serializer
+        key_indent = serializer.line_break(level + 1)
+        writer.write("{")
+        for key, value in node.items():
+            if key != "children":
+                writer.write(key_indent)
+                writer.write(serializer.dumps(key))
+                writer.write(serializer.key_separator)
+                writer.write(serializer.dumps(value, level + 1))
+                writer.write(",")
+        writer.write(key_indent + '"children"' + serializer.key_separator)
+        if not node["children"]:
+            writer.write("[]")
+        else:
+            child_indent = serializer.line_break(level + 2)
+            for i, child in enumerate(node["children"]):
+                writer.write(("[" if i == 0 else ",") + child_indent)
+                child_path = os.path.join(path, child["name"]) if path else child["name"]
+                self._write_node(writer, child, level + 2, child_path, index_builder)
+            writer.write(key_indent + "]")
+        writer.write(serializer.line_break(level) + "}")
+
     def _handle_end_event(self, event):
         """
         Handle the EndEvent by writing the tree structure to a JSON file.
@@ -98,20 +292,20 @@ class TreeJSONOutputHandler(OutputHandler):
         Args:
             event: The EndEvent containing the completion message
         """
+        if self.json_format == JSONFormat.PATH_TABLE:
+            changed = self._write_path_table()
+            self.report_output("Path table JSON output", self.output_file, changed)
+            self.copy_to_clipboard(os.path.abspath(expanduser(self.output_file)))
+            return
+
         # Convert children dictionaries to sorted lists
         self._convert_children_to_list(self.file_tree)
 
         # Write tree structure to file
-        with open(expanduser(self.output_file), "w", encoding="utf-8") as f:
-            json.dump(self.file_tree, f, indent=2, ensure_ascii=False)
-        print(f"Tree JSON output written to {self.output_file}")
+        index_builder = SidecarIndexBuilder() if self.sidecar_index else None
+        with open_output(expanduser(self.output_file)) as f:
+            self._write_node(CountingWriter(f), self.file_tree, 0, "", index_builder)
+        if index_builder:
+            index_builder.write(self.output_file, "tree")
+        self.report_output("Tree JSON output", self.output_file, f.changed)
         self.copy_to_clipboard(os.path.abspath(expanduser(self.output_file)))
-
-    def fire_event(self, event: Event):
-        """
-        Fire an event to notify listeners.
-        """
-        event_name = type(event).__name__
-        if event_name in self._event_handlers:
-            for handler in self._event_handlers[event_name]:
-                handler(event)
@@ -6,6 +6,7 @@ Contains modules for generating markdown files from project files.
 
 from .file_processor import create_outline, process_file
 from .generator import generate
+from .snapshot import FileRecord, Snapshot, snapshot
 from .sensitive_masker import (DEFAULT_SENSITIVE_PATTERNS, SensitiveMasker,
                                mask_sensitive_data)
 
@@ -16,4 +17,7 @@ __all__ = [
     'process_file',
     'create_outline',
     'generate',
+    'snapshot',
+    'Snapshot',
+    'FileRecord',
 ]
@@ -0,0 +1,323 @@
+"""
+Batch module for snapshotting many project roots in one run.
+
+Roots are given explicitly or discovered from the git submodules and linked
+worktrees of a repository. Each root is walked and generated in a process
+pool whose workers create the sensitive data masker and a content cache
+once and reuse them for every root they handle: the compiled patterns stay
+in the re module cache, and files whose content was already processed for
+an earlier root (common across worktrees) are not masked again. The cache
+is per worker; sharing it between processes would cost more than it saves.
+Roots are written to their own outputs, or spooled to temporary files and
+streamed into one combined output in which every path is prefixed with its
+root's label, so the outline lists each root as a contiguous section.
+Worker summaries are returned with each result and logged by the parent.
+"""
+
+import dataclasses
+import logging
+import os
+import pickle
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from outputs.events import (EndEvent, FileBatchProcessedEvent, FileProcessedEvent, OutlineCreatedEvent,
+                            OutlineEntry, StartEvent)
+from outputs.output_handler import OutputHandler
+from prompts.generator import create_output_handler, generate, output_path
+from prompts.options import Options
+from prompts.snapshot import ContentCache
+from utils.file_walker import FileWalker
+from utils.ignore_handler import build_ignores
+from utils.memory_budget import format_size
+from utils.reporting import LOGGER_NAME, get_logger
+
+log = get_logger(__name__)
+
+_SUBMODULE_PATH = re.compile(r"^\s*path\s*=\s*(.+?)\s*$", re.MULTILINE)
+
+# Masker and content cache shared by every root a worker process handles, created by _init_worker
+_worker_masker = None
+_worker_content_cache = None
+
+
+def discover_roots(project_root):
+    """
+    Find the git submodules and linked worktrees of a repository.
+
+    Submodules are read from .gitmodules and worktrees from .git/worktrees, so no git process is started.
+    Roots that are not checked out are left out.
+
+    Args:
+        project_root (str): The repository root.
+
+    Returns:
+        list: Absolute paths of the submodule and worktree roots.
+    """
+    roots = []
+    try:
+        with open(os.path.join(project_root, ".gitmodules"), "r", encoding="utf-8") as f:
+            for path in _SUBMODULE_PATH.findall(f.read()):
+                roots.append(os.path.join(project_root, path))
+    except OSError:
+        pass
+
+    worktrees_dir = os.path.join(project_root, ".git", "worktrees")
+    if os.path.isdir(worktrees_dir):
+        for name in sorted(os.listdir(worktrees_dir)):
+            try:
+                # gitdir holds the path of the .git file inside the worktree
+                with open(os.path.join(worktrees_dir, name, "gitdir"), "r", encoding="utf-8") as f:
+                    roots.append(os.path.dirname(f.read().strip()))
+            except OSError:
+                continue
+
+    return [os.path.abspath(root) for root in roots if os.path.isdir(root)]
+
+
+def root_labels(roots, base_dir):
+    """
+    Name each root by its path relative to base_dir, or by its directory name outside base_dir.
+
+    Args:
+        roots (list): Absolute root paths.
+        base_dir (str): The directory the run was started from.
+
+    Returns:
+        list: Unique labels without path separators, in the order of roots.
+    """
+    labels = []
+    for root in roots:
+        label = os.path.relpath(root, base_dir)
+        if label == os.curdir or label.startswith(os.pardir):
+            label = os.path.basename(root)
+        label = label.replace(os.path.sep, "_")
+        unique, suffix = label, 2
+        while unique in labels:
+            unique, suffix = f"{label}-{suffix}", suffix + 1
+        labels.append(unique)
+    return labels
+
+
+def _labeled_path(path, label):
+    """
+    Relative output paths land inside each root; absolute ones get the root label before their suffix.
+    """
+    if not os.path.isabs(path):
+        return path
+    directory, name = os.path.split(path)
+    stem, dot, rest = name.partition(".")
+    return os.path.join(directory, f"{stem}.{label}{dot}{rest}")
+
+
+def root_options(options: Options, label):
+    """
+    Options for writing one root of a batch to its own output.
+    """
+    return dataclasses.replace(
+        options,
+        output_file=_labeled_path(options.output_file, label),
+        json_output_file=_labeled_path(options.json_output_file, label),
+        tree_json_output_file=_labeled_path(options.tree_json_output_file, label),
+        sqlite_output_file=_labeled_path(options.sqlite_output_file, label),
+        ndjson_output_file=_labeled_path(options.ndjson_output_file, label),
+    )
+
+
+class SpoolingOutputHandler(OutputHandler):
+    """
+    Output handler that pickles the processed files into a temporary file for a combined batch output,
+    so the parent process can stream them instead of receiving every root's content at once.
+    """
+
+    def __init__(self):
+        super().__init__()
+        fd, self.spool_file = tempfile.mkstemp(prefix="ppg-batch-", suffix=".pickle")
+        self.file = os.fdopen(fd, "wb")
+        self.on(FileBatchProcessedEvent, self._handle_file_batch)
+        self.on(EndEvent, lambda event: self.file.close())
+
+    def _handle_file_batch(self, event):
+        for file_event in event.events:
+            pickle.dump(file_event, self.file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _read_spool(spool_file):
+    """
+    Yield the FileProcessedEvent objects of a spool file in order.
+    """
+    with open(spool_file, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+@dataclass
+class RootResult:
+    """
+    Outcome of snapshotting one root.
+    """
+
+    root: str
+    label: str
+    files: int
+    bytes: int
+    seconds: float
+    # Summary lines of the root's run, logged by the parent
+    summary: List[str] = field(default_factory=list)
+    # Temporary file with the processed files and the outline entries, for a combined output only
+    spool_file: Optional[str] = None
+    entries: List[OutlineEntry] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _init_worker(no_mask, entropy_threshold):
+    global _worker_masker, _worker_content_cache
+    from . import DEFAULT_SENSITIVE_PATTERNS, SensitiveMasker
+
+    # Per-file messages and progress of parallel roots would interleave, so workers only report warnings
+    logging.getLogger(LOGGER_NAME).setLevel(logging.WARNING)
+    _worker_masker = None if no_mask else SensitiveMasker(DEFAULT_SENSITIVE_PATTERNS.copy(), entropy_threshold)
+    _worker_content_cache = ContentCache()
+
+
+def snapshot_root(root, label, options: Options, combined):
+    """
+    Walk and generate one root inside a worker process.
+
+    Args:
+        root (str): The absolute root path.
+        label (str): The root's label, see root_labels.
+        options (Options): The generation options.
+        combined (bool): Collect the processed files instead of writing the root's own output.
+
+    Returns:
+        RootResult: The root's statistics and summary, with its spool file and outline for a combined output.
+    """
+    started = time.perf_counter()
+    result = RootResult(root=root, label=label, files=0, bytes=0, seconds=0.0)
+    entries = []
+    output_handler = None
+    try:
+        os.chdir(root)
+        if combined:
+            output_handler = SpoolingOutputHandler()
+        else:
+            output_handler = create_output_handler(root_options(options, label))
+        output_handler.on(OutlineCreatedEvent, lambda event: entries.extend(event.entries))
+        files_to_process = FileWalker(root, build_ignores(root)).get_files()
+        result.summary = generate(files_to_process, options, output_handler, masker=_worker_masker,
+                                  content_cache=_worker_content_cache)
+        if combined:
+            result.spool_file = output_handler.spool_file
+            result.entries = entries
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+        if isinstance(output_handler, SpoolingOutputHandler):
+            output_handler.file.close()
+            os.remove(output_handler.spool_file)
+    result.files = len(entries)
+    result.bytes = sum(entry.size for entry in entries)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def _write_combined(results, output_handler, batch_size):
+    """
+    Stream the spooled events of all roots into one output handler, prefixing paths with the root label.
+    Spool files are removed once written.
+    """
+    output_handler.fire_event(StartEvent(message="Processing started"))
+    try:
+        outline_entries = []
+        for result in results:
+            events = []
+            spooled = _read_spool(result.spool_file)
+            event = next(spooled, None)
+            for entry in result.entries:
+                seq = len(outline_entries) + 1
+                rel_path = os.path.join(result.label, entry.rel_path)
+                md_filename = f"{str(seq).zfill(3)}_{rel_path.replace(os.path.sep, '_')}.md"
+                duplicate_of = os.path.join(result.label, entry.duplicate_of) if entry.duplicate_of else None
+                outline_entries.append(dataclasses.replace(entry, seq=seq, md_filename=md_filename,
+                                                           rel_path=rel_path, duplicate_of=duplicate_of))
+                # Events follow the outline order; skipped generated files are listed without a file record
+                if event is None or event.relative_path != entry.rel_path:
+                    continue
+                events.append(FileProcessedEvent(filename=md_filename, relative_path=rel_path,
+                                                 content=event.content, duplicate_of=duplicate_of))
+                event = next(spooled, None)
+                if len(events) >= batch_size:
+                    output_handler.fire_event(FileBatchProcessedEvent(events=events))
+                    events = []
+            spooled.close()
+            if events:
+                output_handler.fire_event(FileBatchProcessedEvent(events=events))
+            os.remove(result.spool_file)
+            result.spool_file = None
+        output_handler.fire_event(OutlineCreatedEvent(entries=outline_entries))
+    finally:
+        for result in results:
+            if result.spool_file:
+                os.remove(result.spool_file)
+        output_handler.fire_event(EndEvent(message="Processing completed"))
+
+
+def run_batch(roots, options: Options, jobs=None, combined=False):
+    """
+    Snapshot several roots in a process pool and log a throughput summary.
+
+    Args:
+        roots (list): The root directories.
+        options (Options): The generation options, shared by every root.
+        jobs (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        combined (bool): Write one output with every root instead of one output per root.
+
+    Returns:
+        list: The RootResult of every root, in the order of roots.
+    """
+    started = time.perf_counter()
+    roots = [os.path.abspath(root) for root in roots]
+    labels = root_labels(roots, os.getcwd())
+    if not options.no_mask:
+        log.info("Sensitive data masking is enabled (use --no-mask to disable)")
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(options.no_mask, options.entropy_threshold)) as pool:
+        futures = [pool.submit(snapshot_root, root, label, options, combined) for root, label in zip(roots, labels)]
+        results = []
+        for future in futures:
+            result = future.result()
+            results.append(result)
+            if result.error:
+                log.error("%s failed: %s", result.label, result.error)
+            else:
+                log.info("Processed %s: %s files, %s in %.2fs", result.label, result.files, format_size(result.bytes),
+                         result.seconds)
+                if not combined:
+                    # Relative output paths are resolved inside the root, see _labeled_path
+                    log.info("%s: Output written to %s", result.label,
+                             os.path.join(result.root, output_path(root_options(options, result.label))))
+                for line in result.summary:
+                    log.info("%s: %s", result.label, line)
+
+    if combined:
+        log.info("Outputting to: %s", os.path.abspath(output_path(options)))
+        _write_combined([result for result in results if not result.error], create_output_handler(options),
+                        options.batch_size)
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    total_files = sum(result.files for result in results)
+    total_bytes = sum(result.bytes for result in results)
+    fields = {"event": "batch_done", "files": total_files, "bytes": total_bytes, "roots": len(results),
+              "elapsed_s": round(elapsed, 3)}
+    log.info("Processed %s files (%s) from %s roots in %.2fs: %.0f files/s, %s/s", total_files,
+             format_size(total_bytes), len(results), elapsed, total_files / elapsed,
+             format_size(int(total_bytes / elapsed)), extra={"fields": fields})
+    return results
@@ -0,0 +1,144 @@
+"""
+Checkpoint module for resuming interrupted runs.
+
+With --resume, generate periodically saves the position in the file list,
+the outline and deduplication state, and the output handler's partial state
+to ~/.ppg/checkpoints. A later --resume run with the same files and options
+restores that state and continues after the last saved file, so the output
+is identical to an uninterrupted run. The checkpoint is removed once a run
+completes.
+"""
+
+import hashlib
+import os
+import pickle
+
+from outputs.atomic_writer import AtomicFileWriter
+from utils.reporting import get_logger
+
+log = get_logger(__name__)
+
+CHECKPOINT_DIR = os.path.expanduser("~/.ppg/checkpoints")
+
+# Bump when the checkpoint layout changes
+_CHECKPOINT_VERSION = 3
+
+
+def checkpoint_path(project_root, options, checkpoint_dir=None):
+    """
+    Build the checkpoint path for a project and output format.
+
+    Args:
+        project_root (str): The project root directory.
+        options (Options): The generation options.
+        checkpoint_dir (str, optional): Directory holding checkpoints. Defaults to CHECKPOINT_DIR.
+
+    Returns:
+        str: The checkpoint file path.
+    """
+    key = f"{os.path.abspath(project_root)}\0{options.output_format.value}"
+    name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(checkpoint_dir or CHECKPOINT_DIR, f"{name}.pickle")
+
+
+def run_fingerprint(files_to_process, options, deleted=()):
+    """
+    Fingerprint the inputs that decide the output, so a checkpoint is only resumed by the same run.
+
+    Besides the options and paths this covers the content identity of each file:
+    the commit and blob id for entries read from a git revision, and the size and
+    modification time for working tree files.
+
+    Args:
+        files_to_process (list): The FileEntry objects in processing order.
+        options (Options): The generation options.
+        deleted (list, optional): Relative paths of deleted files listed in the outline.
+
+    Returns:
+        str: A SHA-256 hex digest.
+    """
+    hasher = hashlib.sha256()
+    for value in (options.output_format.value, options.json_format.value, options.no_mask, options.dedup,
+                  options.max_tokens, options.skeleton_threshold, options.compact_json, options.generated.value,
+                  options.generated_allow, options.notebook_outputs, options.compaction,
+                  options.entropy_threshold):
+        hasher.update(repr(value).encode("utf-8") + b"\0")
+    for file_entry in files_to_process:
+        hasher.update(file_entry.relative_path.encode("utf-8") + b"\0")
+        hasher.update(_file_identity(file_entry).encode("utf-8") + b"\0")
+    for path in deleted:
+        hasher.update(b"deleted\0" + path.encode("utf-8") + b"\0")
+    return hasher.hexdigest()
+
+
+def _file_identity(file_entry):
+    """
+    Describe the version of a file's content without reading it.
+
+    Args:
+        file_entry (FileEntry): The file entry.
+
+    Returns:
+        str: The commit and blob id of a git entry, otherwise the size and mtime, or "" if the file cannot be stat'ed.
+    """
+    object_id = getattr(file_entry, "object_id", None)
+    if object_id:
+        return f"{getattr(file_entry, 'commit', '')}:{object_id}"
+    try:
+        stat = os.stat(file_entry.full_path)
+    except OSError:
+        return ""
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class Checkpoint:
+    """
+    Saves and loads the state of a resumable run.
+    """
+
+    def __init__(self, path, fingerprint):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            path (str): The checkpoint file path.
+            fingerprint (str): Fingerprint of the current run, see run_fingerprint.
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+
+    def load(self):
+        """
+        Load the saved state of the same run.
+
+        Returns:
+            dict: The saved state, or None if there is no usable checkpoint.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                checkpoint = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if checkpoint.get("version") != _CHECKPOINT_VERSION or checkpoint.get("fingerprint") != self.fingerprint:
+            log.info("Ignoring checkpoint from a run with different files or options")
+            return None
+        return checkpoint["state"]
+
+    def save(self, state):
+        """
+        Save the state, replacing the previous checkpoint atomically.
+
+        Args:
+            state (dict): The generator and handler state.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        checkpoint = {"version": _CHECKPOINT_VERSION, "fingerprint": self.fingerprint, "state": state}
+        with AtomicFileWriter(self.path) as f:
+            pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def remove(self):
+        """
+        Remove the checkpoint after a completed run.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
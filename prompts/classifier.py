@@ -0,0 +1,124 @@
+"""
+Classifier module for recognizing generated, minified and lockfile content.
+
+The classifier runs between the file walker and process_file, so files it
+recognizes never reach the masker or the serializers. It only looks at the
+file name, the first kilobyte for generated-code markers in comments and,
+for JavaScript and CSS only, the average line length, which keeps it cheap
+compared to masking.
+"""
+
+import os
+import re
+
+import pathspec
+
+# Dependency lockfiles, matched by file name
+LOCKFILE_NAMES = {
+    "package-lock.json",
+    "npm-shrinkwrap.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "bun.lock",
+    "poetry.lock",
+    "Pipfile.lock",
+    "uv.lock",
+    "pdm.lock",
+    "Cargo.lock",
+    "Gemfile.lock",
+    "composer.lock",
+    "go.sum",
+    "mix.lock",
+    "pubspec.lock",
+    "Podfile.lock",
+    "packages.lock.json",
+}
+
+SOURCE_MAP_SUFFIXES = (".js.map", ".css.map", ".mjs.map", ".cjs.map")
+
+MINIFIED_SUFFIXES = (".min.js", ".min.mjs", ".min.css")
+
+# Protocol buffer and gRPC code generators
+GENERATED_SUFFIXES = ("_pb2.py", "_pb2.pyi", "_pb2_grpc.py", ".pb.go", ".pb.cc", ".pb.h", "_pb.js", "_pb.d.ts",
+                      "_grpc_pb.js", ".pb.swift")
+
+# Number of characters searched for generated-code markers
+HEAD_SIZE = 1024
+
+GENERATED_MARKER = "@" + "generated"
+# The marker counts on a comment line only, so code and data that merely mention it are kept
+GENERATED_MARKER_PATTERN = re.compile(r"^\s*(?:#|//|/\*|\*|--|<!--|;).*?(?<![\w.@])" + GENERATED_MARKER + r"\b",
+                                      re.MULTILINE)
+GO_GENERATED_PATTERN = re.compile(r"^// Code generated .* DO NOT EDIT\.$", re.MULTILINE)
+
+# JavaScript and CSS files at least this large with longer lines on average are treated as minified
+MINIFIED_EXTENSIONS = (".js", ".mjs", ".cjs", ".css", ".map")
+MINIFIED_MIN_SIZE = 1024
+MINIFIED_AVERAGE_LINE_LENGTH = 300
+
+
+class GeneratedFileClassifier:
+    """
+    Classifies files as lockfiles, source maps, minified or generated code.
+    """
+
+    def __init__(self, allow_patterns=()):
+        """
+        Initialize the classifier.
+
+        Args:
+            allow_patterns (iterable): gitignore-style patterns of files that are never classified.
+        """
+        allow_patterns = [p.strip() for p in allow_patterns if p.strip()]
+        self.allow_spec = pathspec.PathSpec.from_lines("gitwildmatch", allow_patterns) if allow_patterns else None
+
+    def classify(self, relative_path, content):
+        """
+        Classify a file.
+
+        Args:
+            relative_path (str): Path of the file relative to the project root.
+            content (str): The file content.
+
+        Returns:
+            str: "lockfile", "source map", "minified" or "generated", or None for regular files.
+        """
+        if self.allow_spec and self.allow_spec.match_file(relative_path):
+            return None
+
+        name = os.path.basename(relative_path)
+        if name in LOCKFILE_NAMES:
+            return "lockfile"
+        lower_name = name.lower()
+        if lower_name.endswith(SOURCE_MAP_SUFFIXES):
+            return "source map"
+        if lower_name.endswith(MINIFIED_SUFFIXES):
+            return "minified"
+        if lower_name.endswith(GENERATED_SUFFIXES):
+            return "generated"
+
+        head = content[:HEAD_SIZE]
+        if GENERATED_MARKER_PATTERN.search(head) or GO_GENERATED_PATTERN.search(head):
+            return "generated"
+
+        # Other files with long lines, such as single-line JSON, are data rather than minified code
+        if len(content) >= MINIFIED_MIN_SIZE and lower_name.endswith(MINIFIED_EXTENSIONS):
+            average_line_length = len(content) / (content.count("\n") + 1)
+            if average_line_length > MINIFIED_AVERAGE_LINE_LENGTH:
+                return "minified"
+        return None
+
+
+def stub_content(classification, size, content_hash):
+    """
+    Build the placeholder content emitted for a stubbed file.
+
+    Args:
+        classification (str): The classification of the file.
+        size (int): Size of the original content in bytes.
+        content_hash (str): SHA-256 of the original content.
+
+    Returns:
+        str: The placeholder content.
+    """
+    return f"[{classification} content omitted: {size} bytes, sha256 {content_hash}]"
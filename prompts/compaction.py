@@ -0,0 +1,105 @@
+"""
+Compaction module for shrinking emitted content.
+
+Compaction runs after masking. Level 1 trims trailing whitespace and
+collapses runs of blank lines into one. Level 2 also strips comments,
+chosen by the EXTENSION_MAPPING language hint: Python comments are found
+with the `tokenize` module, other languages with a single regex pass that
+skips string literals. Files in languages without a comment syntax here get
+level 1 only. Every pass is linear in the size of the content.
+"""
+
+import io
+import re
+import tokenize
+
+# Collapses runs of blank (or whitespace-only) lines and trims trailing whitespace
+_TRAILING_WHITESPACE = re.compile(r"[ \t\f\v]+$", re.MULTILINE)
+_BLANK_LINE_RUNS = re.compile(r"\n{3,}")
+
+# String literals are matched first so comment markers inside them are kept
+_QUOTED = r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+_C_STYLE_COMMENTS = re.compile(_QUOTED + r"|`(?:\\.|[^`\\])*`|//[^\n]*|/\*.*?\*/", re.DOTALL)
+_BLOCK_COMMENTS = re.compile(_QUOTED + r"|/\*.*?\*/", re.DOTALL)
+_PHP_COMMENTS = re.compile(_QUOTED + r"|//[^\n]*|#(?!\[)[^\n]*|/\*.*?\*/", re.DOTALL)
+# A hash only starts a comment at the start of a word, so ${#var} and $# are kept
+_HASH_COMMENTS = re.compile(_QUOTED + r"|(?:(?<=\s)|^)#[^\n]*", re.MULTILINE)
+_HTML_COMMENTS = re.compile(r"<!--.*?-->", re.DOTALL)
+
+COMMENT_PATTERNS = {
+    'javascript': _C_STYLE_COMMENTS,
+    'typescript': _C_STYLE_COMMENTS,
+    'java': _C_STYLE_COMMENTS,
+    'c': _C_STYLE_COMMENTS,
+    'cpp': _C_STYLE_COMMENTS,
+    'go': _C_STYLE_COMMENTS,
+    'php': _PHP_COMMENTS,
+    'css': _BLOCK_COMMENTS,
+    'bash': _HASH_COMMENTS,
+    'ruby': _HASH_COMMENTS,
+    'html': _HTML_COMMENTS,
+}
+
+COMPACTION_LEVELS = (0, 1, 2)
+
+
+def _compact_whitespace(content):
+    content = _TRAILING_WHITESPACE.sub("", content)
+    content = _BLANK_LINE_RUNS.sub("\n\n", content)
+    return content.strip("\n") + "\n" if content.strip() else ""
+
+
+def _strip_comment_match(match):
+    text = match.group(0)
+    if text[0] in "\"'`":
+        return text
+    # Block comments spanning lines keep one line break so the code around them stays on separate lines
+    return "\n" if "\n" in text else ""
+
+
+def _strip_python_comments(content):
+    """
+    Strip Python comments found by tokenize, keeping a shebang line.
+
+    Returns:
+        str: The content without comments, or None if it cannot be tokenized.
+    """
+    # tokenize counts rows by "\n" only; str.splitlines would also split on \f, \x85, U+2028 and others
+    lines = io.StringIO(content).readlines()
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(content).readline):
+            if token.type == tokenize.COMMENT:
+                row, column = token.start
+                if row == 1 and token.string.startswith("#!"):
+                    continue
+                line = lines[row - 1]
+                stripped = line[:column].rstrip()
+                # Comment-only lines are removed entirely
+                lines[row - 1] = stripped + "\n" if stripped else ""
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        return None
+    return "".join(lines)
+
+
+def compact_content(content, language, level):
+    """
+    Compact content for output.
+
+    Args:
+        content (str): The (masked) file content.
+        language (str): Language hint from EXTENSION_MAPPING, or an empty string.
+        level (int): 0 leaves the content unchanged, 1 compacts whitespace, 2 also strips comments.
+
+    Returns:
+        str: The compacted content.
+    """
+    if level <= 0 or not content:
+        return content
+    if level >= 2:
+        if language == 'python':
+            stripped = _strip_python_comments(content)
+            if stripped is not None:
+                content = stripped
+        elif language in COMMENT_PATTERNS:
+            content = COMMENT_PATTERNS[language].sub(_strip_comment_match, content)
+    return _compact_whitespace(content)
@@ -0,0 +1,157 @@
+"""
+Entropy detector module for masking random-looking tokens.
+
+The regex patterns of SensitiveMasker only catch secrets assigned to known
+names. The entropy detector finds candidate tokens (long runs of base64 and
+identifier characters containing both letters and digits) in one regex pass
+over the whole file and scores their Shannon entropy in batches. With NumPy
+installed (pip install project-prompt-generator[fast]) a batch is scored
+with one bincount over all of its characters; otherwise a pure-Python loop
+is used. Both backends produce the same scores. Tokens at or above the
+threshold are replaced with asterisks.
+
+The entropy of a token is bounded by the log2 of its length and of its
+alphabet size. Hex digests (at most 4 bits per character) and identifiers
+stay below the default threshold, while random base64 and alphanumeric
+keys of 24 characters or more exceed it.
+"""
+
+import math
+import re
+import time
+from collections import Counter
+
+from utils.memory_budget import format_size
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+BACKENDS = ("numpy", "python")
+
+# Bits per character at or above which a token is masked
+DEFAULT_THRESHOLD = 4.5
+MIN_TOKEN_LENGTH = 20
+
+# Number of tokens scored together by the NumPy backend
+BATCH_SIZE = 2048
+
+_CANDIDATE = re.compile(r"[A-Za-z0-9+/_\-]{%d,}={0,2}" % MIN_TOKEN_LENGTH)
+_DIGIT = re.compile(r"\d")
+_LETTER = re.compile(r"[A-Za-z]")
+
+
+def default_backend():
+    """
+    Returns:
+        str: "numpy" when it is installed, otherwise "python".
+    """
+    return "numpy" if numpy is not None else "python"
+
+
+def _entropies_python(tokens):
+    entropies = []
+    for token in tokens:
+        length = len(token)
+        entropies.append(-sum(count / length * math.log2(count / length) for count in Counter(token).values()))
+    return entropies
+
+
+def _entropies_numpy(tokens):
+    # Candidate tokens are ASCII, so one row of 128 counters per token covers every character
+    lengths = numpy.fromiter(map(len, tokens), dtype=numpy.int64, count=len(tokens))
+    characters = numpy.frombuffer("".join(tokens).encode("ascii"), dtype=numpy.uint8)
+    rows = numpy.repeat(numpy.arange(len(tokens)), lengths)
+    counts = numpy.bincount(rows * 128 + characters, minlength=len(tokens) * 128).reshape(len(tokens), 128)
+    probabilities = counts / lengths[:, None]
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        terms = numpy.where(counts > 0, probabilities * numpy.log2(probabilities), 0.0)
+    return (-terms.sum(axis=1)).tolist()
+
+
+class EntropyDetector:
+    """
+    Masks high-entropy tokens and keeps cost counters for a per-run report.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, backend=None):
+        """
+        Initialize the detector.
+
+        Args:
+            threshold (float): Shannon entropy in bits per character at or above which a token is masked.
+            backend (str, optional): "numpy" or "python". Defaults to default_backend().
+
+        Raises:
+            ValueError: If the backend is unknown or not installed.
+        """
+        backend = backend or default_backend()
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown entropy backend: {backend}")
+        if backend == "numpy" and numpy is None:
+            raise ValueError("The numpy entropy backend requires numpy (pip install project-prompt-generator[fast])")
+        self.threshold = threshold
+        self.backend = backend
+        self._entropies = _entropies_numpy if backend == "numpy" else _entropies_python
+        self.scanned_bytes = 0
+        self.scored_tokens = 0
+        self.masked_tokens = 0
+        self.seconds = 0.0
+
+    def entropies(self, tokens):
+        """
+        Score tokens in batches.
+
+        Args:
+            tokens (list): ASCII tokens.
+
+        Returns:
+            list: The Shannon entropy of each token in bits per character.
+        """
+        entropies = []
+        for start in range(0, len(tokens), BATCH_SIZE):
+            entropies.extend(self._entropies(tokens[start:start + BATCH_SIZE]))
+        return entropies
+
+    def mask(self, content):
+        """
+        Replace high-entropy tokens with asterisks.
+
+        Args:
+            content (str): Text content to mask.
+
+        Returns:
+            str: The content with high-entropy tokens masked.
+        """
+        started = time.perf_counter()
+        self.scanned_bytes += len(content) if content.isascii() else len(content.encode("utf-8"))
+        spans = [match.span() for match in _CANDIDATE.finditer(content)
+                 if _DIGIT.search(match.group()) and _LETTER.search(match.group())]
+        if not spans:
+            self.seconds += time.perf_counter() - started
+            return content
+
+        tokens = [content[start:end] for start, end in spans]
+        self.scored_tokens += len(tokens)
+        pieces = []
+        position = 0
+        for (start, end), entropy in zip(spans, self.entropies(tokens)):
+            if entropy >= self.threshold:
+                pieces.append(content[position:start])
+                pieces.append("*" * (end - start))
+                position = end
+                self.masked_tokens += 1
+        pieces.append(content[position:])
+        self.seconds += time.perf_counter() - started
+        return "".join(pieces)
+
+    def report(self):
+        """
+        Returns:
+            str: A one-line summary of the detector's cost and results.
+        """
+        throughput = self.scanned_bytes / self.seconds if self.seconds else 0
+        return (f"Entropy detector ({self.backend}): scanned {format_size(self.scanned_bytes)} in "
+                f"{self.seconds:.2f}s ({format_size(int(throughput))}/s), scored {self.scored_tokens} tokens, "
+                f"masked {self.masked_tokens}")
@@ -5,8 +5,15 @@ Contains functionality for reading files and masking data.
 
 import os
 
+from utils.language_mapping import EXTENSION_MAPPING
 
-def process_file(file_full_path, project_root, masker, no_mask):
+from .compaction import compact_content
+from .notebook import NOTEBOOK_EXTENSION, render_notebook
+from .skeleton import extract_skeleton
+
+
+def process_file(file_full_path, project_root, masker, no_mask, content=None, skeleton_threshold=None,
+                 notebook_outputs=0, compaction=0):
     """
     Process a single file and return its content and metadata.
 
@@ -15,48 +22,94 @@ def process_file(file_full_path, project_root, masker, no_mask):
         project_root: Root directory of the project
         masker: SensitiveMasker instance
         no_mask: Flag to disable masking
+        content: Already loaded file content; the file is read from disk when None
+        skeleton_threshold: Size in bytes above which source files are reduced to a skeleton
+        notebook_outputs: Characters of text output kept per notebook code cell; 0 drops outputs
+        compaction: Compaction level applied after masking, see compact_content
 
     Returns:
-        A dictionary containing file content, relative path, and file extension,
-        or None if processing failed.
+        A dictionary containing file content, relative path, file extension and
+        whether the content is a skeleton or a rendered notebook, and the bytes saved by
+        compaction, or None if processing failed.
     """
     rel_path = os.path.relpath(file_full_path, project_root)
     filename = os.path.basename(file_full_path)
 
-    try:
-        with open(file_full_path, "r", encoding="utf-8") as f:
-            file_content = f.read()
-    except Exception as e:
-        # print(f"Skipping {rel_path}: {e}")
-        return None
+    if content is not None:
+        file_content = content
+    else:
+        try:
+            with open(file_full_path, "r", encoding="utf-8") as f:
+                file_content = f.read()
+        except Exception as e:
+            # print(f"Skipping {rel_path}: {e}")
+            return None
+
+    # Determine language hint based on file extension
+    _, ext = os.path.splitext(file_full_path)
+    ext = ext.lower()
+
+    # Notebooks are rendered from their cell sources, dropping outputs and embedded images before masking
+    notebook = False
+    if ext == NOTEBOOK_EXTENSION:
+        rendered = render_notebook(file_content, notebook_outputs)
+        if rendered is not None:
+            file_content = rendered
+            notebook = True
+
+    # Reduce large files before masking so the masker scans less content
+    skeleton = False
+    if skeleton_threshold is not None:
+        size = len(file_content) if file_content.isascii() else len(file_content.encode("utf-8"))
+        if size > skeleton_threshold:
+            skeleton_content = extract_skeleton(file_content, EXTENSION_MAPPING.get(ext, ""))
+            if skeleton_content is not None:
+                file_content = skeleton_content
+                skeleton = True
 
     # Mask sensitive data by default unless disabled
     if masker and not no_mask:
         file_content = masker.mask_content(file_content)
 
-    # Determine language hint based on file extension
-    _, ext = os.path.splitext(file_full_path)
-    ext = ext.lower()
+    # Compact whitespace and comments of the masked content. Rendered notebooks carry their cell markers and
+    # markdown cells as comments, so only their whitespace is compacted
+    compacted_bytes = 0
+    if compaction:
+        size = len(file_content.encode("utf-8"))
+        language = "" if notebook else EXTENSION_MAPPING.get(ext, "")
+        file_content = compact_content(file_content, language, compaction)
+        compacted_bytes = size - len(file_content.encode("utf-8"))
 
     return {
         "content": file_content,
         "rel_path": rel_path,
         "filename": filename,
-        "ext": ext
+        "ext": ext,
+        "skeleton": skeleton,
+        "notebook": notebook,
+        "compacted_bytes": compacted_bytes,
     }
 
 
-def create_outline(markdown_files_info):
+def create_outline(entries):
     """
-    Create outline content from file info
+    Create outline content from outline entries
 
     Args:
-        markdown_files_info: List of tuples with file information
+        entries: List of OutlineEntry objects
 
     Returns:
         Outline content as a string
     """
     outline_lines = ["# Outline\n"]
-    for seq, original, md_filename, rel_path in markdown_files_info:
-        outline_lines.append(f"- {md_filename} (original: {original}, path: {rel_path})")
+    for entry in entries:
+        if entry.deleted:
+            outline_lines.append(f"- {entry.rel_path} (deleted)")
+            continue
+        details = f"original: {entry.original}, path: {entry.rel_path}, "
+        if entry.duplicate_of:
+            details += f"duplicate of: {entry.duplicate_of}, "
+        if entry.generated:
+            details += f"{entry.generated}: {entry.generated_action}, "
+        outline_lines.append(f"- {entry.md_filename} ({details}tokens: {entry.tokens})")
     return "\n".join(outline_lines)
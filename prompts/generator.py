@@ -1,12 +1,17 @@
 import os
+import time
 
-from outputs.events import (EndEvent, FileProcessedEvent, OutlineCreatedEvent,
-                            StartEvent)
-from prompts import create_outline, process_file
-from prompts.options import Options
+from outputs.events import EndEvent, FileBatchProcessedEvent, OutlineCreatedEvent, StartEvent
+from prompts.checkpoint import Checkpoint, checkpoint_path, run_fingerprint
+from prompts.options import Options, OutputFormat
+from prompts.snapshot import Snapshotter
+from utils.memory_budget import MemoryBudget, SpillableList
+from utils.reporting import ProgressReporter, get_logger
 
+log = get_logger(__name__)
 
-def _create_masker(no_mask):
+
+def _create_masker(no_mask, entropy_threshold=None):
     """Create and configure the sensitive data masker"""
     from . import DEFAULT_SENSITIVE_PATTERNS, SensitiveMasker
 
@@ -14,48 +19,152 @@ def _create_masker(no_mask):
     if not no_mask:
         # Initialize masker with default patterns if masking is enabled
         patterns = DEFAULT_SENSITIVE_PATTERNS.copy()
-        masker = SensitiveMasker(patterns)
+        masker = SensitiveMasker(patterns, entropy_threshold)
 
         if not no_mask:
-            print("Sensitive data masking is enabled (use --no-mask to disable)")
+            log.info("Sensitive data masking is enabled (use --no-mask to disable)")
 
     return masker
 
 
-def generate(files_to_process, options: Options, output_handler):
+def output_path(options: Options):
+    """Return the output file for options.output_format, as given in the options"""
+    if options.output_format == OutputFormat.MARKDOWN:
+        return options.output_file
+    if options.output_format == OutputFormat.TREE_JSON:
+        return options.tree_json_output_file
+    if options.output_format == OutputFormat.SQLITE:
+        return options.sqlite_output_file
+    if options.output_format == OutputFormat.NDJSON:
+        return options.ndjson_output_file
+    return options.json_output_file
+
+
+def create_output_handler(options: Options):
+    """Create the output handler for options.output_format"""
+    from outputs import (JSONOutputHandler, NDJSONOutputHandler, SingleFileOutputHandler, SQLiteOutputHandler,
+                         TreeJSONOutputHandler)
+
+    if options.output_format == OutputFormat.MARKDOWN:
+        return SingleFileOutputHandler(options.output_file, options.max_tokens, options.sidecar_index)
+    if options.output_format == OutputFormat.TREE_JSON:
+        return TreeJSONOutputHandler(options.tree_json_output_file, options.sidecar_index, options.compact_json,
+                                     options.json_format)
+    if options.output_format == OutputFormat.SQLITE:
+        return SQLiteOutputHandler(options.sqlite_output_file)
+    if options.output_format == OutputFormat.NDJSON:
+        return NDJSONOutputHandler(options.ndjson_output_file, options.json_format, options.sidecar_index)
+    return JSONOutputHandler(options.json_output_file, options.json_format, options.max_tokens,
+                             options.sidecar_index, options.compact_json)
+
+
+def generate(files_to_process, options: Options, output_handler, masker=None, content_cache=None, deleted=()):
     """
     Generate markdown output using the specified output handler.
+    With options.resume, progress is checkpointed and a previous interrupted run is continued.
+    A masker and content cache created by the caller are reused instead of creating them for this run.
+    Deleted paths, e.g. from --changed, are listed at the end of the outline without content.
+    Returns the summary lines of the run, which are also logged.
     """
-    masker = _create_masker(options.no_mask)
+    checkpoint = None
+    if options.resume:
+        if not output_handler.STATE_ATTRIBUTES:
+            raise ValueError(f"--resume is not supported with {options.output_format.value} output")
+        if options.max_memory:
+            raise ValueError("--resume cannot be combined with --max-memory")
+        files_to_process = list(files_to_process)
+        checkpoint = Checkpoint(checkpoint_path(os.getcwd(), options), run_fingerprint(files_to_process, options, deleted))
+
+    if masker is None:
+        masker = _create_masker(options.no_mask, options.entropy_threshold)
+
+    memory_budget = None
+    if options.max_memory:
+        memory_budget = MemoryBudget(options.max_memory)
+        output_handler.use_memory_budget(memory_budget)
 
     output_handler.fire_event(StartEvent(message="Processing started"))
 
-    try:
-        markdown_files_info = []
-        seq_counter = 1
-
-        for file_entry in files_to_process:
-            file_data = process_file(file_entry.full_path, os.getcwd(), masker, options.no_mask)
-            if not file_data:
-                continue
-
-            # Generate reference filename (not creating actual file)
-            flat_rel_path = file_entry.relative_path.replace(os.path.sep, "_")
-            seq_str = str(seq_counter).zfill(3)
-            md_filename = f"{seq_str}_{flat_rel_path}.md"
+    batch = []
 
-            markdown_files_info.append((seq_str, file_entry.filename, md_filename, file_entry.relative_path))
+    def flush_batch():
+        nonlocal batch
+        if batch:
+            pending, batch = batch, []
+            output_handler.fire_event(FileBatchProcessedEvent(events=pending))
 
-            event = FileProcessedEvent(filename=md_filename, relative_path=file_entry.relative_path,
-                                       content=file_data["content"])
-            output_handler.fire_event(event)
-            print(f"Processed {file_entry.relative_path}")
-            seq_counter += 1
-
-        outline_content = create_outline(markdown_files_info)
+    progress = ProgressReporter(len(files_to_process) if hasattr(files_to_process, "__len__") else None)
+    completed = False
+    try:
+        snapshotter = Snapshotter(os.getcwd(), options, masker,
+                                  SpillableList(memory_budget) if memory_budget else None, content_cache)
+        start_index = 0
+
+        state = checkpoint.load() if checkpoint else None
+        if state:
+            start_index = state["next_index"]
+            snapshotter.set_state(state["snapshot"])
+            output_handler.set_state(state["handler"])
+            log.info("Resuming from checkpoint after %s files", snapshotter.seq_counter - 1)
+        last_checkpoint = time.monotonic()
+
+        for index, file_entry in enumerate(files_to_process):
+            if index < start_index:
+                continue
+            record = snapshotter.process(file_entry)
+            progress.update(1, record.outline.size if record else 0)
+            if record is None:
+                continue
+            if record.skipped:
+                log.debug("Skipped %s (%s)", record.path, record.outline.generated)
+                continue
 
-        event = OutlineCreatedEvent(content=outline_content)
-        output_handler.fire_event(event)
+            batch.append(record.to_event())
+            notes = []
+            if record.outline.generated:
+                notes.append(f"{record.outline.generated}, stubbed")
+            elif record.skeleton:
+                notes.append("skeleton")
+            elif record.notebook:
+                notes.append("notebook")
+            if record.compacted_bytes:
+                notes.append(f"compacted {record.compacted_bytes} bytes")
+            if notes:
+                log.debug("Processed %s (%s)", record.path, ", ".join(notes))
+            else:
+                log.debug("Processed %s", record.path)
+
+            if len(batch) >= options.batch_size:
+                flush_batch()
+                # Checkpoints are taken between batches, when the handler has seen every processed file
+                if checkpoint and time.monotonic() - last_checkpoint >= options.checkpoint_interval:
+                    checkpoint.save({
+                        "next_index": index + 1,
+                        "snapshot": snapshotter.get_state(),
+                        "handler": output_handler.get_state(),
+                    })
+                    last_checkpoint = time.monotonic()
+
+        flush_batch()
+        for path in deleted:
+            snapshotter.add_deleted(path)
+
+        progress.finish()
+        summary = snapshotter.summary()
+        for line in summary:
+            log.info(line)
+
+        output_handler.fire_event(OutlineCreatedEvent(entries=snapshotter.outline_entries))
+        completed = True
 
     finally:
-        output_handler.fire_event(EndEvent(message="Processing completed"))
+        try:
+            # Deliver files processed before an error, as unbatched processing would have
+            flush_batch()
+        finally:
+            output_handler.fire_event(EndEvent(message="Processing completed"))
+            if memory_budget:
+                log.info(memory_budget.report())
+    if checkpoint and completed:
+        checkpoint.remove()
+    return summary
@@ -0,0 +1,252 @@
+"""
+Notebook module for rendering Jupyter notebooks as plain source.
+
+Raw .ipynb JSON carries cell outputs, base64-encoded images and attachments
+that bloat the snapshot and make the masker scan megabytes of encoded data.
+Notebooks are instead rendered in the "percent" script format used by
+Jupytext and editors: each cell starts with a `# %%` marker, code cells keep
+their source and markdown and raw cells are commented out. Outputs are
+dropped unless a limit is given, in which case text outputs are kept as
+truncated comments and rich outputs are replaced with a placeholder line.
+
+The notebook JSON is parsed incrementally rather than with one json.loads:
+cells are decoded and rendered one at a time, and values that are dropped
+(notebook metadata, attachments, and outputs unless kept) are skipped by
+matching their brackets and strings without building Python objects, so
+megabytes of base64 images are never decoded. Content that is not valid
+notebook JSON is left to be emitted raw.
+"""
+
+import json
+import re
+
+NOTEBOOK_EXTENSION = ".ipynb"
+
+# Output MIME types rendered as text when outputs are kept
+TEXT_OUTPUT_TYPES = ("text/plain",)
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRUCTURE = re.compile(r'[\[\]{}"]')
+_CLOSING = {"[": "]", "{": "}"}
+
+
+def _skip_whitespace(content, index):
+    return _WHITESPACE.match(content, index).end()
+
+
+def _string_end(content, index):
+    """
+    Returns:
+        int: The index after the JSON string starting at index, found with str.find rather than decoding it.
+    """
+    position = index + 1
+    while True:
+        end = content.find('"', position)
+        if end == -1:
+            raise ValueError("Unterminated string")
+        # A quote preceded by an odd number of backslashes is escaped
+        backslash = end - 1
+        while content[backslash] == "\\":
+            backslash -= 1
+        if (end - backslash) % 2:
+            return end + 1
+        position = end + 1
+
+
+def _skip_value(content, index):
+    """
+    Returns:
+        int: The index after the JSON value starting at index, found without decoding strings or containers.
+    """
+    if content[index] == '"':
+        return _string_end(content, index)
+    if content[index] not in _CLOSING:
+        return _DECODER.raw_decode(content, index)[1]
+    stack = []
+    position = index
+    while True:
+        match = _STRUCTURE.search(content, position)
+        if match is None:
+            raise ValueError("Unterminated value")
+        token = match.group()
+        if token == '"':
+            position = _string_end(content, match.start())
+            continue
+        position = match.end()
+        if token in _CLOSING:
+            stack.append(_CLOSING[token])
+        elif stack.pop() != token:
+            raise ValueError("Mismatched bracket")
+        elif not stack:
+            return position
+
+
+def _members(content, index):
+    """
+    Iterate over the members of the JSON object starting at index.
+    Yields (key, value_index) pairs; the caller sends back the index after each value.
+    """
+    if content[index] != "{":
+        raise ValueError("Expected an object")
+    index = _skip_whitespace(content, index + 1)
+    if content[index] == "}":
+        return index + 1
+    while True:
+        key, index = _DECODER.raw_decode(content, index)
+        index = _skip_whitespace(content, index)
+        if not isinstance(key, str) or content[index] != ":":
+            raise ValueError("Expected a member")
+        index = yield key, _skip_whitespace(content, index + 1)
+        index = _skip_whitespace(content, index)
+        if content[index] == "}":
+            return index + 1
+        if content[index] != ",":
+            raise ValueError("Expected ',' or '}'")
+        index = _skip_whitespace(content, index + 1)
+
+
+def _parse_object(content, index, skip_keys):
+    """
+    Decode the JSON object starting at index, skipping the values of skip_keys.
+
+    Returns:
+        tuple: The decoded members and the index after the object.
+    """
+    result = {}
+    members = _members(content, index)
+    try:
+        key, value_index = next(members)
+        while True:
+            if key in skip_keys:
+                end = _skip_value(content, value_index)
+            else:
+                result[key], end = _DECODER.raw_decode(content, value_index)
+            key, value_index = members.send(end)
+    except StopIteration as stop:
+        return result, stop.value
+
+
+def _iter_cells(content, skip_keys):
+    """
+    Yield the cells of notebook JSON one at a time.
+
+    Raises:
+        ValueError: If the content is not a JSON object with a cells array.
+    """
+    index = _skip_whitespace(content, 0)
+    found_cells = False
+    members = _members(content, index)
+    try:
+        key, value_index = next(members)
+        while True:
+            if key == "cells" and not found_cells:
+                found_cells = True
+                if content[value_index] != "[":
+                    raise ValueError("cells is not an array")
+                index = _skip_whitespace(content, value_index + 1)
+                if content[index] != "]":
+                    while True:
+                        cell, index = _parse_object(content, index, skip_keys)
+                        yield cell
+                        index = _skip_whitespace(content, index)
+                        if content[index] != ",":
+                            break
+                        index = _skip_whitespace(content, index + 1)
+                    if content[index] != "]":
+                        raise ValueError("Expected ',' or ']'")
+                end = index + 1
+            else:
+                end = _skip_value(content, value_index)
+            key, value_index = members.send(end)
+    except StopIteration as stop:
+        index = stop.value
+    if not found_cells:
+        raise ValueError("No cells")
+    if _skip_whitespace(content, index) != len(content):
+        raise ValueError("Extra data")
+
+
+def _text(value):
+    """
+    Join notebook multiline strings, which are stored as a string or a list of lines.
+    """
+    if isinstance(value, list):
+        return "".join(value)
+    return value or ""
+
+
+def _commented(text):
+    return [f"# {line}" if line else "#" for line in text.splitlines()]
+
+
+def _output_lines(outputs, output_limit):
+    """
+    Render the outputs of a code cell as comment lines, keeping at most output_limit characters of text.
+    """
+    texts = []
+    omitted = []
+    for output in outputs:
+        output_type = output.get("output_type")
+        if output_type == "stream":
+            texts.append(_text(output.get("text")))
+        elif output_type == "error":
+            texts.append(f"{output.get('ename', 'Error')}: {output.get('evalue', '')}\n")
+        elif output_type in ("execute_result", "display_data"):
+            data = output.get("data", {})
+            mime_type = next((t for t in TEXT_OUTPUT_TYPES if t in data), None)
+            if mime_type:
+                texts.append(_text(data[mime_type]))
+            omitted.extend(t for t in data if t not in TEXT_OUTPUT_TYPES)
+
+    lines = []
+    text = "".join(texts)
+    if text:
+        lines.append("# Output:")
+        if len(text) > output_limit:
+            lines.extend(_commented(text[:output_limit]))
+            lines.append(f"# ... ({len(text) - output_limit} more characters)")
+        else:
+            lines.extend(_commented(text))
+    lines.extend(f"# [{mime_type} output omitted]" for mime_type in dict.fromkeys(omitted))
+    return lines
+
+
+def render_notebook(content, output_limit=0):
+    """
+    Render notebook JSON in the percent script format.
+
+    Args:
+        content (str): The .ipynb file content.
+        output_limit (int): Characters of text output kept per code cell; 0 drops outputs.
+
+    Returns:
+        str: The rendered notebook, or None if the content is not valid notebook JSON.
+    """
+    skip_keys = ("attachments", "metadata") if output_limit > 0 else ("attachments", "metadata", "outputs")
+    blocks = []
+    try:
+        for cell in _iter_cells(content, skip_keys):
+            blocks.append(_render_cell(cell, output_limit))
+    except (ValueError, IndexError, AttributeError, TypeError):
+        return None
+    return "\n\n".join(blocks) + "\n" if blocks else ""
+
+
+def _render_cell(cell, output_limit):
+    """
+    Render one cell as a percent-format block.
+    """
+    cell_type = cell.get("cell_type")
+    source = _text(cell.get("source")).rstrip("\n")
+    if cell_type == "code":
+        lines = ["# %%"]
+        if source:
+            lines.extend(source.splitlines())
+        if output_limit > 0:
+            lines.extend(_output_lines(cell.get("outputs", []), output_limit))
+    else:
+        # Attachments of markdown cells are embedded images and always dropped
+        lines = [f"# %% [{cell_type}]"]
+        lines.extend(_commented(source))
+    return "\n".join(lines)
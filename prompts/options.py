@@ -1,17 +1,27 @@
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional, Tuple
 
 
 class OutputFormat(Enum):
     MARKDOWN = "markdown"
     JSON = "json"
     TREE_JSON = "tree_json"
+    SQLITE = "sqlite"
+    NDJSON = "ndjson"
 
 
 class JSONFormat(Enum):
     COMPACT = "compact"  # Original format with content as single string
     SPLIT = "split"      # New format with content split into lines
     TREE = "tree"        # New format with content structured like a filesystem tree
+    PATH_TABLE = "path_table"  # Flat directory and file tables with a separate contents array
+
+
+class GeneratedAction(Enum):
+    KEEP = "keep"  # Process generated, minified and lockfile content like any other file
+    STUB = "stub"  # Replace the content with its size and hash
+    SKIP = "skip"  # Leave the file out, listing it in the outline only
 
 
 @dataclass
@@ -21,4 +31,28 @@ class Options:
     output_format: OutputFormat = OutputFormat.JSON
     json_output_file: str = "project_data.json"
     tree_json_output_file: str = "project_filesystem.json"
+    sqlite_output_file: str = "project_data.sqlite"
+    ndjson_output_file: str = "project_data.ndjson"
     json_format: JSONFormat = JSONFormat.SPLIT
+    dedup: bool = False
+    max_tokens: Optional[int] = None
+    skeleton_threshold: Optional[int] = None
+    # Characters of text output kept per notebook code cell; 0 drops outputs
+    notebook_outputs: int = 0
+    # 1 trims trailing whitespace and blank-line runs, 2 also strips comments
+    compaction: int = 0
+    sidecar_index: bool = False
+    compact_json: bool = False
+    # Processed files are delivered to the output handler in batches of this size
+    batch_size: int = 100
+    # Checkpoint progress and continue an interrupted run
+    resume: bool = False
+    # Minimum seconds between checkpoints
+    checkpoint_interval: float = 60.0
+    # Approximate bytes of buffered output kept in memory before spilling to disk
+    max_memory: Optional[int] = None
+    generated: GeneratedAction = GeneratedAction.KEEP
+    # gitignore-style patterns of files never classified as generated
+    generated_allow: Tuple[str, ...] = ()
+    # Also mask tokens with at least this Shannon entropy in bits per character
+    entropy_threshold: Optional[float] = None
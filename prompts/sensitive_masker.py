@@ -30,15 +30,21 @@ DEFAULT_SENSITIVE_PATTERNS = [
 class SensitiveMasker:
     """Class to handle sensitive data masking operations."""
 
-    def __init__(self, patterns=None):
+    def __init__(self, patterns=None, entropy_threshold=None):
         """
         Initialize the masker with given patterns.
 
         Args:
             patterns (list, optional): List of regex patterns to use for masking.
                                        Defaults to DEFAULT_SENSITIVE_PATTERNS.
+            entropy_threshold (float, optional): Also mask tokens with at least this Shannon entropy
+                                                 in bits per character, see EntropyDetector.
         """
         self.patterns = patterns if patterns is not None else DEFAULT_SENSITIVE_PATTERNS.copy()
+        self.entropy_detector = None
+        if entropy_threshold is not None:
+            from .entropy_detector import EntropyDetector
+            self.entropy_detector = EntropyDetector(entropy_threshold)
 
     def add_pattern(self, pattern):
         """
@@ -65,6 +71,10 @@ class SensitiveMasker:
             # Apply the masking for this pattern
             masked_content = self._apply_mask_for_pattern(masked_content, pattern)
 
+        # Random-looking tokens the patterns missed
+        if self.entropy_detector:
+            masked_content = self.entropy_detector.mask(masked_content)
+
         return masked_content
 
     def _apply_mask_for_pattern(self, content, pattern):
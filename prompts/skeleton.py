@@ -0,0 +1,143 @@
+"""
+Skeleton extraction module for rendering large source files as outlines.
+
+Imports, class and function signatures and docstrings are kept while
+function bodies are elided. Python files are handled with `ast`; other
+languages use a lightweight brace heuristic (or `def`/`end` matching for
+Ruby). Extraction is a single linear pass without any type analysis.
+"""
+
+import ast
+import re
+
+# Comment marker written in place of an elided body, per language hint
+ELISION_MARKERS = {
+    'python': '...  # body elided',
+    'javascript': '// ... body elided',
+    'typescript': '// ... body elided',
+    'java': '// ... body elided',
+    'c': '// ... body elided',
+    'cpp': '// ... body elided',
+    'php': '// ... body elided',
+    'go': '// ... body elided',
+    'bash': '# ... body elided',
+    'ruby': '# ... body elided',
+}
+
+BRACE_LANGUAGES = {'javascript', 'typescript', 'java', 'c', 'cpp', 'php', 'go', 'bash'}
+
+# Blocks opened by these keywords are control flow, not function bodies
+_CONTROL_KEYWORDS = re.compile(r'^\s*(?:}\s*)?(?:if|else|for|foreach|while|do|switch|catch|try|finally|with)\b')
+
+# String literals and line comments are blanked before braces are counted
+_STRINGS_AND_COMMENTS = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|`(?:\\.|[^`\\])*`|//.*$|#.*$')
+
+_RUBY_DEF = re.compile(r'^(\s*)def\s')
+
+
+def _indent_of(line):
+    return line[:len(line) - len(line.lstrip())]
+
+
+def _python_elided_ranges(tree):
+    """
+    Collect (first, last) 1-based line ranges of Python function bodies to elide.
+    """
+    ranges = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                body = child.body
+                if (isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant)
+                        and isinstance(body[0].value.value, str)):
+                    body = body[1:]  # Keep the docstring
+                # One-line definitions have nothing to elide
+                if body and body[0].lineno > child.lineno:
+                    ranges.append((body[0].lineno, child.end_lineno))
+            elif isinstance(child, (ast.ClassDef, ast.If, ast.Try, ast.With)):
+                stack.append(child)
+    return sorted(ranges)
+
+
+def _python_skeleton(content):
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    # ast counts lines by "\n" only; str.splitlines would also split on \f, \x85, U+2028 and others
+    lines = content.split("\n")
+    result = []
+    line_no = 1
+    for first, last in _python_elided_ranges(tree):
+        if first < line_no:
+            continue
+        result.extend(lines[line_no - 1:first - 1])
+        result.append(_indent_of(lines[first - 1]) + ELISION_MARKERS['python'])
+        line_no = last + 1
+    result.extend(lines[line_no - 1:])
+    return "\n".join(result)
+
+
+def _brace_skeleton(content, marker):
+    result = []
+    depth = 0
+    elide_until = None  # Depth that closes the block being elided
+    for line in content.splitlines():
+        code = _STRINGS_AND_COMMENTS.sub('""', line)
+        new_depth = depth + code.count("{") - code.count("}")
+
+        if elide_until is not None:
+            if new_depth <= elide_until:
+                result.append(line)
+                elide_until = None
+            depth = new_depth
+            continue
+
+        result.append(line)
+        # A block opened on a signature-like line is treated as a function body
+        if new_depth > depth and "(" in code and code.rstrip().endswith("{") \
+                and not _CONTROL_KEYWORDS.match(code):
+            result.append(_indent_of(line) + "    " + marker)
+            elide_until = depth
+        depth = new_depth
+    return "\n".join(result)
+
+
+def _ruby_skeleton(content, marker):
+    result = []
+    elide_indent = None
+    for line in content.splitlines():
+        if elide_indent is not None:
+            if line.strip() == "end" and _indent_of(line) == elide_indent:
+                result.append(line)
+                elide_indent = None
+            continue
+        result.append(line)
+        match = _RUBY_DEF.match(line)
+        if match and not line.rstrip().endswith("end"):
+            result.append(match.group(1) + "  " + marker)
+            elide_indent = match.group(1)
+    return "\n".join(result)
+
+
+def extract_skeleton(content, language):
+    """
+    Render source code as a skeleton with function bodies elided.
+
+    Args:
+        content (str): The source code.
+        language (str): Language hint from EXTENSION_MAPPING.
+
+    Returns:
+        str: The skeleton, or None if the language is not supported or cannot be parsed.
+    """
+    if language == 'python':
+        return _python_skeleton(content)
+    if language in BRACE_LANGUAGES:
+        return _brace_skeleton(content, ELISION_MARKERS[language])
+    if language == 'ruby':
+        return _ruby_skeleton(content, ELISION_MARKERS[language])
+    return None
@@ -0,0 +1,353 @@
+"""
+Snapshot module: the in-process API for embedding ppg.
+
+`snapshot(root, options)` walks a project and yields typed FileRecord
+objects with the masked content of each file, without writing files or
+printing progress. The outline is available once the records have been
+consumed. The walker's ignore spec and the masker are exposed on the
+returned Snapshot, so repeated calls can pass them back in instead of
+compiling them again.
+
+The per-file pipeline (classification, process_file, deduplication and
+token estimates) lives in Snapshotter, which generate uses as well.
+A ContentCache lets one process reuse the processed content of files it
+has seen before, e.g. the same file in several worktrees of a batch.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+from outputs.events import FileProcessedEvent, OutlineEntry
+from utils.file_walker import FileWalker
+from utils.ignore_handler import build_ignores
+from utils.token_estimator import estimate_tokens, language_for_path
+
+from .classifier import GeneratedFileClassifier, stub_content
+from .file_processor import process_file
+from .options import GeneratedAction, Options
+from .sensitive_masker import DEFAULT_SENSITIVE_PATTERNS, SensitiveMasker
+
+
+class ContentCache:
+    """
+    Processed file data keyed by file extension and the hash of the raw content, evicting the oldest entries.
+    Entries are only valid for one set of processing options and one masker.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int): Approximate limit of the cached content size.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def key(filename, content):
+        return os.path.splitext(filename)[1].lower(), hashlib.sha256(content.encode("utf-8")).digest()
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def put(self, key, file_data):
+        size = len(file_data["content"])
+        if key in self._entries or size > self.max_bytes:
+            return
+        self._entries[key] = file_data
+        self.size += size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted["content"])
+
+
+@dataclass
+class FileRecord:
+    """
+    One processed file of a snapshot.
+    """
+
+    path: str
+    language: str
+    # Masked (and optionally reduced) content; empty for duplicates, None for skipped generated files
+    content: Optional[str]
+    outline: OutlineEntry
+    skeleton: bool = False
+    notebook: bool = False
+    # Bytes removed by compaction
+    compacted_bytes: int = 0
+
+    @property
+    def lines(self) -> List[str]:
+        """The content split into lines."""
+        return self.content.splitlines() if self.content else []
+
+    @property
+    def skipped(self) -> bool:
+        return self.content is None
+
+    def to_event(self):
+        """
+        Returns:
+            FileProcessedEvent: The event delivered to output handlers for this file.
+        """
+        return FileProcessedEvent(filename=self.outline.md_filename, relative_path=self.path,
+                                  content=self.content, duplicate_of=self.outline.duplicate_of)
+
+
+class Snapshotter:
+    """
+    Processes files one at a time, keeping the outline and the deduplication and summary counters.
+    """
+
+    # Attributes saved and restored for resumable runs
+    STATE_ATTRIBUTES = ("seq_counter", "outline_entries", "seen_hashes", "duplicate_count", "duplicate_bytes",
+                        "generated_count", "generated_bytes", "compacted_count", "compacted_bytes")
+
+    def __init__(self, project_root, options: Options, masker=None, outline_entries=None, content_cache=None):
+        """
+        Initialize the snapshotter.
+
+        Args:
+            project_root (str): The project root directory.
+            options (Options): The generation options.
+            masker (SensitiveMasker, optional): The masker, or None when masking is disabled.
+            outline_entries (list, optional): Container collecting the outline, e.g. a SpillableList.
+            content_cache (ContentCache, optional): Cache of processed content shared with other snapshotters
+                                                    using the same options and masker.
+        """
+        self.project_root = project_root
+        self.options = options
+        self.masker = masker
+        self.classifier = None
+        if options.generated != GeneratedAction.KEEP:
+            self.classifier = GeneratedFileClassifier(options.generated_allow)
+        self.outline_entries = outline_entries if outline_entries is not None else []
+        self.content_cache = content_cache
+        self.cached_count = 0
+        self.seq_counter = 1
+        # Maps a content hash to the relative path of the first file with that content
+        self.seen_hashes = {}
+        self.duplicate_count = 0
+        self.duplicate_bytes = 0
+        self.generated_count = 0
+        self.generated_bytes = 0
+        self.compacted_count = 0
+        self.compacted_bytes = 0
+        self.deleted_count = 0
+
+    def get_state(self):
+        return {name: getattr(self, name) for name in self.STATE_ATTRIBUTES}
+
+    def set_state(self, state):
+        for name in self.STATE_ATTRIBUTES:
+            setattr(self, name, state[name])
+
+    def process(self, file_entry):
+        """
+        Process one file and add it to the outline.
+
+        Args:
+            file_entry (FileEntry): The file to process.
+
+        Returns:
+            FileRecord: The processed file, or None if it could not be read or processed.
+        """
+        options = self.options
+        content = file_entry.read_text()
+        if content is None:
+            return None
+
+        # Generate reference filename (not creating actual file)
+        flat_rel_path = file_entry.relative_path.replace(os.path.sep, "_")
+        seq_str = str(self.seq_counter).zfill(3)
+        md_filename = f"{seq_str}_{flat_rel_path}.md"
+
+        # Generated, minified and lockfile content is stubbed or skipped before it reaches the masker
+        generated = self.classifier.classify(file_entry.relative_path, content) if self.classifier else None
+        if generated:
+            # Masking would cost what stubbing saves, so the outline and stub describe the original content
+            content_bytes = content.encode("utf-8")
+            content_hash = hashlib.sha256(content_bytes).hexdigest()
+            self.generated_count += 1
+            self.generated_bytes += len(content_bytes)
+            if options.generated == GeneratedAction.SKIP:
+                entry = OutlineEntry(
+                    seq=self.seq_counter,
+                    original=file_entry.filename,
+                    md_filename=md_filename,
+                    rel_path=file_entry.relative_path,
+                    size=len(content_bytes),
+                    hash=content_hash,
+                    generated=generated,
+                    generated_action=options.generated.value,
+                )
+                self.outline_entries.append(entry)
+                self.seq_counter += 1
+                return FileRecord(path=file_entry.relative_path, language=language_for_path(file_entry.filename),
+                                  content=None, outline=entry)
+            file_data = {"content": stub_content(generated, len(content_bytes), content_hash), "skeleton": False,
+                         "notebook": False, "compacted_bytes": 0}
+        else:
+            cache_key = file_data = None
+            if self.content_cache is not None:
+                cache_key = ContentCache.key(file_entry.filename, content)
+                file_data = self.content_cache.get(cache_key)
+                if file_data is not None:
+                    self.cached_count += 1
+            if file_data is None:
+                file_data = process_file(file_entry.full_path, self.project_root, self.masker, options.no_mask,
+                                         content=content, skeleton_threshold=options.skeleton_threshold,
+                                         notebook_outputs=options.notebook_outputs, compaction=options.compaction)
+                if not file_data:
+                    return None
+                if cache_key is not None:
+                    self.content_cache.put(cache_key, file_data)
+
+        file_content = file_data["content"]
+        if not generated:
+            # Hash masked content so the emitted body is exactly what a duplicate would show
+            content_bytes = file_content.encode("utf-8")
+            content_hash = hashlib.sha256(content_bytes).hexdigest()
+        duplicate_of = None
+        if options.dedup:
+            duplicate_of = self.seen_hashes.setdefault(content_hash, file_entry.relative_path)
+            if duplicate_of == file_entry.relative_path:
+                duplicate_of = None
+            else:
+                self.duplicate_count += 1
+                self.duplicate_bytes += len(content_bytes)
+                file_content = ""
+
+        language = language_for_path(file_entry.filename)
+        entry = OutlineEntry(
+            seq=self.seq_counter,
+            original=file_entry.filename,
+            md_filename=md_filename,
+            rel_path=file_entry.relative_path,
+            size=len(content_bytes),
+            hash=content_hash,
+            tokens=estimate_tokens(file_content, language),
+            duplicate_of=duplicate_of,
+            generated=generated,
+            generated_action=options.generated.value if generated else None,
+        )
+        self.outline_entries.append(entry)
+        self.seq_counter += 1
+        if file_data["compacted_bytes"]:
+            self.compacted_count += 1
+            self.compacted_bytes += file_data["compacted_bytes"]
+
+        return FileRecord(path=file_entry.relative_path, language=language, content=file_content, outline=entry,
+                          skeleton=file_data["skeleton"], notebook=file_data["notebook"],
+                          compacted_bytes=file_data["compacted_bytes"])
+
+    def add_deleted(self, relative_path):
+        """
+        List a file deleted from the working tree in the outline.
+
+        Args:
+            relative_path (str): The path of the deleted file relative to the project root.
+        """
+        self.outline_entries.append(OutlineEntry(
+            seq=self.seq_counter,
+            original=os.path.basename(relative_path),
+            md_filename="",
+            rel_path=relative_path,
+            size=0,
+            hash="",
+            deleted=True,
+        ))
+        self.seq_counter += 1
+        self.deleted_count += 1
+
+    def summary(self):
+        """
+        Returns:
+            list: Summary lines for stubbed or skipped generated files, compaction, the content cache,
+                  deleted files, deduplication and the entropy detector.
+        """
+        lines = []
+        if self.generated_count:
+            action = "Skipped" if self.options.generated == GeneratedAction.SKIP else "Stubbed"
+            lines.append(f"{action} {self.generated_count} generated, minified or lockfile files "
+                         f"({self.generated_bytes} bytes)")
+        if self.compacted_count:
+            lines.append(f"Compacted {self.compacted_count} files ({self.compacted_bytes} bytes saved)")
+        if self.cached_count:
+            lines.append(f"Reused the processed content of {self.cached_count} files from the content cache")
+        if self.deleted_count:
+            lines.append(f"Listed {self.deleted_count} deleted files")
+        if self.duplicate_count:
+            lines.append(f"Deduplicated {self.duplicate_count} files ({self.duplicate_bytes} bytes)")
+        if self.masker and self.masker.entropy_detector:
+            lines.append(self.masker.entropy_detector.report())
+        return lines
+
+
+class Snapshot:
+    """
+    Iterable of the FileRecord objects of a project, produced as they are iterated.
+    Skipped generated files are listed in the outline only.
+    """
+
+    def __init__(self, root, options: Options, ignore_spec, masker):
+        self.root = root
+        self.options = options
+        self.ignore_spec = ignore_spec
+        self.masker = masker
+        self._snapshotter = Snapshotter(root, options, masker)
+        self._consumed = False
+
+    def __iter__(self):
+        if self._consumed:
+            raise RuntimeError("A snapshot can only be iterated once; call snapshot() again")
+        self._consumed = True
+        for file_entry in FileWalker(self.root, self.ignore_spec).get_files():
+            record = self._snapshotter.process(file_entry)
+            if record is not None and not record.skipped:
+                yield record
+
+    @property
+    def outline(self) -> List[OutlineEntry]:
+        """The outline entries of the files processed so far; complete once iteration has finished."""
+        return self._snapshotter.outline_entries
+
+    @property
+    def summary(self) -> List[str]:
+        """Summary lines for generated, compacted and deduplicated files."""
+        return self._snapshotter.summary()
+
+
+def snapshot(root, options: Optional[Options] = None, ignore_spec=None, masker=None):
+    """
+    Snapshot a project in process, without writing output files or printing progress.
+
+    Args:
+        root (str): The project root directory.
+        options (Options, optional): Processing options; output file and format options are ignored.
+        ignore_spec (pathspec.PathSpec, optional): Ignore patterns, e.g. Snapshot.ignore_spec of an earlier call.
+                                                   Built from the root's .gitignore files when None.
+        masker (SensitiveMasker, optional): Masker to reuse, e.g. Snapshot.masker of an earlier call.
+
+    Returns:
+        Snapshot: Iterable of FileRecord objects, with the outline once iterated.
+
+    Example:
+        >>> result = snapshot("path/to/project")
+        >>> for record in result:
+        ...     print(record.path, record.language, len(record.lines))
+        >>> result.outline[0].to_record()
+    """
+    options = options or Options()
+    root = os.path.abspath(root)
+    if ignore_spec is None:
+        ignore_spec = build_ignores(root)
+    if masker is None and not options.no_mask:
+        masker = SensitiveMasker(DEFAULT_SENSITIVE_PATTERNS.copy(), options.entropy_threshold)
+    return Snapshot(root, options, ignore_spec, masker)
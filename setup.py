@@ -21,6 +21,10 @@ setup(
         "dev": [
             "pytest",
             "pytest-cov"
+        ],
+        "fast": [
+            "orjson",
+            "numpy"
         ]
     },
     classifiers=[
@@ -0,0 +1,44 @@
+"""
+Tests for atomic, skip-if-unchanged output writes.
+"""
+
+import os
+
+import pytest
+
+from outputs.atomic_writer import AtomicFileWriter
+from outputs.compression import open_output
+
+
+def test_replaces_changed_file(tmp_path):
+    path = tmp_path / "out.md"
+    path.write_bytes(b"old")
+    with AtomicFileWriter(str(path)) as f:
+        f.write(b"new content")
+    assert f.changed is True
+    assert path.read_bytes() == b"new content"
+    assert os.listdir(tmp_path) == ["out.md"]
+
+
+def test_keeps_unchanged_file(tmp_path):
+    path = tmp_path / "out.json.gz"
+    with open_output(str(path)) as f:
+        f.write(b"same")
+    assert f.changed is True
+    os.utime(path, ns=(0, 0))
+    with open_output(str(path)) as f:
+        f.write(b"same")
+    assert f.changed is False
+    assert os.stat(path).st_mtime_ns == 0
+    assert os.listdir(tmp_path) == ["out.json.gz"]
+
+
+def test_error_leaves_target_untouched(tmp_path):
+    path = tmp_path / "out.md"
+    path.write_bytes(b"complete")
+    with pytest.raises(RuntimeError):
+        with open_output(str(path)) as f:
+            f.write(b"partial")
+            raise RuntimeError("interrupted")
+    assert path.read_bytes() == b"complete"
+    assert os.listdir(tmp_path) == ["out.md"]
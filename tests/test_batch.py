@@ -0,0 +1,86 @@
+"""
+Tests for batch snapshots of several roots.
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+from prompts.batch import discover_roots, root_labels, run_batch
+from prompts.options import JSONFormat, Options
+
+
+def _make_root(path, files):
+    path.mkdir(parents=True)
+    for name, content in files.items():
+        (path / name).write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_discover_submodules_and_worktrees(tmp_path):
+    repo = tmp_path / "repo"
+    (repo / "libs" / "core").mkdir(parents=True)
+    (repo / ".gitmodules").write_text(
+        '[submodule "core"]\n\tpath = libs/core\n\turl = ../core.git\n'
+        '[submodule "gone"]\n\tpath = libs/gone\n\turl = ../gone.git\n', encoding="utf-8")
+    worktree = tmp_path / "feature"
+    worktree.mkdir()
+    (repo / ".git" / "worktrees" / "feature").mkdir(parents=True)
+    (repo / ".git" / "worktrees" / "feature" / "gitdir").write_text(f"{worktree}/.git\n", encoding="utf-8")
+
+    assert discover_roots(str(repo)) == [str(repo / "libs" / "core"), str(worktree)]
+
+
+def test_root_labels_are_unique(tmp_path):
+    base = str(tmp_path / "base")
+    roots = [base, os.path.join(base, "libs", "core"), str(tmp_path / "other" / "core"), str(tmp_path / "core")]
+    assert root_labels(roots, base) == ["base", "libs_core", "core", "core-2"]
+
+
+def test_run_batch_writes_each_root(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    caplog.set_level(logging.INFO, logger="ppg")
+    first = _make_root(tmp_path / "first", {"a.py": "print('a')\n"})
+    second = _make_root(tmp_path / "second", {"b.py": "print('b')\n", "c.py": "print('c')\n"})
+
+    results = run_batch([first, second], Options(no_mask=True, json_format=JSONFormat.COMPACT), jobs=2)
+
+    assert [(result.label, result.files, result.error) for result in results] == [
+        ("first", 1, None), ("second", 2, None)]
+    document = json.loads((tmp_path / "second" / "project_data.json").read_text(encoding="utf-8"))
+    assert [record["relative_path"] for record in document["files"]] == ["b.py", "c.py"]
+    assert f"first: Output written to {tmp_path / 'first' / 'project_data.json'}" in caplog.messages
+    assert f"second: Output written to {tmp_path / 'second' / 'project_data.json'}" in caplog.messages
+    assert not any(message.startswith("Outputting to") for message in caplog.messages)
+
+
+def test_run_batch_returns_summaries_and_reuses_content(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first = _make_root(tmp_path / "first", {"a.py": "print('a')\n", "copy.py": "print('a')\n"})
+    second = _make_root(tmp_path / "second", {"a.py": "print('a')\n"})
+
+    results = run_batch([first, second], Options(no_mask=True, dedup=True), jobs=1)
+
+    assert any(line.startswith("Deduplicated 1 files") for line in results[0].summary)
+    assert "Reused the processed content of 1 files from the content cache" in results[1].summary
+
+
+def test_run_batch_combined_output(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(spool_dir))
+    first = _make_root(tmp_path / "first", {"a.py": "print('a')\n"})
+    second = _make_root(tmp_path / "second", {"b.py": "print('b')\n"})
+    output_file = tmp_path / "combined.json"
+
+    run_batch([first, second], Options(no_mask=True, json_output_file=str(output_file),
+                                       json_format=JSONFormat.COMPACT), jobs=2, combined=True)
+
+    document = json.loads(output_file.read_text(encoding="utf-8"))
+    assert [record["relative_path"] for record in document["files"]] == ["first/a.py", "second/b.py"]
+    assert [entry["markdown_filename"] for entry in document["outline"]] == ["001_first_a.py.md",
+                                                                           "002_second_b.py.md"]
+    assert not os.path.exists(tmp_path / "first" / "project_data.json")
+    assert not list(spool_dir.iterdir())
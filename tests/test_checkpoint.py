@@ -0,0 +1,129 @@
+"""
+Tests for checkpointed, resumable runs.
+"""
+
+import logging
+import os
+import subprocess
+
+import pytest
+
+from outputs import JSONOutputHandler
+from prompts import checkpoint as checkpoint_module
+from prompts.generator import generate
+from prompts.options import Options
+from utils.file_walker import FileEntry
+from utils.git_source import GitBlobEntry, GitRevisionWalker
+
+
+class Interrupted(Exception):
+    pass
+
+
+class InterruptingEntry(FileEntry):
+    def read_text(self):
+        raise Interrupted()
+
+
+class InterruptingBlobEntry(GitBlobEntry):
+    def read_text(self):
+        raise Interrupted()
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=ppg", "-c", "user.email=ppg@example.com", *args],
+        cwd=repo, check=True, stdout=subprocess.DEVNULL,
+    )
+
+
+def _entries(root, interrupt_at=None):
+    entries = []
+    for i in range(6):
+        path = root / f"mod{i}.py"
+        if not path.exists():
+            path.write_text(f"value = {i}\n" if i != 4 else "value = 0\n", encoding="utf-8")
+        entry_class = InterruptingEntry if i == interrupt_at else FileEntry
+        entries.append(entry_class(str(path), path.name, path.name))
+    return entries
+
+
+def _options():
+    return Options(no_mask=True, dedup=True, batch_size=1, resume=True, checkpoint_interval=0)
+
+
+def test_resume_matches_uninterrupted_run(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(checkpoint_module, "CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    project = tmp_path / "project"
+    project.mkdir()
+
+    expected_file = tmp_path / "expected.json"
+    generate(_entries(project), _options(), JSONOutputHandler(str(expected_file)))
+
+    output_file = tmp_path / "resumed.json"
+    with pytest.raises(Interrupted):
+        generate(_entries(project, interrupt_at=3), _options(), JSONOutputHandler(str(output_file)))
+    assert list((tmp_path / "checkpoints").iterdir())
+
+    caplog.set_level(logging.INFO, logger="ppg")
+    generate(_entries(project), _options(), JSONOutputHandler(str(output_file)))
+    assert "Resuming from checkpoint after 3 files" in caplog.text
+    assert output_file.read_bytes() == expected_file.read_bytes()
+    assert not list((tmp_path / "checkpoints").iterdir())
+
+
+def test_changed_file_starts_fresh_run(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(checkpoint_module, "CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    project = tmp_path / "project"
+    project.mkdir()
+
+    output_file = tmp_path / "out.json"
+    with pytest.raises(Interrupted):
+        generate(_entries(project, interrupt_at=3), _options(), JSONOutputHandler(str(output_file)))
+
+    # Same size, so only the modification time tells the runs apart
+    (project / "mod1.py").write_text("value = 9\n", encoding="utf-8")
+    os.utime(project / "mod1.py", ns=(0, 0))
+    caplog.set_level(logging.INFO, logger="ppg")
+    generate(_entries(project), _options(), JSONOutputHandler(str(output_file)))
+    assert "Resuming from checkpoint" not in caplog.text
+    assert "value = 9" in output_file.read_text(encoding="utf-8")
+
+
+def test_changed_revision_starts_fresh_run(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(checkpoint_module, "CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    project = tmp_path / "project"
+    project.mkdir()
+    _git(project, "init", "-q")
+    _entries(project)
+    _git(project, "add", ".")
+    _git(project, "commit", "-q", "-m", "v1")
+    _git(project, "tag", "v1")
+    (project / "mod1.py").write_text("value = 9\n", encoding="utf-8")
+    _git(project, "commit", "-q", "-am", "v2")
+
+    def revision_entries(walker, interrupt_at=None):
+        entries = walker.get_files()
+        if interrupt_at is not None:
+            entry = entries[interrupt_at]
+            entries[interrupt_at] = InterruptingBlobEntry(**{
+                name: getattr(entry, name) for name in entry.__dataclass_fields__
+            })
+        return entries
+
+    with GitRevisionWalker(str(project), "v1") as v1, GitRevisionWalker(str(project), "HEAD") as head:
+        expected_file = tmp_path / "expected.json"
+        generate(revision_entries(head), _options(), JSONOutputHandler(str(expected_file)))
+
+        output_file = tmp_path / "out.json"
+        with pytest.raises(Interrupted):
+            generate(revision_entries(v1, interrupt_at=3), _options(), JSONOutputHandler(str(output_file)))
+        assert list((tmp_path / "checkpoints").iterdir())
+
+        caplog.set_level(logging.INFO, logger="ppg")
+        generate(revision_entries(head), _options(), JSONOutputHandler(str(output_file)))
+    assert "Resuming from checkpoint" not in caplog.text
+    assert output_file.read_bytes() == expected_file.read_bytes()
@@ -0,0 +1,62 @@
+"""
+Tests for generated, minified and lockfile classification.
+"""
+
+import json
+
+import pytest
+
+from outputs import JSONOutputHandler
+from prompts.classifier import GENERATED_MARKER, GeneratedFileClassifier
+from prompts.generator import generate
+from prompts.options import GeneratedAction, JSONFormat, Options
+from utils.file_walker import FileEntry
+
+
+@pytest.mark.parametrize("relative_path, content, expected", [
+    ("web/package-lock.json", "{}", "lockfile"),
+    ("poetry.lock", "", "lockfile"),
+    ("static/app.min.js", "var a=1;", "minified"),
+    ("static/app.js.map", "{}", "source map"),
+    ("api/service_pb2.py", "", "generated"),
+    ("api/models.py", f"# {GENERATED_MARKER} by a tool\nx = 1\n", "generated"),
+    ("api/models.go", "// Code generated by protoc-gen-go. DO NOT EDIT.\npackage api\n", "generated"),
+    ("static/bundle.js", "x" * 5000, "minified"),
+    ("static/theme.css", "a{color:red}" * 500, "minified"),
+    ("config/settings.json", '{"key": "' + "x" * 5000 + '"}', None),
+    ("docs/notes.md", f"Mark outputs with {GENERATED_MARKER} in a header comment.\n", None),
+    ("src/tags.py", f'MARKER = "{GENERATED_MARKER}"\n', None),
+    ("api/types.ts", f"/**\n * {GENERATED_MARKER} SignedSource<<abc>>\n */\n", "generated"),
+    ("src/main.py", "print('hello')\n" * 200, None),
+])
+def test_classify(relative_path, content, expected):
+    assert GeneratedFileClassifier().classify(relative_path, content) == expected
+
+
+def test_allow_patterns_override():
+    classifier = GeneratedFileClassifier(["vendor/*.min.js", ""])
+    assert classifier.classify("vendor/lib.min.js", "") is None
+    assert classifier.classify("static/app.min.js", "") == "minified"
+
+
+@pytest.mark.parametrize("action", [GeneratedAction.STUB, GeneratedAction.SKIP])
+def test_generated_files_in_outline(tmp_path, monkeypatch, action):
+    monkeypatch.chdir(tmp_path)
+    entries = []
+    for name, content in (("main.py", "print('hi')\n"), ("yarn.lock", "lodash@4:\n  version 4\n")):
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+        entries.append(FileEntry(str(path), name, name))
+
+    output_file = tmp_path / "out.json"
+    generate(entries, Options(no_mask=True, generated=action),
+             JSONOutputHandler(str(output_file), JSONFormat.COMPACT))
+    document = json.loads(output_file.read_text(encoding="utf-8"))
+
+    assert document["outline"][1]["generated"] == "lockfile"
+    assert document["outline"][1]["generated_action"] == action.value
+    files = {record["relative_path"]: record["content"] for record in document["files"]}
+    if action == GeneratedAction.SKIP:
+        assert list(files) == ["main.py"]
+    else:
+        assert files["yarn.lock"].startswith("[lockfile content omitted: 22 bytes, sha256 ")
@@ -0,0 +1,84 @@
+"""
+Tests for whitespace and comment compaction.
+"""
+
+import json
+
+import pytest
+
+from prompts import process_file
+from prompts.compaction import compact_content
+
+PYTHON_SOURCE = '''#!/usr/bin/env python
+# Copyright banner
+# spanning lines
+
+
+import os  # trailing comment
+URL = "http://example.com/#anchor"   
+def main():
+    # explain
+    return os.getcwd()
+'''
+
+
+def test_level_one_trims_whitespace():
+    assert compact_content("a = 1   \n\n\n\nb = 2\t\n\n", "python", 1) == "a = 1\n\nb = 2\n"
+
+
+def test_level_zero_is_unchanged():
+    assert compact_content(PYTHON_SOURCE, "python", 0) == PYTHON_SOURCE
+
+
+def test_python_comments_stripped_with_tokenize():
+    assert compact_content(PYTHON_SOURCE, "python", 2) == (
+        '#!/usr/bin/env python\n'
+        '\n'
+        'import os\n'
+        'URL = "http://example.com/#anchor"\n'
+        'def main():\n'
+        '    return os.getcwd()\n'
+    )
+
+
+@pytest.mark.parametrize("separator", ["\u2028", "\f", "\x85"])
+def test_python_line_separators_inside_strings_keep_rows_aligned(separator):
+    source = f's = "a{separator}b"\nresult = compute(alpha, beta, gamma)\nx = 1  # c\n'
+    assert compact_content(source, "python", 2) == (
+        f's = "a{separator}b"\nresult = compute(alpha, beta, gamma)\nx = 1\n'
+    )
+
+
+def test_python_that_does_not_tokenize_keeps_comments():
+    assert compact_content("x = (  # open\n", "python", 2) == "x = (  # open\n"
+
+
+@pytest.mark.parametrize("language, source, expected", [
+    ("javascript", '/* banner\n */\nconst a = "//x"; // note\nconst b = `/* kept */`;\n',
+     'const a = "//x";\nconst b = `/* kept */`;\n'),
+    ("css", "/* theme */\na { background: url(http://x/y.png); }\n", "a { background: url(http://x/y.png); }\n"),
+    ("bash", 'echo ${#items} $# # count\n# banner\nlabel="#1"\n', 'echo ${#items} $#\n\nlabel="#1"\n'),
+    ("", "# not a comment in plain text   \n", "# not a comment in plain text\n"),
+])
+def test_comments_stripped_by_language(language, source, expected):
+    assert compact_content(source, language, 2) == expected
+
+
+def test_process_file_reports_saved_bytes(tmp_path):
+    path = tmp_path / "main.py"
+    path.write_text(PYTHON_SOURCE, encoding="utf-8")
+    result = process_file(str(path), str(tmp_path), None, True, compaction=2)
+    assert result["compacted_bytes"] == len(PYTHON_SOURCE) - len(result["content"])
+    assert result["compacted_bytes"] > 0
+
+
+def test_notebook_keeps_cell_markers_and_markdown_at_level_two(tmp_path):
+    notebook = {"cells": [
+        {"cell_type": "markdown", "metadata": {}, "source": ["# Title\n", "Some notes   "]},
+        {"cell_type": "code", "metadata": {}, "source": ["x = 1  # one\n", "print(x)"], "outputs": []},
+    ], "metadata": {}, "nbformat": 4, "nbformat_minor": 5}
+    path = tmp_path / "analysis.ipynb"
+    path.write_text(json.dumps(notebook), encoding="utf-8")
+    result = process_file(str(path), str(tmp_path), None, True, compaction=2)
+    assert result["notebook"] is True
+    assert result["content"] == "# %% [markdown]\n# # Title\n# Some notes\n\n# %%\nx = 1  # one\nprint(x)\n"
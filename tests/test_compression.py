@@ -0,0 +1,39 @@
+"""
+Tests for streaming output compression.
+"""
+
+import json
+
+import pytest
+
+from outputs.compression import detect_compression, open_input, open_output, with_compression_suffix
+from outputs.sharding import shard_index_path, shard_path
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".xz", ".bz2"])
+def test_round_trip(tmp_path, suffix):
+    path = str(tmp_path / f"out.json{suffix}")
+    with open_output(path) as f:
+        f.write(b'{"a": ')
+        f.write(b"1}")
+    with open_input(path) as f:
+        assert json.loads(f.read()) == {"a": 1}
+
+
+def test_gzip_output_is_deterministic(tmp_path):
+    outputs = []
+    for name in ("first.md.gz", "second.md.gz"):
+        path = tmp_path / name
+        with open_output(str(path)) as f:
+            f.write(b"same content")
+        outputs.append(path.read_bytes())
+    assert outputs[0] == outputs[1]
+
+
+def test_suffix_helpers():
+    assert detect_compression("project_data.json.xz") == "xz"
+    assert detect_compression("project_data.json") is None
+    assert with_compression_suffix("project_data.json", "gzip") == "project_data.json.gz"
+    assert with_compression_suffix("project_data.json.bz2", "gzip") == "project_data.json.bz2"
+    assert shard_path("project_docs.md.gz", 2) == "project_docs.part-002.md.gz"
+    assert shard_index_path("project_docs.md.gz") == "project_docs.index.json"
@@ -0,0 +1,60 @@
+"""
+Tests for content deduplication.
+"""
+
+import json
+
+from outputs import JSONOutputHandler, SingleFileOutputHandler
+from prompts.generator import generate
+from prompts.options import JSONFormat, Options
+from utils.file_walker import FileEntry
+
+LICENSE = "Permission is hereby granted, free of charge.\n"
+
+
+def _entries(root):
+    entries = []
+    for name, content in (("LICENSE", LICENSE), ("main.py", "print('main')\n"), ("vendor_LICENSE", LICENSE),
+                          ("copy_LICENSE", LICENSE)):
+        path = root / name
+        path.write_text(content, encoding="utf-8")
+        entries.append(FileEntry(str(path), name, name))
+    return entries
+
+
+def test_json_emits_identical_content_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_file = tmp_path / "out.json"
+    generate(_entries(tmp_path), Options(no_mask=True, dedup=True, json_format=JSONFormat.COMPACT),
+             JSONOutputHandler(str(output_file)))
+
+    document = json.loads(output_file.read_text(encoding="utf-8"))
+    files = {record["relative_path"]: record for record in document["files"]}
+    assert files["LICENSE"]["content"] == LICENSE
+    assert "duplicate_of" not in files["LICENSE"]
+    for path in ("vendor_LICENSE", "copy_LICENSE"):
+        assert files[path]["duplicate_of"] == "LICENSE"
+        assert "content" not in files[path]
+    outline = {entry["path"]: entry for entry in document["outline"]}
+    assert outline["copy_LICENSE"]["duplicate_of"] == "LICENSE"
+    assert "duplicate_of" not in outline["main.py"]
+
+
+def test_markdown_emits_identical_content_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_file = tmp_path / "out.md"
+    generate(_entries(tmp_path), Options(no_mask=True, dedup=True), SingleFileOutputHandler(str(output_file)))
+
+    markdown = output_file.read_text(encoding="utf-8")
+    assert markdown.count(LICENSE.strip()) == 1
+    assert markdown.count("Identical to LICENSE") == 2
+
+
+def test_without_dedup_every_copy_is_emitted(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_file = tmp_path / "out.json"
+    generate(_entries(tmp_path), Options(no_mask=True, json_format=JSONFormat.COMPACT),
+             JSONOutputHandler(str(output_file)))
+    files = json.loads(output_file.read_text(encoding="utf-8"))["files"]
+    assert [record["content"] for record in files].count(LICENSE) == 3
+    assert not any("duplicate_of" in record for record in files)
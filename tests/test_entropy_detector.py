@@ -0,0 +1,46 @@
+"""
+Tests for the high-entropy token detector.
+"""
+
+import pytest
+
+from prompts import SensitiveMasker
+from prompts.entropy_detector import EntropyDetector
+
+TOKEN = "x9Fq2LmZ7vR4tW1pK8sD3hJ6QpGM9YcPYBZ5"
+SOURCE = f"""client = Client(token="{TOKEN}")
+commit = "3f2c1a9b8e7d6c5b4a3f2e1d0c9b8a7f6e5d4c3b"
+name = "test_user_1234567890abcdef"
+"""
+
+
+def test_masks_high_entropy_tokens_only():
+    detector = EntropyDetector(backend="python")
+    masked = detector.mask(SOURCE)
+    assert TOKEN not in masked
+    assert f'token="{"*" * len(TOKEN)}"' in masked
+    # Hex digests and identifiers stay below the default threshold
+    assert "3f2c1a9b8e7d6c5b4a3f2e1d0c9b8a7f6e5d4c3b" in masked
+    assert "test_user_1234567890abcdef" in masked
+    assert (detector.scored_tokens, detector.masked_tokens) == (3, 1)
+    assert "masked 1" in detector.report()
+
+
+def test_entropy_values():
+    detector = EntropyDetector(backend="python")
+    assert detector.entropies(["aaaaaaaaaaaaaaaaaaaa", "abcdabcdabcdabcdabcd"]) == [0.0, 2.0]
+
+
+def test_numpy_backend_matches_python():
+    pytest.importorskip("numpy")
+    tokens = [TOKEN, "aaaaaaaaaaaaaaaaaaaa1", "3f2c1a9b8e7d6c5b4a3f2e1d0c9b8a7f6e5d4c3b"] * 1500
+    python_scores = EntropyDetector(backend="python").entropies(tokens)
+    numpy_scores = EntropyDetector(backend="numpy").entropies(tokens)
+    assert numpy_scores == pytest.approx(python_scores)
+
+
+def test_masker_runs_entropy_detector_after_patterns():
+    masker = SensitiveMasker(entropy_threshold=4.5)
+    masked = masker.mask_content(f'api_key = "{TOKEN}"\nbearer = {TOKEN}\n')
+    assert TOKEN not in masked
+    assert masker.entropy_detector.masked_tokens == 1
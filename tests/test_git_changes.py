@@ -0,0 +1,98 @@
+"""
+Tests for working-tree change detection.
+"""
+
+import json
+import os
+import subprocess
+
+import pytest
+
+from outputs import JSONOutputHandler
+from prompts.generator import generate
+from prompts.options import Options
+from utils.file_walker import FileWalker
+from utils.git_changes import changed_files, git_blob_hash, read_index
+from utils.ignore_handler import build_ignores
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", "-c", "user.name=ppg", "-c", "user.email=ppg@example.com", *args],
+        cwd=repo, check=True, stdout=subprocess.PIPE,
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    for name in ("same.py", "edited.py", "staged.py", "removed.py", "touched.py"):
+        (tmp_path / name).write_text(f"# {name}\n")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("x = 1\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "initial")
+    (tmp_path / "edited.py").write_text("# edited\n")
+    (tmp_path / "staged.py").write_text("# staged\n")
+    _git(tmp_path, "add", "staged.py")
+    (tmp_path / "removed.py").unlink()
+    # New stat data with the same content is not a change
+    os.utime(tmp_path / "touched.py", (1, 1))
+    (tmp_path / "new.py").write_text("# new\n")
+    return tmp_path
+
+
+def _changed(repo):
+    files = FileWalker(str(repo), build_ignores(str(repo))).get_files()
+    changed, deleted = changed_files(str(repo), files)
+    return sorted(entry.relative_path for entry in changed), deleted
+
+
+def test_read_index_matches_git(repo):
+    entries = {entry.path: entry.object_id for entry in read_index(str(repo / ".git" / "index"))}
+    listed = _git(repo, "ls-files", "-s", "-z").split(b"\0")
+    expected = {}
+    for record in filter(None, listed):
+        info, path = record.split(b"\t", 1)
+        expected[path.decode()] = info.split()[1].decode()
+    assert entries == expected
+
+
+@pytest.mark.parametrize("index_version", ["2", "3", "4"])
+def test_changed_files(repo, index_version):
+    _git(repo, "update-index", "--index-version", index_version)
+    assert _changed(repo) == (["edited.py", "new.py", "staged.py"], ["removed.py"])
+
+
+def test_changed_files_in_subdirectory(repo):
+    (repo / "pkg" / "mod.py").write_text("x = 2\n")
+    files = FileWalker(str(repo / "pkg")).get_files()
+    changed, deleted = changed_files(str(repo / "pkg"), files)
+    assert [entry.relative_path for entry in changed] == ["mod.py"]
+    assert deleted == []
+
+
+def test_git_blob_hash_matches_git(repo):
+    expected = _git(repo, "hash-object", "edited.py").decode().strip()
+    assert git_blob_hash(str(repo / "edited.py"), os.lstat(repo / "edited.py").st_mode) == expected
+
+
+def test_split_index_falls_back_to_git_status(repo):
+    _git(repo, "update-index", "--split-index")
+    assert _changed(repo) == (["edited.py", "new.py", "staged.py"], ["removed.py"])
+
+
+def test_deleted_files_are_listed_in_outline(repo, tmp_path_factory, monkeypatch):
+    monkeypatch.chdir(repo)
+    files = FileWalker(str(repo), build_ignores(str(repo))).get_files()
+    changed, deleted = changed_files(str(repo), files)
+    output_file = tmp_path_factory.mktemp("out") / "out.json"
+    summary = generate(changed, Options(no_mask=True), JSONOutputHandler(str(output_file)), deleted=deleted)
+    assert "Listed 1 deleted files" in summary
+
+    document = json.loads(output_file.read_text(encoding="utf-8"))
+    assert [file["relative_path"] for file in document["files"]] == ["edited.py", "new.py", "staged.py"]
+    *_, last = document["outline"]
+    assert last["path"] == "removed.py"
+    assert last["deleted"] is True
+    assert "deleted" not in document["outline"][0]
@@ -0,0 +1,58 @@
+"""
+Tests for the git_source module.
+"""
+
+import os
+import subprocess
+
+import pytest
+
+from utils.git_source import GitRevisionError, GitRevisionWalker
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=ppg", "-c", "user.email=ppg@example.com", *args],
+        cwd=repo, check=True, stdout=subprocess.DEVNULL,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "main.py").write_text("print('v1')\n")
+    (tmp_path / "image.bin").write_bytes(b"\x89PNG\0\0data")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("x = 1\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "v1")
+    (tmp_path / "main.py").write_text("print('v2')\n")
+    return tmp_path
+
+
+def test_lists_revision_files(repo):
+    with GitRevisionWalker(str(repo), "HEAD") as walker:
+        paths = [entry.relative_path for entry in walker.get_files()]
+    assert paths == ["image.bin", "main.py", os.path.join("pkg", "mod.py")]
+
+
+def test_reads_committed_content_not_working_tree(repo):
+    with GitRevisionWalker(str(repo), "HEAD") as walker:
+        contents = {entry.relative_path: entry.read_text() for entry in walker.get_files()}
+    assert contents["main.py"] == "print('v1')\n"
+    assert contents[os.path.join("pkg", "mod.py")] == "x = 1\n"
+
+
+def test_binary_blob_is_skipped(repo):
+    with GitRevisionWalker(str(repo), "HEAD") as walker:
+        entries = walker.get_files()
+        binary = [entry for entry in entries if entry.filename == "image.bin"][0]
+        assert binary.read_text() is None
+        # The stream stays in sync after draining a binary blob
+        assert entries[1].read_text() == "print('v1')\n"
+
+
+def test_unknown_revision(repo):
+    with GitRevisionWalker(str(repo), "does-not-exist") as walker:
+        with pytest.raises(GitRevisionError):
+            walker.get_files()
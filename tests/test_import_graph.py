@@ -0,0 +1,66 @@
+"""
+Tests for the import_graph module.
+"""
+
+import os
+
+import pytest
+
+from utils.file_walker import FileWalker
+from utils.import_graph import ImportGraph, module_name, parse_imports
+
+
+@pytest.fixture
+def project(tmp_path):
+    files = {
+        "main.py": "import app.core\nfrom app import helpers\n",
+        "app/__init__.py": "",
+        "app/core.py": "from .models import Model\nimport json\n",
+        "app/models.py": "from . import base\n",
+        "app/base.py": "",
+        "app/helpers.py": "",
+        "app/unused.py": "import app.core\n",
+        "README.md": "docs\n",
+    }
+    for path, content in files.items():
+        full_path = tmp_path / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(content)
+    return tmp_path
+
+
+def test_module_name():
+    assert module_name(os.path.join("prompts", "__init__.py")) == "prompts"
+    assert module_name(os.path.join("prompts", "generator.py")) == "prompts.generator"
+
+
+def test_parse_imports():
+    imports = parse_imports("import os.path\nfrom ..pkg import a, b\n")
+    assert [0, "os.path", []] in imports
+    assert [2, "pkg", ["a", "b"]] in imports
+    assert parse_imports("def broken(:\n") == []
+
+
+def test_closure_follows_local_imports(project, tmp_path):
+    entries = FileWalker(str(project)).get_files()
+    graph = ImportGraph(str(project), entries, cache_dir=str(tmp_path / "cache"))
+    paths = [entry.relative_path for entry in graph.closure("main.py")]
+    assert paths == [os.path.join("app", p) for p in
+                     ("__init__.py", "base.py", "core.py", "helpers.py", "models.py")] + ["main.py"]
+
+
+def test_closure_reuses_cached_imports(project, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    entries = FileWalker(str(project)).get_files()
+    ImportGraph(str(project), entries, cache_dir=cache_dir).closure("main.py")
+
+    graph = ImportGraph(str(project), entries, cache_dir=cache_dir)
+    for entry in entries:
+        entry.read_text = None  # Any parse would have to read the file
+    assert len(graph.closure("main.py")) == 6
+
+
+def test_unknown_entry_point(project):
+    entries = FileWalker(str(project)).get_files()
+    with pytest.raises(ValueError):
+        ImportGraph(str(project), entries, cache_dir=None).closure("README.md")
@@ -0,0 +1,61 @@
+"""
+Tests for memory-budgeted generation with spill-to-disk.
+"""
+
+import pytest
+
+from outputs import JSONOutputHandler, SingleFileOutputHandler, TreeJSONOutputHandler
+from prompts.generator import generate
+from prompts.options import JSONFormat, Options
+from utils.file_walker import FileEntry
+from utils.memory_budget import MemoryBudget, SpillableList, parse_size
+
+
+def test_spillable_list_keeps_order_and_indexes():
+    budget = MemoryBudget(200)
+    items = SpillableList(budget)
+    for i in range(20):
+        items.append({"n": i, "text": "x" * i})
+    assert budget.spilled > 0
+    assert budget.retained <= 200
+    assert [item["n"] for item in items] == list(range(20))
+    assert items[3]["text"] == "xxx"
+    assert items[-1]["n"] == 19
+    assert len(items) == 20
+
+
+def test_parse_size():
+    assert parse_size("512M") == 512 * 1024 * 1024
+    assert parse_size("2g") == 2 * 1024 ** 3
+    assert parse_size("1.5KB") == 1536
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+@pytest.mark.parametrize("make_handler", [
+    lambda path: SingleFileOutputHandler(path),
+    lambda path: SingleFileOutputHandler(path, max_tokens=40, sidecar_index=True),
+    lambda path: JSONOutputHandler(path, JSONFormat.SPLIT, sidecar_index=True),
+    lambda path: JSONOutputHandler(path, JSONFormat.COMPACT, max_tokens=40),
+    lambda path: TreeJSONOutputHandler(path),
+    lambda path: TreeJSONOutputHandler(path, json_format=JSONFormat.PATH_TABLE),
+])
+def test_spilled_output_is_unchanged(tmp_path, monkeypatch, make_handler):
+    monkeypatch.chdir(tmp_path)
+    project = tmp_path / "project"
+    (project / "pkg").mkdir(parents=True)
+    entries = []
+    for i in range(8):
+        relative_path = f"pkg/mod{i}.py" if i % 2 else f"mod{i}.py"
+        path = project / relative_path
+        path.write_text("".join(f"line_{n} = {i}\n" for n in range(i * 3)), encoding="utf-8")
+        entries.append(FileEntry(str(path), relative_path, path.name))
+
+    outputs = []
+    for name, max_memory in (("memory", None), ("spilled", 1)):
+        output_dir = tmp_path / name
+        output_dir.mkdir()
+        generate(entries, Options(no_mask=True, max_memory=max_memory, batch_size=3),
+                 make_handler(str(output_dir / "out.txt")))
+        outputs.append(sorted((path.name, path.read_bytes()) for path in output_dir.iterdir()))
+    assert outputs[0] == outputs[1]
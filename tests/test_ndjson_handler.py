@@ -0,0 +1,66 @@
+"""
+Tests for JSON Lines output.
+"""
+
+import json
+
+from outputs import NDJSONOutputHandler
+from outputs.events import (EndEvent, FileBatchProcessedEvent, FileProcessedEvent, OutlineCreatedEvent,
+                            OutlineEntry, StartEvent)
+from prompts.options import JSONFormat
+
+
+def _file_event(i):
+    return FileProcessedEvent(filename=f"{i:03d}_mod{i}.py.md", relative_path=f"mod{i}.py", content=f"value = {i}\n")
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_records_are_readable_during_the_run(tmp_path):
+    path = tmp_path / "out.ndjson"
+    handler = NDJSONOutputHandler(str(path))
+    handler.fire_event(StartEvent(message="start"))
+    handler.fire_event(FileBatchProcessedEvent(events=[_file_event(1), _file_event(2)]))
+    assert [record["relative_path"] for record in _records(path)] == ["mod1.py", "mod2.py"]
+
+    handler.fire_event(FileProcessedEvent(filename="003_mod3.py.md", relative_path="mod3.py", content="x = 3\n"))
+    assert len(_records(path)) == 3
+    assert not [name for name in tmp_path.iterdir() if name.name.startswith(".")]
+    handler.fire_event(EndEvent(message="end"))
+
+
+def test_one_record_per_file_between_start_and_outline(tmp_path):
+    path = tmp_path / "out.ndjson"
+    handler = NDJSONOutputHandler(str(path), JSONFormat.COMPACT)
+    handler.fire_event(StartEvent(message="start"))
+    assert path.read_bytes() == b""
+
+    handler.fire_event(FileProcessedEvent(filename="001_a.py.md", relative_path="a.py", content="a = 1\n"))
+    handler.fire_event(FileProcessedEvent(filename="002_b.py.md", relative_path="b.py", content="",
+                                          duplicate_of="a.py"))
+    entries = [OutlineEntry(seq=1, original="a.py", md_filename="001_a.py.md", rel_path="a.py", size=6, hash="h"),
+               OutlineEntry(seq=2, original="b.py", md_filename="002_b.py.md", rel_path="b.py", size=6, hash="h",
+                            duplicate_of="a.py")]
+    handler.fire_event(OutlineCreatedEvent(entries=entries))
+    handler.fire_event(EndEvent(message="end"))
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record["type"] for record in records] == ["file", "file", "outline"]
+    assert records[0] == {"type": "file", "filename": "001_a.py.md", "relative_path": "a.py", "extension": ".md",
+                          "language": "", "content": "a = 1\n"}
+    assert records[1]["duplicate_of"] == "a.py" and "content" not in records[1]
+    assert records[2]["file_count"] == 2
+    assert [entry["path"] for entry in records[2]["outline"]] == ["a.py", "b.py"]
+
+
+def test_split_format_writes_content_lines(tmp_path):
+    path = tmp_path / "out.ndjson"
+    handler = NDJSONOutputHandler(str(path))
+    handler.fire_event(StartEvent(message="start"))
+    handler.fire_event(FileProcessedEvent(filename="001_a.py.md", relative_path="a.py", content="x = 1\ny = 2\n"))
+    handler.fire_event(EndEvent(message="end"))
+    (record,) = _records(path)
+    assert record["content_lines"] == [{"line_number": 1, "content": "x = 1"}, {"line_number": 2, "content": "y = 2"}]
@@ -0,0 +1,82 @@
+"""
+Tests for rendering Jupyter notebooks.
+"""
+
+import json
+
+from prompts import process_file
+from prompts.notebook import render_notebook
+
+IMAGE = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk" * 200
+
+NOTEBOOK = {
+    "cells": [
+        {"cell_type": "markdown", "metadata": {}, "source": ["# Analysis\n", "\n", "![plot](attachment:plot.png)"],
+         "attachments": {"plot.png": {"image/png": IMAGE}}},
+        {"cell_type": "code", "metadata": {}, "execution_count": 1, "source": ["import math\n", "print(math.pi)"],
+         "outputs": [
+             {"output_type": "stream", "name": "stdout", "text": ["3.141592653589793\n"]},
+             {"output_type": "display_data", "metadata": {},
+              "data": {"image/png": IMAGE, "text/plain": ["<Figure size 640x480>"]}},
+         ]},
+        {"cell_type": "code", "metadata": {}, "execution_count": None, "source": "", "outputs": []},
+    ],
+    "metadata": {"kernelspec": {"name": "python3", "language": "python"}},
+    "nbformat": 4,
+    "nbformat_minor": 5,
+}
+
+
+def test_render_drops_outputs_and_attachments():
+    rendered = render_notebook(json.dumps(NOTEBOOK))
+    assert rendered == (
+        "# %% [markdown]\n"
+        "# # Analysis\n"
+        "#\n"
+        "# ![plot](attachment:plot.png)\n"
+        "\n"
+        "# %%\n"
+        "import math\n"
+        "print(math.pi)\n"
+        "\n"
+        "# %%\n"
+    )
+
+
+def test_render_keeps_truncated_text_outputs():
+    rendered = render_notebook(json.dumps(NOTEBOOK), output_limit=8)
+    assert "# Output:\n# 3.141592\n# ... (31 more characters)\n# [image/png output omitted]\n" in rendered
+    assert IMAGE not in rendered
+
+
+def test_render_rejects_other_json():
+    assert render_notebook('{"name": "not a notebook"}') is None
+    assert render_notebook("not json") is None
+    assert render_notebook('{"cells": [1]}') is None
+
+
+def test_render_skips_outputs_without_decoding_them():
+    text = json.dumps(NOTEBOOK, indent=1)
+    assert render_notebook(text) == render_notebook(json.dumps(NOTEBOOK))
+    # Brackets and escaped quotes inside skipped strings do not end the skipped value
+    tricky = {"cells": [{"cell_type": "code", "source": "x", "metadata": {"tag": "]}\\\""},
+                         "outputs": [{"output_type": "stream", "text": "[\"{"}]}]}
+    assert render_notebook(json.dumps(tricky)) == "# %%\nx\n"
+
+
+def test_process_file_keeps_invalid_notebook_raw(tmp_path):
+    path = tmp_path / "broken.ipynb"
+    content = '{"cells": [{"cell_type": "code", "source": "x = 1"}, {"cell_type": "code", "outputs": [}]}'
+    path.write_text(content, encoding="utf-8")
+    result = process_file(str(path), str(tmp_path), None, True)
+    assert result["notebook"] is False
+    assert result["content"] == content
+
+
+def test_process_file_renders_notebook(tmp_path):
+    path = tmp_path / "analysis.ipynb"
+    path.write_text(json.dumps(NOTEBOOK), encoding="utf-8")
+    result = process_file(str(path), str(tmp_path), None, True)
+    assert result["notebook"] is True
+    assert result["content"].startswith("# %% [markdown]\n")
+    assert len(result["content"]) * 10 < path.stat().st_size
@@ -0,0 +1,43 @@
+"""
+Tests for structured outline entries.
+"""
+
+import json
+
+from outputs import JSONOutputHandler
+from outputs.events import EndEvent, OutlineCreatedEvent, OutlineEntry
+from prompts.file_processor import create_outline
+
+# A path containing the separators of the rendered outline text
+TRICKY_PATH = "docs/a (original: b, path: c).md"
+
+
+def test_json_outline_keeps_paths_intact(tmp_path):
+    output_file = tmp_path / "out.json"
+    handler = JSONOutputHandler(str(output_file))
+    handler.fire_event(OutlineCreatedEvent(entries=[
+        OutlineEntry(1, "a (original: b, path: c).md", "001_x.md", TRICKY_PATH, 3, "0" * 64, tokens=2,
+                     duplicate_of="docs/first.md"),
+    ]))
+    handler.fire_event(EndEvent(message="end"))
+
+    assert json.loads(output_file.read_text(encoding="utf-8"))["outline"] == [{
+        "markdown_filename": "001_x.md",
+        "original_filename": "a (original: b, path: c).md",
+        "path": TRICKY_PATH,
+        "tokens": 2,
+        "duplicate_of": "docs/first.md",
+    }]
+
+
+def test_create_outline_renders_entries():
+    outline = create_outline([
+        OutlineEntry(1, "main.py", "001_main.py.md", "main.py", 10, "0" * 64, tokens=3),
+        OutlineEntry(2, "copy.py", "002_copy.py.md", "copy.py", 10, "0" * 64, tokens=0, duplicate_of="main.py"),
+        OutlineEntry(3, "old.py", "", "old.py", 0, "", deleted=True),
+    ])
+    assert outline.splitlines()[2:] == [
+        "- 001_main.py.md (original: main.py, path: main.py, tokens: 3)",
+        "- 002_copy.py.md (original: copy.py, path: copy.py, duplicate of: main.py, tokens: 0)",
+        "- old.py (deleted)",
+    ]
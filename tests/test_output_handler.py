@@ -0,0 +1,48 @@
+"""
+Tests for event dispatch in the output handler base class.
+"""
+
+from outputs import NDJSONOutputHandler, OutputHandler, SidecarIndex
+from outputs.events import (EndEvent, FileBatchProcessedEvent, FileProcessedEvent, OutlineCreatedEvent,
+                            StartEvent)
+
+
+class RecordingHandler(OutputHandler):
+    def __init__(self):
+        super().__init__()
+        self.seen = []
+        self.on(FileProcessedEvent, lambda event: self.seen.append(("file", event.relative_path)))
+        self.on("EndEvent", lambda event: self.seen.append(("end", event.message)))
+
+
+def _file_events(*paths):
+    return [FileProcessedEvent(filename=f"{path}.md", relative_path=path, content=f"# {path}\n") for path in paths]
+
+
+def test_batch_fans_out_to_file_handlers():
+    handler = RecordingHandler()
+    handler.fire_event(FileBatchProcessedEvent(events=_file_events("a.py", "b.py")))
+    handler.fire_event(StartEvent(message="ignored"))
+    handler.fire_event(EndEvent(message="done"))
+    assert handler.seen == [("file", "a.py"), ("file", "b.py"), ("end", "done")]
+
+
+def test_ndjson_batch_matches_single_events(tmp_path):
+    outputs = []
+    for name, batched in (("single.ndjson", False), ("batched.ndjson", True)):
+        output_file = str(tmp_path / name)
+        handler = NDJSONOutputHandler(output_file, sidecar_index=True)
+        handler.fire_event(StartEvent(message="start"))
+        events = _file_events("a.py", "pkg/b.py", "c.md")
+        if batched:
+            handler.fire_event(FileBatchProcessedEvent(events=events[:2]))
+            handler.fire_event(FileBatchProcessedEvent(events=events[2:]))
+        else:
+            for event in events:
+                handler.fire_event(event)
+        handler.fire_event(OutlineCreatedEvent(entries=[]))
+        handler.fire_event(EndEvent(message="end"))
+        outputs.append((tmp_path / name).read_bytes())
+        with SidecarIndex(output_file) as index:
+            assert index.read_record("pkg/b.py", verify=True)["relative_path"] == "pkg/b.py"
+    assert outputs[0] == outputs[1]
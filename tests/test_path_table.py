@@ -0,0 +1,48 @@
+"""
+Tests for the flat path table variant of the tree JSON output.
+"""
+
+import json
+
+import pytest
+
+from outputs import SidecarIndex, TreeJSONOutputHandler, path_table_to_tree
+from outputs.events import EndEvent, FileProcessedEvent
+from prompts.options import JSONFormat
+
+FILES = [
+    ("a/b/c.py", "x = 1\n", None),
+    ("a/d.py", "y = 2\n", None),
+    ("a/b/e.txt", "", "a/d.py"),
+    ("z.md", "# Title\n", None),
+]
+
+
+def _run(output_file, json_format, **kwargs):
+    handler = TreeJSONOutputHandler(str(output_file), json_format=json_format, **kwargs)
+    for relative_path, content, duplicate_of in FILES:
+        handler.fire_event(FileProcessedEvent(filename="x.md", relative_path=relative_path, content=content,
+                                              duplicate_of=duplicate_of))
+    handler.fire_event(EndEvent(message="end"))
+    return json.loads(output_file.read_text(encoding="utf-8"))
+
+
+def test_directories_are_interned(tmp_path):
+    document = _run(tmp_path / "table.json", JSONFormat.PATH_TABLE)
+    assert document["directories"]["rows"] == [[0, "root", None], [1, "a", 0], [2, "b", 1]]
+    assert [row[2] for row in document["files"]["rows"]] == [2, 1, 2, 0]
+    assert document["contents"][3] == ["# Title"]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_rebuilds_nested_tree(tmp_path, compact):
+    tree = _run(tmp_path / "tree.json", JSONFormat.TREE)
+    table = _run(tmp_path / "table.json", JSONFormat.PATH_TABLE, compact=compact)
+    assert path_table_to_tree(table) == tree
+
+
+def test_sidecar_indexes_contents(tmp_path):
+    output_file = tmp_path / "table.json"
+    _run(output_file, JSONFormat.PATH_TABLE, sidecar_index=True)
+    with SidecarIndex(str(output_file)) as index:
+        assert index.read_record("a/d.py", verify=True) == ["y = 2"]
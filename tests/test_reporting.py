@@ -0,0 +1,87 @@
+"""
+Tests for logging configuration and progress reporting.
+"""
+
+import io
+import json
+import logging
+
+import pytest
+
+from outputs import JSONOutputHandler
+from prompts.generator import generate
+from prompts.options import Options
+from utils import reporting
+from utils.file_walker import FileEntry
+
+
+@pytest.fixture
+def stream():
+    stream = io.StringIO()
+    yield stream
+    logger = logging.getLogger(reporting.LOGGER_NAME)
+    logger.removeHandler(reporting._console)
+    logger.setLevel(logging.NOTSET)
+    reporting._console = None
+
+
+def _events(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_format_includes_fields(stream):
+    reporting.configure_logging(log_format="json", stream=stream)
+    reporting.get_logger("test").info("Hello", extra={"fields": {"files": 3}})
+    (event,) = _events(stream)
+    assert event["level"] == "info"
+    assert event["logger"] == "ppg.test"
+    assert event["message"] == "Hello"
+    assert event["files"] == 3
+
+
+def test_verbosity_levels(stream):
+    log = reporting.get_logger("test")
+    reporting.configure_logging(verbosity=-1, log_format="text", stream=stream)
+    log.info("summary")
+    log.warning("careful")
+    assert stream.getvalue() == "Warning: careful\n"
+
+    reporting.configure_logging(verbosity=1, log_format="text", stream=stream)
+    log.debug("per file")
+    assert stream.getvalue().endswith("per file\n")
+
+
+def test_progress_events_are_rate_limited(stream, monkeypatch):
+    reporting.configure_logging(log_format="json", stream=stream)
+    progress = reporting.ProgressReporter(total=4)
+    for _ in range(4):
+        progress.update(1, 1024)
+    progress.finish()
+    (event,) = _events(stream)
+    assert event["event"] == "progress_done"
+    assert (event["files"], event["total"], event["bytes"]) == (4, 4, 4096)
+
+    stream.truncate(0)
+    stream.seek(0)
+    monkeypatch.setattr(reporting, "EVENT_INTERVAL", 0)
+    progress = reporting.ProgressReporter()
+    progress.update(2, 10)
+    assert [event["event"] for event in _events(stream)] == ["progress"]
+    assert "total" not in _events(stream)[0]
+
+
+def test_generate_logs_files_at_debug_only(tmp_path, monkeypatch, stream):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "mod.py"
+    path.write_text("value = 1\n", encoding="utf-8")
+    entries = [FileEntry(str(path), path.name, path.name)]
+
+    reporting.configure_logging(log_format="text", stream=stream)
+    generate(entries, Options(no_mask=True), JSONOutputHandler(str(tmp_path / "out.json")))
+    assert "Processed mod.py" not in stream.getvalue()
+    assert "JSON output written to" in stream.getvalue()
+    assert "Progress: 1/1 files (100%)" in stream.getvalue()
+
+    reporting.configure_logging(verbosity=1, log_format="text", stream=stream)
+    generate(entries, Options(no_mask=True), JSONOutputHandler(str(tmp_path / "out.json")))
+    assert "Processed mod.py" in stream.getvalue()
@@ -0,0 +1,100 @@
+"""
+Tests for last-run script discovery.
+"""
+
+import os
+import subprocess
+import sys
+
+from utils.script_finder import ScriptIndex, find_recent_scripts
+
+
+def _touch(path, mtime):
+    path.write_text("echo hi\n")
+    os.utime(path, (mtime, mtime))
+
+
+def _make_dirs(tmp_path):
+    downloads, scratch = tmp_path / "Downloads", tmp_path / "scratch"
+    downloads.mkdir()
+    scratch.mkdir()
+    _touch(downloads / "old.sh", 1000)
+    _touch(downloads / "new.py", 3000)
+    _touch(downloads / "notes.txt", 4000)
+    _touch(scratch / "mid.rb", 2000)
+    # Directory mtimes well before the scan, outside the racy window
+    os.utime(downloads, (100, 100))
+    os.utime(scratch, (100, 100))
+    return downloads, scratch
+
+
+def test_finds_scripts_in_all_directories_newest_first(tmp_path):
+    downloads, scratch = _make_dirs(tmp_path)
+    scripts = find_recent_scripts([str(downloads), str(scratch)], [".sh", ".py", ".rb"])
+    assert [(script.name, script.mtime) for script in scripts] == [("new.py", 3000), ("mid.rb", 2000),
+                                                                   ("old.sh", 1000)]
+
+
+def test_missing_directory_is_skipped(tmp_path):
+    downloads, _ = _make_dirs(tmp_path)
+    scripts = find_recent_scripts([str(tmp_path / "missing"), str(downloads)], [".sh"])
+    assert [script.name for script in scripts] == ["old.sh"]
+
+
+def test_index_skips_listing_unchanged_directories(tmp_path, monkeypatch):
+    downloads, _ = _make_dirs(tmp_path)
+    index_path = str(tmp_path / "index.json")
+    find_recent_scripts([str(downloads)], [".sh", ".py"], ScriptIndex(index_path))
+
+    # An in-place edit keeps the directory mtime; indexed scripts are re-stat'ed without listing
+    _touch(downloads / "old.sh", 5000)
+    os.utime(downloads, (100, 100))
+    monkeypatch.setattr(os, "scandir", None)
+    scripts = find_recent_scripts([str(downloads)], [".sh", ".py"], ScriptIndex(index_path))
+    assert [(script.name, script.mtime) for script in scripts] == [("old.sh", 5000), ("new.py", 3000)]
+
+
+def test_index_rescans_changed_directories(tmp_path):
+    downloads, _ = _make_dirs(tmp_path)
+    index_path = str(tmp_path / "index.json")
+    find_recent_scripts([str(downloads)], [".sh", ".py"], ScriptIndex(index_path))
+
+    _touch(downloads / "added.sh", 6000)
+    os.utime(downloads, (200, 200))
+    scripts = find_recent_scripts([str(downloads)], [".sh", ".py"], ScriptIndex(index_path))
+    assert [script.name for script in scripts] == ["added.sh", "new.py", "old.sh"]
+
+
+def test_index_finds_older_script_edited_in_place(tmp_path):
+    downloads, _ = _make_dirs(tmp_path)
+    for i in range(60):
+        _touch(downloads / f"bulk{i}.sh", 10000 + i)
+    os.utime(downloads, (100, 100))
+    index_path = str(tmp_path / "index.json")
+    find_recent_scripts([str(downloads)], [".sh", ".py"], ScriptIndex(index_path))
+
+    _touch(downloads / "old.sh", 20000)
+    os.utime(downloads, (100, 100))
+    scripts = find_recent_scripts([str(downloads)], [".sh", ".py"], ScriptIndex(index_path))
+    assert (scripts[0].name, scripts[0].mtime) == ("old.sh", 20000)
+    assert len(scripts) == 62
+
+
+def test_does_not_import_output_packages():
+    code = (
+        "import sys, utils.script_finder; "
+        "print(sorted(m for m in sys.modules if m.split('.')[0] in ('outputs', 'prompts')))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, check=True, stdout=subprocess.PIPE, text=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_index_save_leaves_no_temp_files(tmp_path):
+    downloads, _ = _make_dirs(tmp_path)
+    index_path = tmp_path / "index" / "scripts.json"
+    index = ScriptIndex(str(index_path))
+    find_recent_scripts([str(downloads)], index=index)
+    index.save()
+    assert os.listdir(index_path.parent) == ["scripts.json"]
+    assert ScriptIndex(str(index_path)).directories
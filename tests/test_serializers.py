@@ -0,0 +1,60 @@
+"""
+Tests for the JSON serializer backends.
+"""
+
+import io
+import json
+
+import pytest
+
+from outputs import TreeJSONOutputHandler
+from outputs.events import EndEvent, FileProcessedEvent
+from outputs.json_writer import write_document
+from outputs.serializers import BACKENDS, JSONSerializer, orjson
+from outputs.sidecar_index import CountingWriter
+
+DOCUMENT = {
+    "outline": [{"markdown_filename": "001_a.py.md", "tokens": 12}],
+    "files": [
+        {"relative_path": "a.py", "content": "print('héllo')\n\t\"quoted\" \\  ", "lines": [1, 2.5, None, True]},
+        {"relative_path": "b/c.py", "content_lines": [], "meta": {}},
+    ],
+    "empty": [],
+}
+
+INSTALLED_BACKENDS = [backend for backend in BACKENDS if backend != "orjson" or orjson is not None]
+
+
+def _stream(document, serializer):
+    buffer = io.BytesIO()
+    write_document(CountingWriter(buffer), document, "files", serializer=serializer)
+    return buffer.getvalue().decode("utf-8")
+
+
+@pytest.mark.parametrize("backend", INSTALLED_BACKENDS)
+def test_pretty_matches_stdlib_indent(backend):
+    expected = json.dumps(DOCUMENT, indent=2, ensure_ascii=False)
+    assert _stream(DOCUMENT, JSONSerializer(pretty=True, backend=backend)) == expected
+
+
+@pytest.mark.parametrize("backend", INSTALLED_BACKENDS)
+def test_compact_matches_stdlib_separators(backend):
+    expected = json.dumps(DOCUMENT, separators=(",", ":"), ensure_ascii=False)
+    assert _stream(DOCUMENT, JSONSerializer(pretty=False, backend=backend)) == expected
+
+
+@pytest.mark.parametrize("backend", INSTALLED_BACKENDS)
+def test_large_integers_fall_back_to_stdlib(backend):
+    assert JSONSerializer(pretty=False, backend=backend).dumps({"n": 2 ** 70}) == b'{"n":1180591620717411303424}'
+
+
+def test_compact_tree_output(tmp_path):
+    output_file = tmp_path / "tree.json"
+    handler = TreeJSONOutputHandler(str(output_file), compact=True)
+    handler.fire_event(FileProcessedEvent(filename="001_c.py.md", relative_path="b/c.py", content="x = 1\n"))
+    handler.fire_event(EndEvent(message="end"))
+
+    text = output_file.read_text(encoding="utf-8")
+    assert "\n" not in text
+    tree = json.loads(text)
+    assert tree["children"][0]["children"][0]["content"] == ["x = 1"]
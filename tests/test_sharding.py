@@ -0,0 +1,42 @@
+"""
+Tests for token estimation and output sharding.
+"""
+
+from outputs.sharding import plan_shards, shard_index_path, shard_path, split_content
+from utils.token_estimator import estimate_tokens, language_for_path
+
+
+def test_estimate_tokens_uses_language_ratio():
+    content = "x" * 400
+    assert estimate_tokens(content) == 100
+    assert estimate_tokens(content, "json") > estimate_tokens(content, "python") > estimate_tokens(content)
+    assert estimate_tokens("") == 0
+
+
+def test_language_for_path():
+    assert language_for_path("cli/ppg.py") == "python"
+    assert language_for_path("Makefile") == ""
+
+
+def test_shard_paths():
+    assert shard_path("out/project_docs.md", 1) == "out/project_docs.part-001.md"
+    assert shard_index_path("out/project_docs.md") == "out/project_docs.index.json"
+
+
+def test_plan_shards_keeps_items_whole():
+    assert plan_shards([40, 40, 40, 150, 10], 100) == [[0, 1], [2], [3], [4]]
+
+
+def test_split_content_on_line_boundaries():
+    content = "".join(f"line {i:04d}\n" for i in range(100))
+    pieces = split_content(content, 50)
+    assert "".join(pieces) == content
+    assert all(piece.endswith("\n") for piece in pieces)
+    assert all(estimate_tokens(piece) <= 50 for piece in pieces)
+
+
+def test_split_content_cuts_oversized_line():
+    content = "y" * 1000
+    pieces = split_content(content, 10)
+    assert "".join(pieces) == content
+    assert all(estimate_tokens(piece) <= 10 for piece in pieces)
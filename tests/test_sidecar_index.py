@@ -0,0 +1,73 @@
+"""
+Tests for sidecar byte-offset indexes.
+"""
+
+import json
+
+import pytest
+
+from outputs import JSONOutputHandler, NDJSONOutputHandler, SidecarIndex, SingleFileOutputHandler, TreeJSONOutputHandler
+from outputs.events import EndEvent, FileProcessedEvent, OutlineCreatedEvent, OutlineEntry, StartEvent
+from prompts.options import JSONFormat
+
+FILES = [
+    ("001_main.py.md", "main.py", "print('héllo')\n"),
+    ("002_pkg_mod.py.md", "pkg/mod.py", "x = 1\ny = 2\n"),
+]
+
+
+def _run(handler):
+    handler.fire_event(StartEvent(message="start"))
+    for filename, relative_path, content in FILES:
+        handler.fire_event(FileProcessedEvent(filename=filename, relative_path=relative_path, content=content))
+    handler.fire_event(OutlineCreatedEvent(entries=[
+        OutlineEntry(i, rel.split("/")[-1], name, rel, len(content.encode("utf-8")), "", tokens=1)
+        for i, (name, rel, content) in enumerate(FILES, start=1)
+    ]))
+    handler.fire_event(EndEvent(message="end"))
+
+
+@pytest.mark.parametrize("make_handler", [
+    lambda path: JSONOutputHandler(path, JSONFormat.COMPACT, sidecar_index=True),
+    lambda path: NDJSONOutputHandler(path, JSONFormat.COMPACT, sidecar_index=True),
+])
+def test_json_records_by_offset(tmp_path, make_handler):
+    output_file = str(tmp_path / "out.json")
+    _run(make_handler(output_file))
+
+    with SidecarIndex(output_file) as index:
+        assert index.paths() == ["main.py", "pkg/mod.py"]
+        record = index.read_record("pkg/mod.py", verify=True)
+    assert record["relative_path"] == "pkg/mod.py"
+    assert record["content"] == "x = 1\ny = 2\n"
+
+
+def test_json_output_is_unchanged_by_index(tmp_path):
+    output_file = str(tmp_path / "out.json")
+    _run(JSONOutputHandler(output_file, JSONFormat.SPLIT, sidecar_index=True))
+    with open(output_file, encoding="utf-8") as f:
+        raw = f.read()
+    assert raw == json.dumps(json.loads(raw), indent=2, ensure_ascii=False)
+
+
+def test_tree_nodes_by_offset(tmp_path):
+    output_file = str(tmp_path / "tree.json")
+    _run(TreeJSONOutputHandler(output_file, sidecar_index=True))
+
+    with SidecarIndex(output_file) as index:
+        node = index.read_record("pkg/mod.py", verify=True)
+    assert node["name"] == "mod.py"
+    assert node["content"] == ["x = 1", "y = 2"]
+
+
+def test_markdown_sections_by_offset(tmp_path):
+    output_file = str(tmp_path / "docs.md")
+    _run(SingleFileOutputHandler(output_file, sidecar_index=True))
+
+    with SidecarIndex(output_file) as index:
+        section = index.read_text("main.py", verify=True)
+        with pytest.raises(ValueError):
+            index.read_record("main.py")
+    assert section.startswith("---\n## file description")
+    assert "print('héllo')" in section
+    assert "x = 1" not in section
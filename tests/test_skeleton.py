@@ -0,0 +1,77 @@
+"""
+Tests for the skeleton module.
+"""
+
+import pytest
+
+from prompts.file_processor import process_file
+from prompts.skeleton import extract_skeleton
+
+PYTHON_SOURCE = '''import os
+
+
+class Walker:
+    """Walks things."""
+
+    limit = 3
+
+    def walk(self, root):
+        """Walk the root."""
+        for name in os.listdir(root):
+            yield name
+
+    def noop(self): pass
+
+
+def main(
+    argv,
+):
+    print(argv)
+    return 0
+'''
+
+
+def test_python_skeleton_keeps_signatures_and_docstrings():
+    skeleton = extract_skeleton(PYTHON_SOURCE, "python")
+    assert "import os" in skeleton
+    assert '"""Walks things."""' in skeleton
+    assert "limit = 3" in skeleton
+    assert "    def walk(self, root):" in skeleton
+    assert '"""Walk the root."""' in skeleton
+    assert "def noop(self): pass" in skeleton
+    assert "def main(\n    argv,\n):" in skeleton
+    assert "os.listdir" not in skeleton
+    assert "print(argv)" not in skeleton
+    assert skeleton.count("body elided") == 2
+
+
+@pytest.mark.parametrize("separator_line", ["\x0c", 's = "a\u2028b"', 'label = "x\x1cy"'])
+def test_python_skeleton_line_separators_keep_ranges_aligned(separator_line):
+    source = f'import os\n{separator_line}\ndef f():\n    """Doc."""\n    a = 1\n    return a\n'
+    assert extract_skeleton(source, "python") == (
+        f'import os\n{separator_line}\ndef f():\n    """Doc."""\n    ...  # body elided\n'
+    )
+
+
+def test_brace_skeleton_elides_function_bodies():
+    source = "int add(int a, int b) {\n    if (a) {\n        return a + b;\n    }\n    return b;\n}\nint x = 1;\n"
+    skeleton = extract_skeleton(source, "c")
+    assert skeleton == "int add(int a, int b) {\n    // ... body elided\n}\nint x = 1;"
+
+
+def test_unsupported_language_or_invalid_source():
+    assert extract_skeleton("body { color: red; }", "css") is None
+    assert extract_skeleton("def broken(:\n", "python") is None
+
+
+def test_process_file_applies_threshold(tmp_path):
+    source = tmp_path / "walker.py"
+    source.write_text(PYTHON_SOURCE)
+
+    small = process_file(str(source), str(tmp_path), None, True, skeleton_threshold=len(PYTHON_SOURCE))
+    assert small["content"] == PYTHON_SOURCE
+    assert small["skeleton"] is False
+
+    large = process_file(str(source), str(tmp_path), None, True, skeleton_threshold=100)
+    assert "body elided" in large["content"]
+    assert large["skeleton"] is True
@@ -0,0 +1,44 @@
+"""
+Tests for the in-process snapshot API.
+"""
+
+from prompts import FileRecord, snapshot
+from prompts.options import GeneratedAction, Options
+
+
+def _make_project(path):
+    (path / ".git").mkdir()
+    (path / "pkg").mkdir()
+    (path / "pkg" / "config.py").write_text('api_key = "abc123"\nDEBUG = True\n', encoding="utf-8")
+    (path / "pkg" / "copy.py").write_text('api_key = "abc123"\nDEBUG = True\n', encoding="utf-8")
+    (path / "yarn.lock").write_text("lodash@4:\n  version 4\n", encoding="utf-8")
+    (path / ".gitignore").write_text("build/\n", encoding="utf-8")
+    (path / "build").mkdir()
+    (path / "build" / "out.py").write_text("x = 1\n", encoding="utf-8")
+
+
+def test_snapshot_yields_masked_records(tmp_path, capsys):
+    _make_project(tmp_path)
+    result = snapshot(str(tmp_path), Options(dedup=True, generated=GeneratedAction.STUB))
+    records = {record.path: record for record in result}
+
+    assert sorted(records) == [".gitignore", "pkg/config.py", "pkg/copy.py", "yarn.lock"]
+    config = records["pkg/config.py"]
+    assert isinstance(config, FileRecord)
+    assert config.language == "python"
+    assert "abc123" not in config.content
+    assert config.lines == config.content.splitlines()
+    assert records["pkg/copy.py"].outline.duplicate_of == "pkg/config.py"
+    assert records["yarn.lock"].content.startswith("[lockfile content omitted")
+    assert [entry.rel_path for entry in result.outline] == [record.path for record in records.values()]
+    assert capsys.readouterr() == ("", "")
+    assert not list(tmp_path.glob("project_data*"))
+
+
+def test_snapshot_reuses_ignore_and_mask_state(tmp_path):
+    _make_project(tmp_path)
+    first = snapshot(str(tmp_path))
+    first_contents = [record.content for record in first]
+    second = snapshot(str(tmp_path), ignore_spec=first.ignore_spec, masker=first.masker)
+    assert second.masker is first.masker
+    assert [record.content for record in second] == first_contents
@@ -0,0 +1,72 @@
+"""
+Tests for the SQLite output handler and snapshot queries.
+"""
+
+import sqlite3
+
+from outputs.events import EndEvent, FileProcessedEvent, OutlineCreatedEvent, OutlineEntry, StartEvent
+from outputs.sqlite_handler import SQLiteOutputHandler, query_snapshot
+
+
+def _write_snapshot(database_file):
+    handler = SQLiteOutputHandler(str(database_file), batch_size=1)
+    handler.fire_event(StartEvent(message="start"))
+    files = [
+        ("001_app_main.py.md", "app/main.py", "import os\n\ndef main():\n    run_server()\n"),
+        ("002_README.md.md", "README.md", "# Demo\nCall run_server to start.\n"),
+    ]
+    for filename, relative_path, content in files:
+        handler.fire_event(FileProcessedEvent(filename=filename, relative_path=relative_path, content=content))
+    handler.fire_event(OutlineCreatedEvent(entries=[
+        OutlineEntry(1, "main.py", "001_app_main.py.md", "app/main.py", 41, "a" * 64, tokens=10),
+        OutlineEntry(2, "README.md", "002_README.md.md", "README.md", 32, "b" * 64, tokens=8),
+    ]))
+    handler.fire_event(EndEvent(message="end"))
+
+
+def test_snapshot_tables(tmp_path):
+    database_file = tmp_path / "snapshot.sqlite"
+    _write_snapshot(database_file)
+
+    connection = sqlite3.connect(str(database_file))
+    assert connection.execute("SELECT relative_path, language, line_count FROM files ORDER BY id").fetchall() == [
+        ("app/main.py", "python", 4),
+        ("README.md", "", 2),
+    ]
+    assert connection.execute("SELECT seq, path, tokens FROM outline").fetchall() == [
+        (1, "app/main.py", 10),
+        (2, "README.md", 8),
+    ]
+    connection.close()
+
+
+def test_query_text_and_path(tmp_path):
+    database_file = tmp_path / "snapshot.sqlite"
+    _write_snapshot(database_file)
+
+    assert query_snapshot(str(database_file), text="run_server") == [
+        ("app/main.py", 4, "    run_server()"),
+        ("README.md", 2, "Call run_server to start."),
+    ]
+    assert query_snapshot(str(database_file), text="run_server", path="app/*") == [
+        ("app/main.py", 4, "    run_server()"),
+    ]
+    assert query_snapshot(str(database_file), language="python") == [("app/main.py", None, "python")]
+
+
+def test_concurrent_runs_use_separate_temporary_databases(tmp_path):
+    database_file = tmp_path / "snapshot.sqlite"
+    first, second = SQLiteOutputHandler(str(database_file)), SQLiteOutputHandler(str(database_file))
+    first.fire_event(StartEvent(message="start"))
+    second.fire_event(StartEvent(message="start"))
+    assert first.temp_path != second.temp_path
+
+    first.fire_event(FileProcessedEvent(filename="001_a.py.md", relative_path="a.py", content="a = 1\n"))
+    second.fire_event(FileProcessedEvent(filename="001_b.py.md", relative_path="b.py", content="b = 1\n"))
+    first.fire_event(EndEvent(message="end"))
+    second.fire_event(EndEvent(message="end"))
+
+    connection = sqlite3.connect(str(database_file))
+    assert connection.execute("SELECT relative_path FROM files").fetchall() == [("b.py",)]
+    connection.close()
+    assert [path.name for path in tmp_path.iterdir()] == ["snapshot.sqlite"]
@@ -3,13 +3,15 @@ import os
 
 def update_envrc(cwd):
     """
-    Updates the .envrc file with PPG_OUTPUT_FILE and PPG_JSON_OUTPUT_FILE variables.
+    Updates the .envrc file with the PPG_*_OUTPUT_FILE variables.
     PPG_ENABLE_CLIPBOARD is only added if it doesn't already exist.
     """
     envrc_path = os.path.join(cwd, ".envrc")
     output_file_line = f'export PPG_OUTPUT_FILE="~/Downloads/$(basename $PWD).txt"\n'
     json_output_file_line = f'export PPG_JSON_OUTPUT_FILE="~/Downloads/$(basename $PWD).json.txt"\n'
     tree_json_output_file_line = f'export PPG_TREE_JSON_OUTPUT_FILE="~/Downloads/$(basename $PWD).tree.json.txt"\n'
+    sqlite_output_file_line = f'export PPG_SQLITE_OUTPUT_FILE="~/Downloads/$(basename $PWD).sqlite"\n'
+    ndjson_output_file_line = f'export PPG_NDJSON_OUTPUT_FILE="~/Downloads/$(basename $PWD).ndjson.txt"\n'
     clipboard_enabled_line = 'export PPG_ENABLE_CLIPBOARD="false"\n'
 
     # Read existing .envrc
@@ -36,6 +38,10 @@ def update_envrc(cwd):
         new_lines.append(json_output_file_line)
     if not is_variable_defined('PPG_TREE_JSON_OUTPUT_FILE', existing_lines):
         new_lines.append(tree_json_output_file_line)
+    if not is_variable_defined('PPG_SQLITE_OUTPUT_FILE', existing_lines):
+        new_lines.append(sqlite_output_file_line)
+    if not is_variable_defined('PPG_NDJSON_OUTPUT_FILE', existing_lines):
+        new_lines.append(ndjson_output_file_line)
 
     # Check if PPG_ENABLE_CLIPBOARD is defined, if not, append it
     if not is_variable_defined('PPG_ENABLE_CLIPBOARD', existing_lines):
@@ -49,6 +55,10 @@ def update_envrc(cwd):
             updated_variables.append("PPG_JSON_OUTPUT_FILE")
         if tree_json_output_file_line in new_lines:
             updated_variables.append("PPG_TREE_JSON_OUTPUT_FILE")
+        if sqlite_output_file_line in new_lines:
+            updated_variables.append("PPG_SQLITE_OUTPUT_FILE")
+        if ndjson_output_file_line in new_lines:
+            updated_variables.append("PPG_NDJSON_OUTPUT_FILE")
         if clipboard_enabled_line in new_lines:
             updated_variables.append("PPG_ENABLE_CLIPBOARD")
 
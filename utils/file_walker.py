@@ -27,6 +27,19 @@ class FileEntry:
         """
         return self.relative_path.replace(os.path.sep, "_").replace(Path(self.relative_path).suffix, "")
 
+    def read_text(self):
+        """
+        Reads the file content as UTF-8 text.
+
+        Returns:
+            str: The file content, or None if the file cannot be read or decoded.
+        """
+        try:
+            with open(self.full_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except Exception:
+            return None
+
 
 class FileWalker:
     """
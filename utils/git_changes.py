@@ -0,0 +1,347 @@
+"""
+Working-tree changes for --changed.
+
+Files modified in the working tree are found by comparing the stat data
+cached in .git/index with the files on disk, like `git status` does; only
+files whose stat data differs (or is too recent to trust) are hashed and
+compared with the indexed blob. Staged changes are listed with one
+`git diff --cached` call and untracked files are the walked files missing
+from the index, so the work is proportional to the number of changes
+rather than the size of the repository. Indexes this parser does not
+support (unknown versions, split or sparse indexes) fall back to a single
+`git status` call.
+"""
+
+import hashlib
+import os
+import stat
+import struct
+import subprocess
+from dataclasses import dataclass, field
+from typing import List, Set
+
+from utils.git_source import GitRevisionError
+
+_INDEX_SIGNATURE = b"DIRC"
+_SUPPORTED_VERSIONS = (2, 3, 4)
+# ctime, mtime (seconds and nanoseconds), dev, ino, mode, uid, gid, size
+_ENTRY_STAT = struct.Struct(">10I")
+_ENTRY_HEADER_SIZE = _ENTRY_STAT.size + 20 + 2
+
+_FLAG_EXTENDED = 0x4000
+_FLAG_STAGE_MASK = 0x3000
+_FLAG_ASSUME_VALID = 0x8000
+_EXTENDED_SKIP_WORKTREE = 0x4000
+_EXTENDED_INTENT_TO_ADD = 0x2000
+
+# Extensions that change how entries must be read
+_UNSUPPORTED_EXTENSIONS = (b"link", b"sdir")
+
+_GITLINK_MODE = 0o160000
+
+
+class UnsupportedIndexError(Exception):
+    """
+    Raised for an index this parser cannot read; callers fall back to `git status`.
+    """
+
+    pass
+
+
+@dataclass
+class IndexEntry:
+    """
+    One stage-0 entry of the git index, with the stat data git cached for it.
+    """
+
+    path: str
+    mtime: int
+    mtime_ns: int
+    ino: int
+    mode: int
+    size: int
+    object_id: str
+    # Entries git is told not to check in the working tree (assume-valid or skip-worktree)
+    assume_unchanged: bool = False
+    intent_to_add: bool = False
+
+
+@dataclass
+class ChangedFiles:
+    """
+    Paths relative to the git root that differ from HEAD.
+    """
+
+    changed: Set[str] = field(default_factory=set)
+    deleted: List[str] = field(default_factory=list)
+
+
+def git_dir(repo_root):
+    """
+    Resolve the git directory of a repository, following the .git file of worktrees and submodules.
+    """
+    dot_git = os.path.join(repo_root, ".git")
+    if os.path.isfile(dot_git):
+        with open(dot_git, "r", encoding="utf-8") as f:
+            content = f.read().strip()
+        if content.startswith("gitdir:"):
+            return os.path.normpath(os.path.join(repo_root, content[len("gitdir:"):].strip()))
+    return dot_git
+
+
+def find_git_root(path):
+    """
+    Returns:
+        str: The closest directory at or above path that contains .git, or None.
+    """
+    current_path = os.path.abspath(path)
+    while True:
+        if os.path.exists(os.path.join(current_path, ".git")):
+            return current_path
+        parent = os.path.dirname(current_path)
+        if parent == current_path:
+            return None
+        current_path = parent
+
+
+def read_index(index_path):
+    """
+    Parse the entries of a git index file (versions 2 to 4).
+
+    Args:
+        index_path (str): Path of the index file.
+
+    Returns:
+        list: IndexEntry objects for the stage-0 entries, in index order.
+
+    Raises:
+        UnsupportedIndexError: If the index cannot be parsed here.
+    """
+    with open(index_path, "rb") as f:
+        data = f.read()
+    if len(data) < 12 or data[:4] != _INDEX_SIGNATURE:
+        raise UnsupportedIndexError("Not a git index")
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in _SUPPORTED_VERSIONS:
+        raise UnsupportedIndexError(f"Unsupported index version {version}")
+
+    entries = []
+    offset = 12
+    previous_path = b""
+    for _ in range(count):
+        start = offset
+        (_ctime, _ctime_ns, mtime, mtime_ns, _dev, ino, mode, _uid, _gid, size) = _ENTRY_STAT.unpack_from(data, offset)
+        offset += _ENTRY_STAT.size
+        object_id = data[offset:offset + 20].hex()
+        offset += 20
+        (flags,) = struct.unpack_from(">H", data, offset)
+        offset += 2
+        extended_flags = 0
+        if flags & _FLAG_EXTENDED:
+            (extended_flags,) = struct.unpack_from(">H", data, offset)
+            offset += 2
+
+        if version == 4:
+            # The path drops N bytes from the end of the previous path, N being a varint, then appends a suffix
+            byte = data[offset]
+            offset += 1
+            strip = byte & 0x7F
+            while byte & 0x80:
+                byte = data[offset]
+                offset += 1
+                strip = ((strip + 1) << 7) | (byte & 0x7F)
+            end = data.index(b"\0", offset)
+            path = previous_path[:len(previous_path) - strip] + data[offset:end]
+            offset = end + 1
+        else:
+            end = data.index(b"\0", offset)
+            path = data[offset:end]
+            # Entries are padded with NUL bytes to a multiple of eight bytes
+            offset = start + ((end - start + 8) // 8) * 8
+        previous_path = path
+
+        if flags & _FLAG_STAGE_MASK:
+            continue  # Unmerged entries are reported by git diff --cached
+        entries.append(IndexEntry(
+            path=path.decode("utf-8", errors="surrogateescape"),
+            mtime=mtime,
+            mtime_ns=mtime_ns,
+            ino=ino,
+            mode=mode,
+            size=size,
+            object_id=object_id,
+            assume_unchanged=bool(flags & _FLAG_ASSUME_VALID or extended_flags & _EXTENDED_SKIP_WORKTREE),
+            intent_to_add=bool(extended_flags & _EXTENDED_INTENT_TO_ADD),
+        ))
+
+    # Extensions follow the entries, each with a four byte signature and length, before the trailing checksum
+    while offset + 8 <= len(data) - 20:
+        signature = data[offset:offset + 4]
+        (length,) = struct.unpack_from(">I", data, offset + 4)
+        if signature in _UNSUPPORTED_EXTENSIONS:
+            raise UnsupportedIndexError(f"Unsupported index extension {signature.decode('ascii')}")
+        offset += 8 + length
+    return entries
+
+
+def git_blob_hash(path, mode):
+    """
+    Hash a working tree file the way git hashes blobs.
+
+    Args:
+        path (str): The file path.
+        mode (int): The st_mode of the file; symlinks are hashed by their target.
+
+    Returns:
+        str: The SHA-1 hex digest of the blob.
+    """
+    if stat.S_ISLNK(mode):
+        content = os.fsencode(os.readlink(path))
+    else:
+        with open(path, "rb") as f:
+            content = f.read()
+    hasher = hashlib.sha1(b"blob %d\0" % len(content))
+    hasher.update(content)
+    return hasher.hexdigest()
+
+
+def _stat_matches(entry, st, index_mtime):
+    """
+    Compare cached stat data like git's ie_match_stat; entries as new as the index itself are racy.
+    """
+    if entry.size != st.st_size & 0xFFFFFFFF or entry.mtime != int(st.st_mtime) & 0xFFFFFFFF:
+        return False
+    # Indexes written without nanosecond support store zero
+    if entry.mtime_ns and entry.mtime_ns != st.st_mtime_ns % 1_000_000_000:
+        return False
+    if entry.ino and entry.ino != st.st_ino & 0xFFFFFFFF:
+        return False
+    if stat.S_IFMT(entry.mode) != stat.S_IFMT(st.st_mode) or (entry.mode & 0o100) != (st.st_mode & 0o100):
+        return False
+    return entry.mtime < index_mtime
+
+
+def _run_git(repo_root, *args):
+    try:
+        result = subprocess.run(["git", *args], cwd=repo_root, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                check=True)
+    except FileNotFoundError:
+        raise GitRevisionError("git executable not found")
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode("utf-8", errors="replace").strip()
+        raise GitRevisionError(f"git {args[0]} failed: {message}")
+    return result.stdout
+
+
+def _split_paths(output):
+    return [path.decode("utf-8", errors="surrogateescape") for path in output.split(b"\0") if path]
+
+
+def _has_head(repo_root):
+    try:
+        _run_git(repo_root, "rev-parse", "--verify", "-q", "HEAD")
+    except GitRevisionError:
+        return False
+    return True
+
+
+def _changes_from_index(repo_root, entries, index_mtime, walked_paths):
+    result = ChangedFiles()
+    indexed = set()
+    for entry in entries:
+        indexed.add(entry.path)
+        if entry.mode == _GITLINK_MODE or entry.assume_unchanged:
+            continue
+        full_path = os.path.join(repo_root, entry.path)
+        try:
+            st = os.lstat(full_path)
+        except FileNotFoundError:
+            result.deleted.append(entry.path)
+            continue
+        except OSError:
+            continue
+        if entry.intent_to_add:
+            result.changed.add(entry.path)
+        elif not _stat_matches(entry, st, index_mtime):
+            try:
+                if git_blob_hash(full_path, st.st_mode) != entry.object_id:
+                    result.changed.add(entry.path)
+            except OSError:
+                continue
+
+    # Staged changes relative to HEAD; in a repository without commits everything indexed is staged
+    if _has_head(repo_root):
+        staged = _split_paths(_run_git(repo_root, "diff", "--cached", "--name-only", "-z", "--no-renames", "HEAD"))
+        for path in staged:
+            if path in indexed:
+                result.changed.add(path)
+            elif path not in result.deleted:
+                result.deleted.append(path)
+    else:
+        result.changed.update(indexed)
+
+    result.changed.update(path for path in walked_paths if path not in indexed)
+    result.changed.difference_update(result.deleted)
+    result.deleted.sort()
+    return result
+
+
+def _changes_from_status(repo_root):
+    """
+    Ask git once for the working tree status, for indexes read_index does not support.
+    """
+    result = ChangedFiles()
+    records = iter(_run_git(repo_root, "status", "--porcelain=v1", "-z", "--untracked-files=all",
+                            "--no-renames").split(b"\0"))
+    for record in records:
+        if not record:
+            continue
+        status, path = record[:2].decode("ascii"), record[3:].decode("utf-8", errors="surrogateescape")
+        if "D" in status:
+            result.deleted.append(path)
+        else:
+            result.changed.add(path)
+    result.deleted.sort()
+    return result
+
+
+def changed_files(project_root, files_to_process):
+    """
+    Narrow the walked files down to those that are modified, staged or untracked relative to HEAD.
+
+    Args:
+        project_root (str): The project root directory, inside a git repository.
+        files_to_process (list): The walked FileEntry objects.
+
+    Returns:
+        tuple: The changed FileEntry objects, and the deleted paths relative to the project root.
+
+    Raises:
+        GitRevisionError: If the project is not in a git repository or git fails.
+    """
+    project_root = os.path.abspath(project_root)
+    repo_root = find_git_root(project_root)
+    if repo_root is None:
+        raise GitRevisionError("--changed requires a git repository")
+
+    def git_path(relative_path):
+        return os.path.relpath(os.path.join(project_root, relative_path), repo_root).replace(os.path.sep, "/")
+
+    walked = {git_path(file_entry.relative_path): file_entry for file_entry in files_to_process}
+    index_path = os.path.join(git_dir(repo_root), "index")
+    try:
+        entries = read_index(index_path)
+        changes = _changes_from_index(repo_root, entries, int(os.stat(index_path).st_mtime), walked)
+    except FileNotFoundError:
+        # No index yet: nothing is tracked, so every walked file is untracked
+        changes = ChangedFiles(changed=set(walked))
+    except UnsupportedIndexError:
+        changes = _changes_from_status(repo_root)
+
+    changed = [file_entry for path, file_entry in walked.items() if path in changes.changed]
+    deleted = []
+    for path in changes.deleted:
+        relative_path = os.path.relpath(os.path.join(repo_root, path), project_root)
+        if not relative_path.startswith(os.pardir):
+            deleted.append(relative_path)
+    return changed, deleted
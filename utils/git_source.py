@@ -0,0 +1,273 @@
+"""
+Git revision source for reading project files from an arbitrary commit.
+
+The tree is listed once with `git ls-tree` and blob contents are streamed
+through a single long-lived `git cat-file --batch` process, so no worktree
+checkout or per-file subprocess is needed.
+"""
+
+import os
+import subprocess
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+import pathspec
+
+from utils.file_walker import FileEntry
+
+# Same heuristic git uses: a NUL byte within the first 8000 bytes marks a blob as binary
+BINARY_SNIFF_SIZE = 8000
+
+# Chunk size used when draining blobs that will not be decoded
+_DRAIN_CHUNK_SIZE = 64 * 1024
+
+# Tree entry modes that do not hold regular file content
+_SYMLINK_MODE = "120000"
+
+
+class GitRevisionError(Exception):
+    """
+    Raised when a revision cannot be listed or one of its objects cannot be read.
+    """
+
+    pass
+
+
+class GitBlobReader:
+    """
+    Reads blobs through one `git cat-file --batch` process.
+    """
+
+    def __init__(self, repo_path: Union[str, os.PathLike]):
+        """
+        Initializes the reader.
+
+        Args:
+            repo_path (str): Any directory inside the git repository.
+        """
+        self.repo_path = repo_path
+        self._process = None
+
+    def open(self):
+        """
+        Start the `git cat-file --batch` process if it is not running yet.
+        """
+        if self._process is None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=self.repo_path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self
+
+    def close(self):
+        """
+        Stop the `git cat-file --batch` process.
+        """
+        if self._process is not None:
+            self._process.stdin.close()
+            self._process.stdout.close()
+            self._process.wait()
+            self._process = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def read_blob(self, object_id: str):
+        """
+        Read a blob and sniff it for binary content.
+
+        The object header tells the type and size, so binary blobs are detected
+        from their first bytes and drained without being buffered in full.
+
+        Args:
+            object_id (str): The object name of the blob.
+
+        Returns:
+            tuple: (data, is_binary). data is None when the blob is binary.
+        """
+        self.open()
+        stdin = self._process.stdin
+        stdout = self._process.stdout
+
+        stdin.write(object_id.encode("ascii") + b"\n")
+        stdin.flush()
+
+        header = stdout.readline()
+        if not header:
+            raise GitRevisionError("git cat-file exited unexpectedly")
+        parts = header.split()
+        if len(parts) != 3:
+            raise GitRevisionError(f"Cannot read object {object_id}: {header.decode(errors='replace').strip()}")
+        _, object_type, size = parts
+        size = int(size)
+
+        head = stdout.read(min(size, BINARY_SNIFF_SIZE))
+        is_binary = object_type != b"blob" or b"\0" in head
+        if is_binary:
+            remaining = size - len(head)
+            while remaining > 0:
+                remaining -= len(stdout.read(min(remaining, _DRAIN_CHUNK_SIZE)))
+            data = None
+        else:
+            data = head + stdout.read(size - len(head))
+
+        stdout.read(1)  # Each object is terminated by a LF
+        return data, is_binary
+
+    def read_text(self, object_id: str):
+        """
+        Read a blob as UTF-8 text.
+
+        Args:
+            object_id (str): The object name of the blob.
+
+        Returns:
+            str: The blob content, or None if the blob is binary or not valid UTF-8.
+        """
+        data, is_binary = self.read_blob(object_id)
+        if is_binary:
+            return None
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+
+@dataclass
+class GitBlobEntry(FileEntry):
+    """
+    A file entry whose content comes from a git blob instead of the working tree.
+    """
+
+    object_id: str = ""
+    size: int = 0
+    # Commit id the revision resolved to, so a moved branch is told apart from the old one
+    commit: str = ""
+    reader: Optional[GitBlobReader] = field(default=None, repr=False, compare=False)
+
+    def read_text(self):
+        """
+        Read the blob content through the shared `git cat-file --batch` reader.
+
+        Returns:
+            str: The blob content, or None if the blob is binary or not valid UTF-8.
+        """
+        return self.reader.read_text(self.object_id)
+
+
+class GitRevisionWalker:
+    """
+    Lists the files of a git revision, mirroring FileWalker for the working tree.
+    Use it as a context manager so the blob reader is stopped when done.
+    """
+
+    def __init__(self, project_root: Union[str, os.PathLike], rev: str,
+                 ignore_spec: Optional[pathspec.PathSpec] = None):
+        """
+        Initializes the GitRevisionWalker.
+
+        Args:
+            project_root (str): The root directory of the project, inside the git repository.
+            rev (str): Any revision git understands (branch, tag, commit).
+            ignore_spec (pathspec.PathSpec, optional): A PathSpec object containing gitignore patterns. Defaults to None.
+        """
+        self.project_root = project_root
+        self.rev = rev
+        self.ignore_spec = ignore_spec
+        self.reader = GitBlobReader(project_root)
+
+    def __enter__(self):
+        self.reader.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.reader.close()
+
+    def _run_git(self, args, action):
+        """
+        Run a git command in the project root.
+
+        Args:
+            args (list): The git arguments.
+            action (str): What the command does, used in error messages.
+
+        Returns:
+            bytes: The command output.
+        """
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=self.project_root,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True,
+            )
+        except FileNotFoundError:
+            raise GitRevisionError("git executable not found")
+        except subprocess.CalledProcessError as e:
+            message = e.stderr.decode("utf-8", errors="replace").strip()
+            raise GitRevisionError(f"Cannot {action} {self.rev}: {message}")
+        return result.stdout
+
+    def _resolve_commit(self):
+        """
+        Resolve the revision to its commit id.
+
+        Returns:
+            str: The full commit id.
+        """
+        return self._run_git(["rev-parse", "--verify", f"{self.rev}^{{commit}}"],
+                             "resolve revision").decode("ascii").strip()
+
+    def _list_tree(self, commit):
+        """
+        Run `git ls-tree` for the commit, limited to the project root.
+
+        Args:
+            commit (str): The commit id the revision resolved to.
+
+        Returns:
+            bytes: NUL separated tree entries.
+        """
+        return self._run_git(["ls-tree", "-r", "-z", "--long", commit], "list revision")
+
+    def get_files(self):
+        """
+        Lists the blobs of the revision and returns them as GitBlobEntry objects,
+        respecting the provided ignore patterns.
+
+        Returns:
+            list: A sorted list of GitBlobEntry objects.
+        """
+        commit = self._resolve_commit()
+        file_entries = []
+        for record in self._list_tree(commit).split(b"\0"):
+            if not record:
+                continue
+            # Format: <mode> SP <type> SP <object> SP+ <size> TAB <path>
+            info, path = record.split(b"\t", 1)
+            mode, object_type, object_id, size = info.decode("ascii").split()
+            if object_type != "blob" or mode == _SYMLINK_MODE:
+                continue
+
+            relative_path = os.path.join(*path.decode("utf-8", errors="surrogateescape").split("/"))
+            if self.ignore_spec and self.ignore_spec.match_file(relative_path):
+                continue
+
+            entry = GitBlobEntry(
+                full_path=os.path.join(self.project_root, relative_path),
+                relative_path=relative_path,
+                filename=os.path.basename(relative_path),
+                object_id=object_id,
+                size=int(size),
+                commit=commit,
+                reader=self.reader,
+            )
+            file_entries.append(entry)
+        return sorted(file_entries, key=lambda it: it.relative_path)
@@ -1,8 +1,11 @@
 import os
-from typing import Optional, Union
 
 import pathspec
 
+from utils.reporting import get_logger
+
+log = get_logger(__name__)
+
 
 def build_ignores(project_root):
     """
@@ -39,7 +42,7 @@ def build_ignores(project_root):
             gitignore_path = os.path.join(current_path, ".gitignore")
             if os.path.isfile(gitignore_path):
                 gitignore_files.append(gitignore_path)
-                print(f"Found .gitignore at: {gitignore_path}")
+                log.debug("Found .gitignore at: %s", gitignore_path)
             current_path = os.path.dirname(current_path)
 
         # Process gitignore files in reverse order (git root first, then down to current dir)
@@ -57,9 +60,9 @@ def build_ignores(project_root):
                         # Adjust patterns from subdirectories for proper matching
                         # (pathspec handles this internally)
                         patterns.extend(file_patterns)
-                print(f"Loaded gitignore patterns from: {gitignore_path}")
+                log.debug("Loaded gitignore patterns from: %s", gitignore_path)
             except Exception as e:
-                print(f"Warning: Could not read {gitignore_path}: {e}")
+                log.warning("Could not read %s: %s", gitignore_path, e)
 
         # Load .git/info/exclude if we found a git root
         git_exclude_path = os.path.join(git_root, ".git", "info", "exclude")
@@ -67,9 +70,9 @@ def build_ignores(project_root):
             try:
                 with open(git_exclude_path, "r", encoding="utf-8") as f:
                     patterns.extend(f.read().splitlines())
-                print(f"Loaded gitignore patterns from: {git_exclude_path}")
+                log.debug("Loaded gitignore patterns from: %s", git_exclude_path)
             except Exception as e:
-                print(f"Warning: Could not read {git_exclude_path}: {e}")
+                log.warning("Could not read %s: %s", git_exclude_path, e)
 
     # Load gitignore files specified in PPG_IGNORE_FILES
     ignore_files_str = os.environ.get("PPG_IGNORE_FILES")
@@ -80,9 +83,9 @@ def build_ignores(project_root):
             if os.path.exists(ignore_file):
                 with open(ignore_file, "r", encoding="utf-8") as f:
                     patterns.extend(f.read().splitlines())
-                print(f"Loaded gitignore patterns from: {ignore_file}")
+                log.debug("Loaded gitignore patterns from: %s", ignore_file)
             else:
-                print(f"Warning: gitignore file not found: {ignore_file}")
+                log.warning("gitignore file not found: %s", ignore_file)
 
     if patterns:
         # Remove empty lines and strip whitespace
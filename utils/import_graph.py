@@ -0,0 +1,226 @@
+"""
+Import graph module for selecting the Python files reachable from an entry point.
+
+Imports are parsed with `ast` and resolved against the walked FileEntry set.
+Parsed imports are cached per file stat (or blob id for git revisions) so
+repeated runs only parse files that changed.
+"""
+
+import ast
+import hashlib
+import json
+import os
+from collections import deque
+
+from utils.git_source import GitBlobEntry
+from utils.reporting import get_logger
+
+log = get_logger(__name__)
+
+CACHE_DIR = os.path.expanduser("~/.ppg/cache")
+
+# Bump when the cached import format changes
+_CACHE_VERSION = 1
+
+
+def module_name(relative_path):
+    """
+    Convert a project relative path to a dotted module name.
+
+    Args:
+        relative_path (str): Path of a .py file relative to the project root.
+
+    Returns:
+        str: The module name, e.g. prompts/__init__.py -> prompts.
+    """
+    parts = relative_path[:-len(".py")].split(os.sep)
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def parse_imports(content):
+    """
+    Collect the import statements of a Python module.
+
+    Args:
+        content (str): Python source code.
+
+    Returns:
+        list: [level, module, names] for every import; plain imports have level 0 and no names.
+    """
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return []
+
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append([0, alias.name, []])
+        elif isinstance(node, ast.ImportFrom):
+            imports.append([node.level, node.module or "", [alias.name for alias in node.names]])
+    return imports
+
+
+class ImportGraph:
+    """
+    Resolves imports between the Python files of a project.
+    """
+
+    def __init__(self, project_root, file_entries, cache_dir=CACHE_DIR):
+        """
+        Initializes the ImportGraph.
+
+        Args:
+            project_root (str): The root directory of the project.
+            file_entries (list): FileEntry objects from FileWalker or GitRevisionWalker.
+            cache_dir (str, optional): Directory for the parsed import cache. None disables caching.
+        """
+        self.project_root = os.path.abspath(project_root)
+        self.file_entries = file_entries
+        self.entries_by_path = {entry.relative_path: entry for entry in file_entries}
+        self.modules = {
+            module_name(entry.relative_path): entry
+            for entry in file_entries if entry.relative_path.endswith(".py")
+        }
+        self.cache_file = None
+        if cache_dir:
+            digest = hashlib.sha1(self.project_root.encode("utf-8")).hexdigest()[:16]
+            self.cache_file = os.path.join(cache_dir, f"imports-{digest}.json")
+        self._cache = self._load_cache()
+        self._cache_dirty = False
+
+    def _load_cache(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != _CACHE_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def _save_cache(self):
+        if not self.cache_file or not self._cache_dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, "w", encoding="utf-8") as f:
+                json.dump({"version": _CACHE_VERSION, "files": self._cache}, f)
+        except OSError as e:
+            log.warning("Could not write import cache %s: %s", self.cache_file, e)
+        self._cache_dirty = False
+
+    @staticmethod
+    def _cache_key(entry):
+        if isinstance(entry, GitBlobEntry):
+            return [entry.object_id]
+        try:
+            stat = os.stat(entry.full_path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def imports_of(self, entry):
+        """
+        Get the parsed imports of a file, from the cache when its stat is unchanged.
+
+        Args:
+            entry (FileEntry): A Python file.
+
+        Returns:
+            list: [level, module, names] for every import.
+        """
+        key = self._cache_key(entry)
+        cached = self._cache.get(entry.relative_path)
+        if key is not None and cached and cached["key"] == key:
+            return cached["imports"]
+
+        content = entry.read_text()
+        imports = parse_imports(content) if content is not None else []
+        if key is not None:
+            self._cache[entry.relative_path] = {"key": key, "imports": imports}
+            self._cache_dirty = True
+        return imports
+
+    def _with_parent_packages(self, name):
+        """
+        Yield a module and every package above it, since importing a module runs them all.
+        """
+        parts = name.split(".")
+        for i in range(1, len(parts) + 1):
+            yield ".".join(parts[:i])
+
+    def resolve(self, entry):
+        """
+        Resolve the imports of a file to local FileEntry objects.
+
+        Args:
+            entry (FileEntry): A Python file.
+
+        Returns:
+            list: FileEntry objects of the local modules it imports.
+        """
+        current = module_name(entry.relative_path)
+        is_package = entry.filename == "__init__.py"
+        package_parts = current.split(".") if is_package else current.split(".")[:-1]
+
+        candidates = []
+        for level, module, names in self.imports_of(entry):
+            if level:
+                if level - 1 > len(package_parts):
+                    continue
+                base = package_parts[:len(package_parts) - (level - 1)]
+                target = ".".join(base + ([module] if module else []))
+            else:
+                target = module
+            if target:
+                candidates.extend(self._with_parent_packages(target))
+            # `from package import name` may refer to a submodule
+            for name in names:
+                candidates.append(f"{target}.{name}" if target else name)
+
+        resolved = []
+        for candidate in candidates:
+            found = self.modules.get(candidate)
+            if found is not None and found is not entry and found not in resolved:
+                resolved.append(found)
+        return resolved
+
+    def closure(self, entry_path):
+        """
+        Collect the files reachable from an entry point through local imports.
+
+        Args:
+            entry_path (str): Path of the entry point, relative to the project root.
+
+        Returns:
+            list: FileEntry objects of the closure, in the original order.
+
+        Raises:
+            ValueError: If the entry point is not a walked Python file.
+        """
+        entry = self.entries_by_path.get(os.path.normpath(entry_path))
+        if entry is None or not entry.relative_path.endswith(".py"):
+            raise ValueError(f"Entry point {entry_path} is not a Python file in the project")
+
+        reachable = {entry.relative_path}
+        # Packages containing the entry point run before it as well
+        for name in self._with_parent_packages(module_name(entry.relative_path)):
+            package = self.modules.get(name)
+            if package is not None:
+                reachable.add(package.relative_path)
+
+        queue = deque(self.entries_by_path[path] for path in reachable)
+        while queue:
+            for dependency in self.resolve(queue.popleft()):
+                if dependency.relative_path not in reachable:
+                    reachable.add(dependency.relative_path)
+                    queue.append(dependency)
+
+        self._save_cache()
+        return [it for it in self.file_entries if it.relative_path in reachable]
@@ -16,5 +16,6 @@ EXTENSION_MAPPING = {
     '.cpp': 'cpp',
     '.rb': 'ruby',
     '.php': 'php',
-    '.go': 'go'
+    '.go': 'go',
+    '.ipynb': 'python',  # Notebooks are rendered as percent-format scripts
 }
@@ -0,0 +1,217 @@
+"""
+Memory budget module for spilling buffered output to disk.
+
+With --max-memory, generate and the output handlers buffer processed files
+in SpillableList objects that share one MemoryBudget. Each list tracks the
+approximate size of the items it retains; once the shared total exceeds the
+budget, the list being appended to pickles its buffered items into an
+anonymous temporary file and keeps only their offsets. Items are read back
+in order (or by index) when the output is written, so the output is the
+same as with everything kept in memory.
+"""
+
+import os
+import pickle
+import re
+import sys
+import tempfile
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_size(text):
+    """
+    Parse a size such as 512M, 2G or 1048576.
+
+    Args:
+        text (str): The size, optionally with a K, M or G suffix (and an optional B).
+
+    Returns:
+        int: The size in bytes.
+
+    Raises:
+        ValueError: If the size cannot be parsed or is not positive.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*", text, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size: {text}")
+    size = int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+    if size <= 0:
+        raise ValueError(f"Size must be positive: {text}")
+    return size
+
+
+def format_size(size):
+    """
+    Format a byte count for reports, e.g. 1.5 MB.
+    """
+    if size < 1024:
+        return f"{size} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+
+def approximate_size(value):
+    """
+    Approximate the memory retained by a value built from strings, numbers and containers.
+
+    Args:
+        value: The value to measure.
+
+    Returns:
+        int: Approximate size in bytes.
+    """
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return 56 + sum(8 + approximate_size(item) for item in value)
+    if isinstance(value, dict):
+        return 64 + sum(16 + approximate_size(k) + approximate_size(v) for k, v in value.items())
+    if hasattr(value, "__dict__"):
+        return 64 + approximate_size(vars(value))
+    return 32
+
+
+def peak_rss():
+    """
+    Returns:
+        int: Peak resident set size of the process in bytes, or None where unavailable.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryBudget:
+    """
+    Shared accounting of the bytes retained by SpillableList buffers.
+    """
+
+    def __init__(self, limit):
+        """
+        Initialize the budget.
+
+        Args:
+            limit (int): Maximum retained bytes before buffers spill to disk.
+        """
+        self.limit = limit
+        self.retained = 0
+        self.peak = 0
+        self.spilled = 0
+
+    def retain(self, size):
+        self.retained += size
+        self.peak = max(self.peak, self.retained)
+
+    def release(self, size, spilled=False):
+        self.retained -= size
+        if spilled:
+            self.spilled += size
+
+    @property
+    def exceeded(self):
+        return self.retained > self.limit
+
+    def report(self):
+        """
+        Returns:
+            str: A one-line summary of peak memory and spilled bytes.
+        """
+        text = (f"Peak buffered memory: {format_size(self.peak)} (budget {format_size(self.limit)}), "
+                f"spilled {format_size(self.spilled)} to disk")
+        rss = peak_rss()
+        if rss is not None:
+            text += f", peak RSS {format_size(rss)}"
+        return text
+
+
+class SpillableList:
+    """
+    Append-only list that moves its items into a temporary file when the budget is exceeded.
+    Supports len(), iteration in order and indexing.
+    """
+
+    def __init__(self, budget, measure=approximate_size):
+        """
+        Initialize the list.
+
+        Args:
+            budget (MemoryBudget): The shared budget.
+            measure (callable): Returns the approximate size of an item.
+        """
+        self.budget = budget
+        self.measure = measure
+        self._items = []
+        self._retained = 0
+        self._file = None
+        self._offsets = []
+
+    def append(self, item):
+        size = self.measure(item)
+        self._items.append(item)
+        self._retained += size
+        self.budget.retain(size)
+        if self.budget.exceeded:
+            self.spill()
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def spill(self):
+        """
+        Write the buffered items to the temporary file and release their memory.
+        """
+        if not self._items:
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix="ppg-spill-")
+        self._file.seek(0, os.SEEK_END)
+        for item in self._items:
+            self._offsets.append(self._file.tell())
+            pickle.dump(item, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.budget.release(self._retained, spilled=True)
+        self._items = []
+        self._retained = 0
+
+    def _load(self, offset):
+        self._file.seek(offset)
+        return pickle.load(self._file)
+
+    def __len__(self):
+        return len(self._offsets) + len(self._items)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SpillableList index out of range")
+        if index < len(self._offsets):
+            return self._load(self._offsets[index])
+        return self._items[index - len(self._offsets)]
+
+    def __iter__(self):
+        for offset in self._offsets:
+            yield self._load(offset)
+        yield from self._items
+
+    def close(self):
+        """
+        Drop the buffered items and delete the temporary file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.budget.release(self._retained)
+        self._items = []
+        self._offsets = []
+        self._retained = 0
@@ -0,0 +1,213 @@
+"""
+Reporting module: logging and progress for ppg.
+
+Modules log through loggers under "ppg" (see get_logger). Nothing is shown
+until the CLI calls configure_logging, so library callers stay silent.
+Per-file messages are logged at DEBUG and only shown with --verbose; the
+default INFO level shows summaries and where output went.
+
+Progress is reported by ProgressReporter. On a terminal it redraws one
+status line (files/s, MB/s and ETA) at most every PROGRESS_INTERVAL seconds,
+and log messages clear the line before they are written. Elsewhere it logs a
+progress event every EVENT_INTERVAL seconds. With the JSON log format (the
+default when stderr is not a terminal) every message is one JSON object per
+line, and progress events carry their counters as fields.
+"""
+
+import json
+import logging
+import sys
+import time
+
+from utils.memory_budget import format_size
+
+LOGGER_NAME = "ppg"
+
+LOG_FORMATS = ("auto", "text", "json")
+
+# Seconds between redraws of the progress line on a terminal
+PROGRESS_INTERVAL = 0.2
+# Seconds between progress events when not on a terminal
+EVENT_INTERVAL = 5.0
+
+logging.getLogger(LOGGER_NAME).addHandler(logging.NullHandler())
+
+# The console handler installed by configure_logging, if any
+_console = None
+
+
+def get_logger(name):
+    """
+    Returns:
+        logging.Logger: The logger for a module, under the "ppg" logger.
+    """
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line, including the fields passed as extra={"fields": {...}}.
+    """
+
+    def format(self, record):
+        document = {
+            "time": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        document.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        return json.dumps(document, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Formats records as their message, prefixed with "Warning:" or "Error:" at those levels.
+    """
+
+    def format(self, record):
+        message = super().format(record)
+        if record.levelno >= logging.ERROR:
+            return f"Error: {message}"
+        if record.levelno >= logging.WARNING:
+            return f"Warning: {message}"
+        return message
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """
+    Stream handler that shares the terminal with the progress line.
+    """
+
+    def __init__(self, stream, json_format):
+        super().__init__(stream)
+        self.json_format = json_format
+        self.is_tty = not json_format and stream.isatty()
+        self.progress_line = None
+        self.setFormatter(JSONFormatter() if json_format else TextFormatter("%(message)s"))
+
+    def emit(self, record):
+        self.clear_progress()
+        super().emit(record)
+
+    def show_progress(self, line):
+        self.acquire()
+        try:
+            self.stream.write("\r\033[K" + line)
+            self.stream.flush()
+            self.progress_line = line
+        finally:
+            self.release()
+
+    def clear_progress(self):
+        if self.progress_line is not None:
+            self.stream.write("\r\033[K")
+            self.stream.flush()
+            self.progress_line = None
+
+
+def configure_logging(verbosity=0, log_format="auto", stream=None):
+    """
+    Show ppg log messages and progress on a stream.
+
+    Args:
+        verbosity (int): -1 for warnings only, 0 for summaries and progress, 1 or more for per-file messages.
+        log_format (str): "text", "json", or "auto" for text on a terminal and JSON otherwise.
+        stream: The stream to write to. Defaults to sys.stderr.
+
+    Returns:
+        ConsoleHandler: The installed handler.
+    """
+    global _console
+    stream = stream or sys.stderr
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format: {log_format}")
+    json_format = log_format == "json" or (log_format == "auto" and not stream.isatty())
+
+    logger = logging.getLogger(LOGGER_NAME)
+    if _console is not None:
+        logger.removeHandler(_console)
+    _console = ConsoleHandler(stream, json_format)
+    logger.addHandler(_console)
+    logger.setLevel(logging.WARNING if verbosity < 0 else logging.DEBUG if verbosity > 0 else logging.INFO)
+    return _console
+
+
+class ProgressReporter:
+    """
+    Rate-limited progress of a run: a status line on a terminal, progress events elsewhere.
+    """
+
+    def __init__(self, total=None, logger=None):
+        """
+        Initialize the reporter.
+
+        Args:
+            total (int, optional): Number of files to process, for the percentage and ETA.
+            logger (logging.Logger, optional): Logger receiving progress events. Defaults to the "ppg" logger.
+        """
+        self.total = total
+        self.logger = logger or logging.getLogger(LOGGER_NAME)
+        self.files = 0
+        self.bytes = 0
+        self.started = time.monotonic()
+        self._last_report = self.started
+        # Per-file messages replace the status line at DEBUG level
+        self._line = (_console is not None and _console.is_tty and self.logger.isEnabledFor(logging.INFO)
+                      and not self.logger.isEnabledFor(logging.DEBUG))
+
+    def update(self, files=1, size=0):
+        """
+        Count processed files and bytes, reporting at most once per interval.
+        """
+        self.files += files
+        self.bytes += size
+        now = time.monotonic()
+        if now - self._last_report >= (PROGRESS_INTERVAL if self._line else EVENT_INTERVAL):
+            self._last_report = now
+            self._report(now)
+
+    def finish(self):
+        """
+        Clear the status line, or log the final progress event.
+        """
+        if self._line:
+            if _console is not None:
+                _console.clear_progress()
+        else:
+            self._report(time.monotonic(), event="progress_done")
+
+    def fields(self, now):
+        elapsed = max(now - self.started, 1e-9)
+        fields = {
+            "files": self.files,
+            "bytes": self.bytes,
+            "elapsed_s": round(elapsed, 3),
+            "files_per_s": round(self.files / elapsed, 1),
+            "mb_per_s": round(self.bytes / elapsed / 1024 / 1024, 3),
+        }
+        if self.total:
+            fields["total"] = self.total
+            rate = self.files / elapsed
+            fields["eta_s"] = round((self.total - self.files) / rate, 1) if rate else None
+        return fields
+
+    def describe(self, fields):
+        text = f"{fields['files']}"
+        if self.total:
+            text += f"/{self.total} files ({100 * fields['files'] / self.total:.0f}%)"
+        else:
+            text += " files"
+        text += f", {fields['files_per_s']:.0f} files/s, {format_size(int(fields['mb_per_s'] * 1024 * 1024))}/s"
+        if fields.get("eta_s") is not None:
+            text += f", ETA {fields['eta_s']:.0f}s"
+        return text
+
+    def _report(self, now, event="progress"):
+        fields = self.fields(now)
+        if self._line:
+            _console.show_progress(self.describe(fields))
+        else:
+            self.logger.info("Progress: %s", self.describe(fields), extra={"fields": {"event": event, **fields}})
@@ -0,0 +1,180 @@
+"""
+Script finder module for last-run.
+
+Each directory is listed with a single os.scandir pass: names are matched
+against the script extensions first and only matching entries are stat'ed,
+once, so the modification time is reused for sorting, age filtering and
+display. The names of the matching scripts of every directory are kept in
+an index in ~/.ppg/cache keyed by the directory's mtime. Adding, removing or
+renaming a file changes the directory mtime, so while it is unchanged the
+directory is not listed again. Editing a file in place does not, so every
+indexed script is re-stat'ed and its current mtime is used.
+"""
+
+import json
+import os
+import stat
+import tempfile
+import time
+from dataclasses import dataclass
+
+DEFAULT_DIRECTORIES = ("~/Downloads",)
+DEFAULT_EXTENSIONS = (".sh", ".py")
+
+INDEX_PATH = os.path.expanduser("~/.ppg/cache/last_run.json")
+
+# A directory modified this close to its scan may change again within the mtime granularity
+_RACY_WINDOW_NS = 2_000_000_000
+
+_INDEX_VERSION = 2
+
+
+@dataclass
+class Script:
+    """
+    A script found by find_recent_scripts, with its modification time.
+    """
+
+    path: str
+    mtime: float
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    @property
+    def extension(self):
+        return os.path.splitext(self.path)[1].lower()
+
+
+def _scan(directory, extensions):
+    scripts = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.lower().endswith(extensions):
+                continue
+            try:
+                if entry.is_file():
+                    scripts.append(Script(entry.path, entry.stat().st_mtime))
+            except OSError:
+                continue
+    return scripts
+
+
+def _restat(directory, names):
+    scripts = []
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            scripts.append(Script(path, st.st_mtime))
+    return scripts
+
+
+class ScriptIndex:
+    """
+    Persistent index of the scripts of each directory, keyed by the directory mtime.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        """
+        Initialize the index.
+
+        Args:
+            path (str): The index file, or None for an in-memory index.
+        """
+        self.path = path
+        self.directories = {}
+        self.changed = False
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == _INDEX_VERSION:
+                    self.directories = data["directories"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+    def lookup(self, directory, mtime_ns, extensions):
+        """
+        Returns:
+            list: The indexed script names of the directory, or None if the directory changed since it was indexed.
+        """
+        cached = self.directories.get(directory)
+        if (cached and cached["mtime_ns"] == mtime_ns and cached["extensions"] == list(extensions)
+                and mtime_ns < cached["scanned_at_ns"] - _RACY_WINDOW_NS):
+            return cached["scripts"]
+        return None
+
+    def update(self, directory, mtime_ns, scanned_at_ns, extensions, scripts):
+        # Every script is kept: one edited in place may become the newest without changing the directory mtime
+        self.directories[directory] = {
+            "mtime_ns": mtime_ns,
+            "scanned_at_ns": scanned_at_ns,
+            "extensions": list(extensions),
+            "scripts": [script.name for script in scripts],
+        }
+        self.changed = True
+
+    def save(self):
+        if not self.path or not self.changed:
+            return
+        data = json.dumps({"version": _INDEX_VERSION, "directories": self.directories}).encode("utf-8")
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            # Replace the index atomically so a concurrent run never reads a partial file.
+            # Kept local instead of using outputs.atomic_writer, which would import the prompts package.
+            f = tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False)
+            try:
+                with f:
+                    f.write(data)
+                os.replace(f.name, self.path)
+            except OSError:
+                os.remove(f.name)
+                raise
+        except OSError:
+            pass  # The index only saves time; listing works without it
+        self.changed = False
+
+
+def find_recent_scripts(directories=DEFAULT_DIRECTORIES, extensions=DEFAULT_EXTENSIONS, index=None):
+    """
+    Find the scripts in the given directories, newest first.
+
+    Args:
+        directories (iterable): Directories to search; ~ is expanded.
+        extensions (iterable): Script extensions including the dot, e.g. ".sh".
+        index (ScriptIndex, optional): Index used to skip listing unchanged directories.
+
+    Returns:
+        list: Script objects sorted by modification time, newest first.
+    """
+    extensions = tuple(extension.lower() for extension in extensions)
+    scripts = []
+    for directory in directories:
+        directory = os.path.abspath(os.path.expanduser(directory))
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            continue
+        names = index.lookup(directory, mtime_ns, extensions) if index else None
+        if names is not None:
+            scripts.extend(_restat(directory, names))
+            continue
+        scanned_at_ns = time.time_ns()
+        try:
+            found = _scan(directory, extensions)
+        except OSError:
+            continue
+        if index:
+            index.update(directory, mtime_ns, scanned_at_ns, extensions, found)
+        scripts.extend(found)
+
+    if index:
+        index.save()
+    scripts.sort(key=lambda script: script.mtime, reverse=True)
+    return scripts
@@ -0,0 +1,64 @@
+"""
+Token estimator module for approximating LLM token counts without a tokenizer.
+Estimates are based on average UTF-8 bytes per token for each language hint.
+"""
+
+import math
+
+from utils.language_mapping import EXTENSION_MAPPING
+
+# Average UTF-8 bytes per token for each EXTENSION_MAPPING language hint.
+# Calibrated against BPE tokenizers on typical source files: symbol-heavy
+# languages produce more tokens per byte than prose-like ones.
+BYTES_PER_TOKEN = {
+    'python': 3.6,
+    'javascript': 3.4,
+    'typescript': 3.4,
+    'html': 3.0,
+    'css': 3.0,
+    'json': 2.8,
+    'bash': 3.3,
+    'java': 3.8,
+    'c': 3.2,
+    'cpp': 3.2,
+    'ruby': 3.6,
+    'php': 3.3,
+    'go': 3.4,
+}
+
+# Used for plain text and languages without a calibrated ratio
+DEFAULT_BYTES_PER_TOKEN = 4.0
+
+
+def language_for_path(path):
+    """
+    Look up the language hint for a file path by its extension.
+
+    Args:
+        path (str): File name or path.
+
+    Returns:
+        str: The language hint, or an empty string if the extension is unknown.
+    """
+    dot = path.rfind(".")
+    if dot == -1:
+        return ""
+    return EXTENSION_MAPPING.get(path[dot:].lower(), "")
+
+
+def estimate_tokens(content, language=""):
+    """
+    Estimate the number of tokens in content.
+
+    Args:
+        content (str): Text to estimate.
+        language (str, optional): Language hint from EXTENSION_MAPPING. Defaults to plain text.
+
+    Returns:
+        int: Approximate token count.
+    """
+    if not content:
+        return 0
+    # ASCII content is one byte per character, which avoids encoding the whole text
+    size = len(content) if content.isascii() else len(content.encode("utf-8"))
+    return math.ceil(size / BYTES_PER_TOKEN.get(language, DEFAULT_BYTES_PER_TOKEN))